@@ -1,19 +1,83 @@
-import google.generativeai as genai
 import random
 import json
 import logging
 import os
 import re
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import AsyncIterator, List, Dict, Optional
+import model_backend
+from catalog import get_catalog
+from har_session import state_path
+from rotation_sampler import ROTATION_FILE, RotationSampler
+from tweet_classifier import TweetClassifier
+from quota_manager import get_quota_manager, PRIORITY_REPLY, PRIORITY_POST, PRIORITY_BACKGROUND
+from model_resilience import ResilientModel, StreamInterrupted
+import prompt_templates
+from thread_segmenter import (segment_thread, truncate, number_parts, weighted_length, body_limit,
+                              IncrementalSegmenter, StreamAborted)
+
+PRIMARY_MODEL = 'gemini-2.0-flash-exp'
+# Birincil model hata verirse veya hedge süresinde yanıt vermezse sırayla denenir
+FALLBACK_MODELS = [
+    'gemini-1.5-flash',
+    'gemini-1.5-flash-latest',
+    'gemini-flash'
+]
+
+MAX_THREAD_TWEETS = 5
+# Streamed output opening with one of these is discarded without waiting for the rest
+BANNED_OPENERS = (
+    "as an ai", "i'm sorry", "i am sorry", "i cannot", "i can't", "sorry,",
+    "sure", "certainly", "here are", "here's", "here is", "```",
+)
+
+# Structured output schema for batched generation (one item per input, keyed by its [id])
+THREAD_BATCH_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "items": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "id": {"type": "string"},
+                    "tweets": {"type": "array", "items": {"type": "string"}},
+                },
+                "required": ["id", "tweets"],
+            },
+        },
+    },
+    "required": ["items"],
+}
+
+REPLY_BATCH_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "items": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "id": {"type": "string"},
+                    "reply": {"type": "string"},
+                },
+                "required": ["id", "reply"],
+            },
+        },
+    },
+    "required": ["items"],
+}
 
 class AdvancedContentGenerator:
     def __init__(self):
         self.model = None
+        # Görev başına system instruction'lı model örnekleri (ilk kullanımda oluşturulur)
+        self.task_models = {}
         self.api_key = None
-        self.projects = []
-        self.monitored_accounts = []
-        self.keywords = []
+        self.catalog = None
+        self.rotation = RotationSampler(state_path(ROTATION_FILE))
+        self._classifier = None
+        self._classifier_version = None
         self.market_contexts = [
             "bull market momentum",
             "bear market resilience", 
@@ -32,13 +96,16 @@ class AdvancedContentGenerator:
         try:
             self.api_key = os.environ.get('GEMINI_API_KEY')
             
-            if not self.api_key:
+            if not self.api_key and not model_backend.is_stub_backend():
                 raise Exception("Gemini API key not found")
             
-            genai.configure(api_key=self.api_key)
+            model_backend.configure(self.api_key)
             
-            # Gemini Flash 2.0 modelini kullan (ücretsiz)
-            self.model = genai.GenerativeModel('gemini-2.0-flash-exp')
+            # Gemini Flash 2.0 modelini kullan (ücretsiz); yedek modeller çağrı anında devreye girer
+            self.model = ResilientModel([
+                (model_name, model_backend.create_model(model_name))
+                for model_name in [PRIMARY_MODEL] + FALLBACK_MODELS
+            ])
             
             self.load_data()
             
@@ -52,18 +119,13 @@ class AdvancedContentGenerator:
                 logging.info("Trying fallback models...")
                 
                 # Diğer ücretsiz modelleri dene
-                fallback_models = [
-                    'gemini-1.5-flash',
-                    'gemini-1.5-flash-latest',
-                    'gemini-flash'
-                ]
-                
-                for model_name in fallback_models:
+                for model_name in FALLBACK_MODELS:
                     try:
-                        self.model = genai.GenerativeModel(model_name)
+                        model = model_backend.create_model(model_name)
                         # Test et
-                        test_response = self.model.generate_content("Test")
+                        test_response = model.generate_content("Test")
                         if test_response.text:
+                            self.model = ResilientModel([(model_name, model)])
                             logging.info(f"Successfully initialized with {model_name}")
                             self.load_data()
                             return True
@@ -77,85 +139,54 @@ class AdvancedContentGenerator:
                 logging.error(f"Fallback models also failed: {fallback_error}")
                 raise
     
+    def _task_model(self, task: str):
+        """Model whose system instruction holds the static prompt text for `task`"""
+        if task not in self.task_models:
+            instruction = prompt_templates.SYSTEM_INSTRUCTIONS[task]
+            self.task_models[task] = self.model.derive(
+                lambda model_name: model_backend.create_model(model_name, system_instruction=instruction))
+        return self.task_models[task]
+    
+    async def _generate(self, prompt: str, priority: int = PRIORITY_POST, task: Optional[str] = None, **kwargs):
+        """Single entry point for model calls (shared quota, queued by priority)"""
+        model = self._task_model(task) if task else self.model
+        return await get_quota_manager().run(
+            model, prompt,
+            lambda: model.generate_content_async(prompt, **kwargs),
+            priority=priority,
+            instruction=prompt_templates.SYSTEM_INSTRUCTIONS[task] if task else None,
+            stream=kwargs.get('stream', False),
+        )
+    
     def load_data(self):
-        """Load project and account lists"""
-        # Projects
-        self.projects = [
-            {"name": "Allora", "twitter": "@AlloraNetwork", "website": "allora.network", "category": "AI + Blockchain"},
-            {"name": "Caldera", "twitter": "@Calderaxyz", "website": "caldera.xyz", "category": "Rollup Infrastructure"},
-            {"name": "Camp Network", "twitter": "@campnetworkxyz", "website": "campnetwork.xyz", "category": "Social Layer"},
-            {"name": "Eclipse", "twitter": "@EclipseFND", "website": "eclipse.builders", "category": "SVM L2"},
-            {"name": "Fogo", "twitter": "@FogoChain", "website": "fogo.io", "category": "Gaming Chain"},
-            {"name": "Humanity Protocol", "twitter": "@Humanityprot", "website": "humanity.org", "category": "Identity"},
-            {"name": "Hyperbolic", "twitter": "@hyperbolic_labs", "website": "hyperbolic.xyz", "category": "AI Infrastructure"},
-            {"name": "Infinex", "twitter": "@infinex", "website": "infinex.xyz", "category": "DeFi Frontend"},
-            {"name": "Irys", "twitter": "@irys_xyz", "website": "irys.xyz", "category": "Data Storage"},
-            {"name": "Katana", "twitter": "@KatanaRIPNet", "website": "katana.network", "category": "Gaming Infrastructure"},
-            {"name": "Lombard", "twitter": "@Lombard_Finance", "website": "lombard.finance", "category": "Bitcoin DeFi"},
-            {"name": "MegaETH", "twitter": "@megaeth_labs", "website": "megaeth.com", "category": "High-Performance L2"},
-            {"name": "Mira Network", "twitter": "@mira_network", "website": "mira.network", "category": "Cross-Chain"},
-            {"name": "Mitosis", "twitter": "@MitosisOrg", "website": "mitosis.org", "category": "Ecosystem Expansion"},
-            {"name": "Monad", "twitter": "@monad_xyz", "website": "monad.xyz", "category": "Parallel EVM"},
-            {"name": "Multibank", "twitter": "@multibank_io", "website": "multibank.io", "category": "Multi-Chain Banking"},
-            {"name": "Multipli", "twitter": "@multiplifi", "website": "multipli.fi", "category": "Yield Optimization"},
-            {"name": "Newton", "twitter": "@MagicNewton", "website": "newton.xyz", "category": "Cross-Chain Liquidity"},
-            {"name": "Novastro", "twitter": "@Novastro_xyz", "website": "novastro.xyz", "category": "Cosmos DeFi"},
-            {"name": "Noya.ai", "twitter": "@NetworkNoya", "website": "noya.ai", "category": "AI-Powered DeFi"},
-            {"name": "OpenLedger", "twitter": "@OpenledgerHQ", "website": "openledger.xyz", "category": "Institutional DeFi"},
-            {"name": "PARADEX", "twitter": "@tradeparadex", "website": "paradex.trade", "category": "Perpetuals DEX"},
-            {"name": "Portal to BTC", "twitter": "@PortaltoBitcoin", "website": "portaltobitcoin.com", "category": "Bitcoin Bridge"},
-            {"name": "Puffpaw", "twitter": "@puffpaw_xyz", "website": "puffpaw.xyz", "category": "Gaming + NFT"},
-            {"name": "SatLayer", "twitter": "@satlayer", "website": "satlayer.xyz", "category": "Bitcoin L2"},
-            {"name": "Sidekick", "twitter": "@Sidekick_Labs", "website": "N/A", "category": "Developer Tools"},
-            {"name": "Somnia", "twitter": "@Somnia_Network", "website": "somnia.network", "category": "Virtual Society"},
-            {"name": "Soul Protocol", "twitter": "@DigitalSoulPro", "website": "digitalsoulprotocol.com", "category": "Digital Identity"},
-            {"name": "Succinct", "twitter": "@succinctlabs", "website": "succinct.xyz", "category": "Zero-Knowledge"},
-            {"name": "Symphony", "twitter": "@SymphonyFinance", "website": "app.symphony.finance", "category": "Yield Farming"},
-            {"name": "Theoriq", "twitter": "@theoriq_ai", "website": "theoriq.ai", "category": "AI Agents"},
-            {"name": "Thrive Protocol", "twitter": "@thriveprotocol", "website": "thriveprotocol.com", "category": "Social DeFi"},
-            {"name": "Union", "twitter": "@union_build", "website": "union.build", "category": "Cross-Chain Infrastructure"},
-            {"name": "YEET", "twitter": "@yeet", "website": "yeet.com", "category": "Meme + Utility"}
-        ]
-
-        # Monitored accounts
-        self.monitored_accounts = [
-            "0x_ultra", "0xBreadguy", "beast_ico", "mdudas", "lex_node",
-            "jessepollak", "0xWenMoon", "ThinkingUSD", "udiWertheimer",
-            "vohvohh", "NTmoney", "0xMert_", "QwQiao", "DefiIgnas",
-            "notthreadguy", "Chilearmy123", "Punk9277", "DeeZe", "stevenyuntcap",
-            "chefcryptoz", "ViktorBunin", "ayyyeandy", "andy8052", "Phineas_Sol",
-            "MoonOverlord", "NarwhalTan", "theunipcs", "RyanWatkins_",
-            "aixbt_agent", "ai_9684xtpa", "icebergy_", "Luyaoyuan1",
-            "stacy_muur", "TheOneandOmsy", "jeffthedunker", "JoshuaDeuk",
-            "0x_scientist", "inversebrah", "dachshundwizard", "gammichan",
-            "sandeepnailwal", "segall_max", "blknoiz06", "0xmons", "hosseeb",
-            "GwartyGwart", "JasonYanowitz", "Tyler_Did_It", "laurashin",
-            "Dogetoshi", "benbybit", "MacroCRG", "Melt_Dem"
-        ]
-        
-        # Keywords
-        self.keywords = [
-            "0G", "Allora", "ANIME", "Aptos", "Arbitrum", "Berachain", "Boop", 
-            "Caldera", "Camp Network", "Corn", "Defi App", "dYdX", "Eclipse", 
-            "Fogo", "Frax", "FUEL", "Huma", "Humanity Protocol", "Hyperbolic", 
-            "Initia", "Injective", "Infinex", "IQ", "Irys", "Kaia", "Kaito", 
-            "MegaETH", "Mitosis", "Monad", "Movement", "Multibank", "Multipli", 
-            "Near", "Newton", "Novastro", "OpenLedger", "PARADEX", "PENGU", 
-            "Polkadot", "Portal to BTC", "PuffPaw", "Pyth", "QUAI", "SatLayer", 
-            "Sei", "Sidekick", "Skate", "Somnia", "Soon", "Soph Protocol", 
-            "Soul Protocol", "Starknet", "Story", "Succinct", "Symphony", 
-            "Theoriq", "Thrive Protocol", "Union", "Virtuals Protocol", "Wayfinder", 
-            "XION", "YEET", "Zcash", "DeFi", "NFT", "Web3", "Layer2", "zkSync",
-            "Ethereum", "Bitcoin", "Solana", "Polygon", "Avalanche", "Cosmos"
-        ]
-        
+        """Load project and account lists from the shared catalog (data/catalog.jsonl)"""
+        self.catalog = get_catalog()
         logging.info(f"Data loaded: {len(self.projects)} projects, {len(self.monitored_accounts)} accounts")
     
+    def refresh_data(self) -> bool:
+        """Apply catalog file changes without a restart"""
+        return self.catalog.reload_if_changed() if self.catalog else False
+    
+    @property
+    def projects(self) -> List[Dict]:
+        return self.catalog.projects if self.catalog else []
+    
+    @property
+    def monitored_accounts(self) -> List[str]:
+        return self.catalog.accounts if self.catalog else []
+    
+    @property
+    def keywords(self) -> List[str]:
+        return self.catalog.keywords if self.catalog else []
+    
     def select_random_projects(self, count: int = 2) -> List[Dict]:
-        """Select random projects"""
-        if len(self.projects) <= count:
-            return self.projects
-        return random.sample(self.projects, count)
+        """Select projects by weight, favouring ones not posted recently"""
+        version = self.catalog.version if self.catalog else None
+        return self.rotation.sample(self.projects, count, version)
+    
+    def record_posted(self, project: Dict):
+        """Remember that a project was posted (rotation state in data/)"""
+        self.rotation.record(project)
     
     def get_random_accounts(self, count: int = 5) -> List[str]:
         """Select random accounts"""
@@ -165,198 +196,212 @@ class AdvancedContentGenerator:
     
     def split_into_thread(self, content: str) -> List[str]:
         """Split content into tweet-sized chunks for a thread"""
-        if not content:
-            return []
-            
-        # Maximum tweet length
-        MAX_LENGTH = 275  # Leave room for ellipsis when needed
+        return segment_thread(content)
+
+    def parse_thread_response(self, text: str) -> List[str]:
+        """Turn a free-text thread response into numbered tweets"""
+        content = text.strip()
+        # Clean up formatting
+        if content.startswith('"') and content.endswith('"'):
+            content = content[1:-1]
         
-        # If content fits in one tweet, return it
-        if len(content) <= MAX_LENGTH:
-            return [content]
-            
-        # Split into sentences first
-        sentences = [s.strip() for s in content.split('.') if s.strip()]
-        threads = []
-        current_tweet = ""
+        # Split into lines and clean up
+        lines = [line.strip() for line in content.split('\n') if line.strip()]
         
-        for sentence in sentences:
-            # If adding this sentence exceeds tweet limit
-            if len(current_tweet) + len(sentence) + 2 > MAX_LENGTH:
-                if current_tweet:
-                    threads.append(current_tweet.strip())
-                current_tweet = sentence + ". "
-            else:
-                current_tweet += sentence + ". "
+        # Remove any JSON formatting
+        cleaned_lines = []
+        for line in lines:
+            # Remove JSON/array formatting
+            line = line.strip('[]"\'')
+            # Remove numeric prefixes like "1.", "2.", etc.
+            line = re.sub(r'^\d+\.\s*', '', line)
+            if line:
+                cleaned_lines.append(line)
         
-        if current_tweet:
-            threads.append(current_tweet.strip())
-            
-        # Add thread numbering if more than one tweet
-        if len(threads) > 1:
-            for i in range(len(threads)):
-                threads[i] = f"{i+1}/{len(threads)} {threads[i]}"
-                
-            # Ensure no tweet exceeds limit after adding numbers
-            for i in range(len(threads)):
-                if len(threads[i]) > 280:
-                    threads[i] = threads[i][:277] + "..."
-                    
-        return threads
+        # Add thread numbering, keeping each tweet within X's weighted limit
+        return number_parts(cleaned_lines)
+
+    def build_project_prompt(self, project: Dict) -> str:
+        """Per-call payload for a single-project thread (static text is the 'thread' system instruction)"""
+        return prompt_templates.THREAD_PAYLOAD.substitute(
+            name=project['name'],
+            category=project.get('category', 'Web3 Project'),
+            twitter=project['twitter'],
+            market_context=random.choice(self.market_contexts),
+            date=datetime.now().strftime("%B %d, %Y"),
+        )
+
+    async def stream_project_content(self, project: Dict) -> AsyncIterator[str]:
+        """Stream a project thread, yielding tweet bodies as soon as each one is complete.
+
+        Raises StreamAborted once the output clearly breaks the thread
+        constraints. Bodies are unnumbered; apply number_parts once the
+        stream has finished.
+
+        Aborting only cancels the request when the response can be closed
+        (the local stub). google-generativeai 0.3.2 responses have no
+        aclose(): we stop reading, but the server finishes (and bills) the
+        generation.
+
+        If a quota or transient error cuts the stream before any tweet was
+        yielded, the thread is finished with one non-streamed request. After
+        that, StreamInterrupted is raised: yielded tweets can't be taken back,
+        so the caller has to regenerate.
+        """
+        prompt = self.build_project_prompt(project)
+        segmenter = IncrementalSegmenter(max_parts=MAX_THREAD_TWEETS, banned_openers=BANNED_OPENERS)
+        response = await self._generate(prompt, task='thread', stream=True)
+        yielded = False
+        try:
+            try:
+                async for chunk in response:
+                    for tweet in segmenter.feed(chunk.text):
+                        yielded = True
+                        yield tweet
+            except StreamInterrupted as e:
+                if yielded:
+                    raise
+                logging.warning(f"Stream interrupted before the first tweet ({e.kind}), retrying without streaming")
+                for tweet in await self._generate_thread_bodies(prompt):
+                    yield tweet
+                return
+            for tweet in segmenter.close():
+                yield tweet
+        finally:
+            # Stop the remaining output from being generated where the backend allows it
+            aclose = getattr(response, 'aclose', None)
+            if aclose:
+                await aclose()
+
+    async def _generate_thread_bodies(self, prompt: str) -> List[str]:
+        """Non-streamed thread request, segmented the same way as the stream"""
+        segmenter = IncrementalSegmenter(max_parts=MAX_THREAD_TWEETS, banned_openers=BANNED_OPENERS)
+        response = await self._generate(prompt, task='thread')
+        return segmenter.feed(response.text) + segmenter.close()
 
     async def generate_project_content(self, project: Dict) -> Optional[List[str]]:
         """Generate analytical content for a project"""
         try:
-            current_date = datetime.now().strftime("%B %d, %Y")
-            market_context = random.choice(self.market_contexts)
-            
-            prompt = f"""
-            You are a respected Web3 analyst with 5+ years in crypto markets. You're known for insightful takes that cut through the noise.
-            
-            Project Analysis:
-            - Name: {project['name']}
-            - Category: {project.get('category', 'Web3 Project')}
-            - Twitter: {project['twitter']}
-            - Current market context: {market_context}
-            - Date: {current_date}
-            
-            Your task: Write 2-3 connected tweets that demonstrate your analytical depth. Structure your response as a thread with each tweet on a new line. Do NOT format as JSON or array.
-            
-            Think like a researcher who has studied:
-            - Technical architecture and innovation
-            - Market positioning vs competitors  
-            - Ecosystem fit and partnerships
-            - Token economics (if applicable)
-            - Team background and execution track record
-            
-            Writing style guidelines:
-            - Each complete thought should be under 270 characters
-            - Start with a strong hook in the first tweet
-            - Use specific technical or market terminology naturally
-            - Reference broader Web3 trends or comparisons
-            - Include forward-looking perspective in final tweet
-            - Add 1-2 relevant hashtags at the end
-            - Avoid hype words: "revolutionary", "game-changing", "moon"
-            - Use analytical language: "worth noting", "interesting development"
-            
-            Format example:
-            1. First tweet text here...
-            2. Second tweet text here...
-            3. Final tweet text with hashtags...
-            
-            Respond with just the tweets, no additional formatting or JSON.
-            """
-            
-            response = self.model.generate_content(prompt)
-            
-            if response.text:
-                content = response.text.strip()
-                # Clean up formatting
-                if content.startswith('"') and content.endswith('"'):
-                    content = content[1:-1]
-                
-                # Split into lines and clean up
-                lines = [line.strip() for line in content.split('\n') if line.strip()]
-                
-                # Remove any JSON formatting
-                cleaned_lines = []
-                for line in lines:
-                    # Remove JSON/array formatting
-                    line = line.strip('[]"\'')
-                    # Remove numeric prefixes like "1.", "2.", etc.
-                    line = re.sub(r'^\d+\.\s*', '', line)
-                    if line:
-                        cleaned_lines.append(line)
-                
-                # Ensure each tweet fits the character limit
-                final_tweets = []
-                for tweet in cleaned_lines:
-                    if len(tweet) > 280:
-                        tweet = tweet[:277] + "..."
-                    final_tweets.append(tweet)
-                
-                # Add thread numbering
-                if len(final_tweets) > 1:
-                    for i in range(len(final_tweets)):
-                        final_tweets[i] = f"{i+1}/{len(final_tweets)} {final_tweets[i]}"
-                        if len(final_tweets[i]) > 280:
-                            final_tweets[i] = final_tweets[i][:277] + "..."
-                
-                if final_tweets:
-                    logging.info(f"Generated thread with {len(final_tweets)} tweets for: {project['name']}")
-                    return final_tweets
-                else:
-                    logging.error(f"Failed to create valid thread for: {project['name']}")
-                    return None
+            try:
+                tweets = [tweet async for tweet in self.stream_project_content(project)]
+            except StreamInterrupted as e:
+                logging.warning(f"Stream for {project['name']} interrupted ({e.kind}), regenerating without streaming")
+                tweets = await self._generate_thread_bodies(self.build_project_prompt(project))
+            final_tweets = number_parts(tweets)
+            
+            if final_tweets:
+                logging.info(f"Generated thread with {len(final_tweets)} tweets for: {project['name']}")
+                return final_tweets
             else:
-                logging.error(f"Failed to generate content for: {project['name']}")
+                logging.error(f"Failed to create valid thread for: {project['name']}")
                 return None
                 
+        except StreamAborted as e:
+            logging.warning(f"Generation aborted early for {project['name']}: {e}")
+            return None
         except Exception as e:
             logging.error(f"Error generating project content: {e}")
             return None
     
+    def build_batch_thread_prompt(self, projects: List[Dict]) -> str:
+        """One payload covering several projects; each project is an [id] line"""
+        items = "\n".join(
+            prompt_templates.THREAD_BATCH_ITEM.substitute(
+                id=i,
+                name=project['name'],
+                category=project.get('category', 'Web3 Project'),
+                twitter=project['twitter'],
+                market_context=random.choice(self.market_contexts),
+            )
+            for i, project in enumerate(projects, start=1)
+        )
+        return prompt_templates.THREAD_BATCH_PAYLOAD.substitute(
+            date=datetime.now().strftime("%B %d, %Y"), items=items)
+
+    def parse_batch_response(self, text: str) -> Dict[str, Dict]:
+        """Parse a structured batch response into items keyed by id"""
+        content = text.strip()
+        # Some models still wrap JSON in a code fence
+        if content.startswith('```'):
+            content = re.sub(r'^```(?:json)?\s*|\s*```$', '', content)
+        data = json.loads(content)
+        items = data.get('items', []) if isinstance(data, dict) else data
+        return {str(item.get('id')): item for item in items if isinstance(item, dict)}
+
+    def validate_thread(self, tweets) -> Optional[List[str]]:
+        """Validate one batched thread; returns numbered tweets or None"""
+        if not isinstance(tweets, list) or not 1 <= len(tweets) <= MAX_THREAD_TWEETS:
+            return None
+        # Same budget as the streamed path (IncrementalSegmenter)
+        limit = body_limit(MAX_THREAD_TWEETS)
+        cleaned = []
+        for tweet in tweets:
+            if not isinstance(tweet, str):
+                return None
+            tweet = re.sub(r'^\d+(?:/\d+|\.)\s+', '', tweet.strip())
+            # Leave room for the "i/n " prefix instead of truncating
+            if not tweet or weighted_length(tweet) > limit:
+                return None
+            cleaned.append(tweet)
+        return number_parts(cleaned)
+
+    async def generate_projects_content(self, projects: List[Dict],
+                                        fallback: bool = True) -> List[Optional[List[str]]]:
+        """Generate threads for several projects in one request.
+
+        Items that fail validation are regenerated with a per-project call,
+        or left as None when `fallback` is False (e.g. to stream them instead).
+        """
+        if not projects:
+            return []
+        items = {}
+        try:
+            prompt = self.build_batch_thread_prompt(projects)
+            config = model_backend.json_generation_config(THREAD_BATCH_SCHEMA)
+            response = await self._generate(prompt, task='thread_batch', **({'generation_config': config} if config else {}))
+            items = self.parse_batch_response(response.text)
+        except Exception as e:
+            logging.error(f"Error generating batched project content: {e}")
+
+        results = []
+        for i, project in enumerate(projects, start=1):
+            tweets = self.validate_thread(items.get(str(i), {}).get('tweets'))
+            if tweets:
+                logging.info(f"Generated thread with {len(tweets)} tweets for: {project['name']} (batched)")
+            elif fallback:
+                logging.warning(f"Batched output invalid for {project['name']}, falling back to single request")
+                tweets = await self.generate_project_content(project)
+            else:
+                logging.warning(f"Batched output invalid for {project['name']}")
+            results.append(tweets)
+        return results
+
     async def generate_reply(self, tweet_data: Dict) -> Optional[str]:
         """Generate analytical reply to a tweet"""
         try:
             tweet_text = tweet_data.get('text', '')
             username = tweet_data.get('username', '')
             
-            # Analyze tweet for Web3 topics
-            found_keywords = []
-            for keyword in self.keywords:
-                if keyword.lower() in tweet_text.lower():
-                    found_keywords.append(keyword)
-            
-            # Determine tweet category
-            tweet_category = self.categorize_tweet(tweet_text, found_keywords)
-            
-            prompt = f"""
-            You are a seasoned Web3 researcher engaging in a Twitter discussion. You're known for thoughtful, analytical responses that add genuine value.
-            
-            Tweet Context:
-            - Author: @{username} (crypto/Web3 influencer)
-            - Content: "{tweet_text}"
-            - Detected topics: {', '.join(found_keywords) if found_keywords else 'General Web3/crypto'}
-            - Category: {tweet_category}
-            
-            Your expertise areas:
-            - DeFi protocols and yield strategies
-            - Layer 1/Layer 2 scaling solutions  
-            - NFT market dynamics and utility
-            - Cross-chain infrastructure
-            - Tokenomics and governance
-            - Market analysis and trends
-            
-            Response guidelines:
-            - Provide a unique perspective or insight
-            - Reference specific protocols, metrics, or trends when relevant
-            - Ask a thoughtful follow-up question if appropriate
-            - Share a contrarian view if you disagree (respectfully)
-            - Use technical terminology naturally
-            - Avoid generic responses like "great point" or "thanks for sharing"
-            - Don't be promotional or salesy
-            
-            Response types to consider:
-            - Technical clarification or additional context
-            - Market data or trend observation  
-            - Comparison to similar projects/situations
-            - Historical precedent or pattern recognition
-            - Risk assessment or consideration
-            - Implementation challenge or opportunity
+            # Analyze tweet for Web3 topics and category
+            analysis = self.classify_tweets([tweet_text])[0]
+            found_keywords = analysis['keywords']
+            tweet_category = analysis['category']
             
-            Maximum 280 characters. Respond as if you're genuinely interested in advancing the conversation.
-            """
+            prompt = prompt_templates.REPLY_PAYLOAD.substitute(
+                username=username,
+                topics=', '.join(found_keywords) if found_keywords else 'General Web3/crypto',
+                category=tweet_category,
+                content=json.dumps(tweet_text, ensure_ascii=False),
+            )
             
-            response = self.model.generate_content(prompt)
+            response = await self._generate(prompt, priority=PRIORITY_REPLY, task='reply')
             
             if response.text:
                 reply = response.text.strip()
                 if reply.startswith('"') and reply.endswith('"'):
                     reply = reply[1:-1]
                 
-                if len(reply) > 280:
-                    reply = reply[:277] + "..."
+                reply = truncate(reply)
                 
                 logging.info(f"Advanced reply generated for: @{username}")
                 return reply
@@ -368,63 +413,104 @@ class AdvancedContentGenerator:
             logging.error(f"Error generating reply: {e}")
             return None
     
-    def categorize_tweet(self, tweet_text: str, keywords: List[str]) -> str:
-        """Categorize tweet based on content"""
-        text_lower = tweet_text.lower()
+    def build_batch_reply_prompt(self, candidates: List[Dict]) -> str:
+        """One payload covering several tweets; each tweet is an [id] line"""
+        tweet_lines = []
+        analyses = self.classify_tweets([tweet_data.get('text', '') for tweet_data in candidates])
+        for i, (tweet_data, analysis) in enumerate(zip(candidates, analyses), start=1):
+            found_keywords = analysis['keywords']
+            tweet_lines.append(prompt_templates.REPLY_BATCH_ITEM.substitute(
+                id=i,
+                username=tweet_data.get('username', ''),
+                topics=', '.join(found_keywords) if found_keywords else 'General Web3/crypto',
+                category=analysis['category'],
+                content=json.dumps(tweet_data.get('text', ''), ensure_ascii=False),
+            ))
+        return "\n".join(tweet_lines)
+
+    def validate_reply(self, reply) -> Optional[str]:
+        """Validate one batched reply; returns the cleaned reply or None"""
+        if not isinstance(reply, str):
+            return None
+        reply = reply.strip()
+        if reply.startswith('"') and reply.endswith('"'):
+            reply = reply[1:-1].strip()
+        if not reply or weighted_length(reply) > 280:
+            return None
+        return reply
+
+    async def generate_replies(self, candidates: List[Dict]) -> List[Optional[str]]:
+        """Generate replies for several tweets in one request.
+
+        Items that fail validation are regenerated with generate_reply.
+        """
+        if not candidates:
+            return []
+        items = {}
+        try:
+            prompt = self.build_batch_reply_prompt(candidates)
+            config = model_backend.json_generation_config(REPLY_BATCH_SCHEMA)
+            response = await self._generate(prompt, priority=PRIORITY_REPLY, task='reply_batch', **({'generation_config': config} if config else {}))
+            items = self.parse_batch_response(response.text)
+        except Exception as e:
+            logging.error(f"Error generating batched replies: {e}")
+
+        replies = []
+        for i, tweet_data in enumerate(candidates, start=1):
+            reply = self.validate_reply(items.get(str(i), {}).get('reply'))
+            if reply:
+                logging.info(f"Advanced reply generated for: @{tweet_data.get('username', '')} (batched)")
+            else:
+                logging.warning(f"Batched reply invalid for @{tweet_data.get('username', '')}, "
+                                f"falling back to single request")
+                reply = await self.generate_reply(tweet_data)
+            replies.append(reply)
+        return replies
+
+    @property
+    def classifier(self) -> TweetClassifier:
+        """Classifier over the current catalog keywords, rebuilt when the catalog changes"""
+        version = self.catalog.version if self.catalog else None
+        if self._classifier is None or self._classifier_version != version:
+            self._classifier = TweetClassifier(self.keywords)
+            self._classifier_version = version
+        return self._classifier
+    
+    def classify_tweets(self, tweet_texts: List[str]) -> List[Dict]:
+        """Classify many tweets in one pass.
         
-        if any(word in text_lower for word in ['defi', 'yield', 'liquidity', 'tvl', 'apy']):
-            return "DeFi Discussion"
-        elif any(word in text_lower for word in ['nft', 'opensea', 'mint', 'collection']):
-            return "NFT Discussion"  
-        elif any(word in text_lower for word in ['layer2', 'l2', 'scaling', 'rollup']):
-            return "Scaling Solutions"
-        elif any(word in text_lower for word in ['bitcoin', 'btc', 'ethereum', 'eth']):
-            return "Major Crypto Assets"
-        elif any(word in text_lower for word in ['ai', 'artificial intelligence', 'machine learning']):
-            return "AI + Crypto"
-        elif any(word in text_lower for word in ['regulation', 'sec', 'compliance']):
-            return "Regulatory Discussion"
-        elif any(word in text_lower for word in ['gaming', 'metaverse', 'virtual']):
-            return "Gaming/Metaverse"
-        else:
-            return "General Web3"
+        Returns one dict per tweet: `category`, per-category `scores` and the
+        catalog `keywords` it mentions.
+        """
+        return self.classifier.classify(tweet_texts)
+    
+    def find_keywords(self, tweet_text: str) -> List[str]:
+        """Return catalog keywords mentioned in a tweet"""
+        return self.classify_tweets([tweet_text])[0]['keywords']
+    
+    def categorize_tweet(self, tweet_text: str, keywords: Optional[List[str]] = None) -> str:
+        """Categorize tweet based on content
+
+        Deprecated: ``keywords`` is ignored; the category comes from the tweet
+        classifier. The parameter is kept only so existing callers keep working.
+        """
+        return self.classify_tweets([tweet_text])[0]['category']
     
     async def generate_market_insight(self) -> Optional[str]:
         """Generate general market insight tweet"""
         try:
             market_context = random.choice(self.market_contexts)
             
-            prompt = f"""
-            You are a crypto market analyst sharing a weekly insight with your followers. Current focus: {market_context}
-            
-            Create an insightful tweet about the current Web3/crypto landscape that:
-            - Identifies an underappreciated trend or pattern
-            - Provides actionable perspective for builders or investors  
-            - References specific metrics, protocols, or developments
-            - Avoids generic market commentary
-            - Shows deep understanding of the space
-            
-            Topics to potentially explore:
-            - Cross-chain infrastructure maturation
-            - DeFi yield landscape evolution
-            - Layer 2 adoption metrics
-            - Institutional crypto adoption signals
-            - Developer activity trends
-            - Regulatory clarity impact
-            - NFT utility evolution beyond art
-            
-            Maximum 280 characters. Write as if you're sharing alpha that others might miss.
-            """
+            prompt = prompt_templates.INSIGHT_PAYLOAD.substitute(market_context=market_context)
             
-            response = self.model.generate_content(prompt)
+            response = await self._generate(prompt, priority=PRIORITY_BACKGROUND, task='insight')
             
             if response.text:
                 content = response.text.strip()
                 if content.startswith('"') and content.endswith('"'):
                     content = content[1:-1]
                 
-                if len(content) > 280:
-                    content = content[:277] + "..."
+                content = truncate(content)
                 
                 logging.info("Market insight generated")
                 return content
@@ -441,37 +527,8 @@ class AdvancedContentGenerator:
         try:
             # Single paragraph
             content = content.replace('\n', ' ').strip()
-            
-            # Split by sentences
-            import re
-            sentences = re.split(r'(?<=[.!?])\s+', content)
-            
-            tweets = []
-            current_tweet = ""
-            
-            for sentence in sentences:
-                sentence = sentence.strip()
-                if not sentence:
-                    continue
-                    
-                # Can we add this sentence?
-                test_tweet = current_tweet + (" " if current_tweet else "") + sentence
-                
-                if len(test_tweet) <= char_limit:
-                    current_tweet = test_tweet
-                else:
-                    # Save current tweet
-                    if current_tweet:
-                        tweets.append(current_tweet.strip())
-                    # Start new tweet
-                    current_tweet = sentence
-            
-            # Add last tweet
-            if current_tweet:
-                tweets.append(current_tweet.strip())
-            
-            return tweets
+            return segment_thread(content, limit=char_limit, numbering=False)
             
         except Exception as e:
             logging.error(f"Error splitting content: {e}")
-            return [content[:char_limit]]
+            return [truncate(content, char_limit)]
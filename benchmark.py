@@ -0,0 +1,689 @@
+import argparse
+import asyncio
+import email
+import json
+import logging
+import os
+import platform
+import random
+import re
+import statistics
+import subprocess
+import sys
+import timeit
+import unicodedata
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from thread_segmenter import segment_thread, truncate, weighted_length, graphemes
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'benchmark')
+RESULTS_DIR = 'data/benchmarks'
+
+# Her vaka gerçekçi boyutta ve 100 kat büyütülmüş girdiyle ölçülür
+SCALES = {"realistic": 1, "100x": 100}
+
+# Üretilen metinlerde kullanılan parçalar: URL, ondalık sayı, CJK, emoji dizileri
+VOCABULARY = [
+    "Monad", "parallel", "EVM", "throughput", "DeFi", "liquidity", "TVL", "rollup",
+    "3.5x", "$2.4B", "v2.1", "e.g.", "restaking", "sequencer", "validators", "yield",
+    "monad.xyz", "https://x.com/monad_xyz/status/1790000000000000000", "caldera.xyz/docs",
+    "流動性", "ステーキング", "👍🏽", "🇹🇷", "👩‍💻", "café", "naïve", "—",
+]
+PUNCTUATION = [".", ",", "!", "?", ";", ":", ""]
+
+BENCHMARKS: Dict[str, Callable[[int], Callable[[], object]]] = {}
+
+
+class SkipBenchmark(Exception):
+    """Vaka bu ortamda çalıştırılamıyor (ör. bağımlılık eksik)"""
+
+
+def benchmark(name: str):
+    """Vaka kaydı: fonksiyon ölçek alır, ölçülecek çağrıyı döndürür"""
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+    return register
+
+
+def generate_text(words: int, seed: int = 0) -> str:
+    """Cümle ve paragraf yapısı olan rastgele metin üret"""
+    rng = random.Random(seed)
+    out = []
+    for i in range(words):
+        word = rng.choice(VOCABULARY)
+        if rng.random() < 0.12:
+            word += rng.choice(PUNCTUATION)
+        out.append(word)
+        if rng.random() < 0.01:
+            out.append("\n\n")
+    return " ".join(out)
+
+
+def load_fixture(name: str) -> str:
+    with open(os.path.join(FIXTURES_DIR, name), 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def fixture_tweets(scale: int) -> List[str]:
+    tweets = [line.strip() for line in load_fixture('tweets.txt').splitlines() if line.strip()]
+    return tweets * scale
+
+
+def content_generator():
+    try:
+        from advanced_content_generator import AdvancedContentGenerator
+    except ImportError as e:
+        raise SkipBenchmark(f"advanced_content_generator import failed: {e}")
+    generator = AdvancedContentGenerator()
+    generator.load_data()
+    return generator
+
+
+def email_handler():
+    from email_handler import EmailHandler
+    return EmailHandler()
+
+
+# --- Thread bölücüler ---
+
+@benchmark("segmenter.segment_thread")
+def bench_segment_thread(scale):
+    text = generate_text(120 * scale)
+    return lambda: segment_thread(text)
+
+
+@benchmark("segmenter.truncate")
+def bench_truncate(scale):
+    texts = [generate_text(60, seed=i) for i in range(10 * scale)]
+    return lambda: [truncate(t) for t in texts]
+
+
+@benchmark("generator.split_content_by_sentences")
+def bench_split_content_by_sentences(scale):
+    generator = content_generator()
+    text = generate_text(120 * scale)
+    return lambda: generator.split_content_by_sentences(text)
+
+
+@benchmark("browser.smart_split_content")
+def bench_smart_split_content(scale):
+    try:
+        from twitter_browser import TwitterBrowser
+    except ImportError as e:
+        raise SkipBenchmark(f"twitter_browser import failed: {e}")
+    browser = TwitterBrowser()
+    text = generate_text(120 * scale)
+    return lambda: browser.smart_split_content(text)
+
+
+# --- İçerik üretimi (CPU tarafı) ---
+
+@benchmark("generator.find_keywords")
+def bench_find_keywords(scale):
+    generator = content_generator()
+    tweets = fixture_tweets(scale)
+    return lambda: [generator.find_keywords(t) for t in tweets]
+
+
+@benchmark("generator.categorize_tweet")
+def bench_categorize_tweet(scale):
+    generator = content_generator()
+    tweets = fixture_tweets(scale)
+    return lambda: [generator.categorize_tweet(t) for t in tweets]
+
+
+def _timeline_tweets(count: int) -> List[str]:
+    tweets = fixture_tweets(1)
+    return [tweets[i % len(tweets)] for i in range(count)]
+
+
+@benchmark("classifier.classify_tweets")
+def bench_classify_tweets(scale):
+    # Bir zaman akışı taraması (100 tweet); 100x ölçekte 10k tweet
+    generator = content_generator()
+    tweets = _timeline_tweets(100 * scale)
+    generator.classifier.use_numpy = False
+    return lambda: generator.classify_tweets(tweets)
+
+
+@benchmark("classifier.classify_tweets_numpy")
+def bench_classify_tweets_numpy(scale):
+    from tweet_classifier import TweetClassifier, np
+    if np is None:
+        raise SkipBenchmark("numpy not installed")
+    generator = content_generator()
+    classifier = TweetClassifier(generator.keywords, use_numpy=True)
+    tweets = _timeline_tweets(100 * scale)
+    return lambda: classifier.classify(tweets)
+
+
+@benchmark("generator.parse_thread_response")
+def bench_parse_thread_response(scale):
+    generator = content_generator()
+    response = load_fixture('gemini_thread_response.txt')
+    if scale > 1:
+        body = response.strip().strip('"')
+        response = '"' + "\n".join([body] * scale) + '"'
+    return lambda: generator.parse_thread_response(response)
+
+
+# --- Yakın kopya kontrolü ---
+
+@benchmark("dedup.find")
+def bench_dedup_find(scale):
+    import tempfile
+    from duplicate_detector import DuplicateIndex, shingles
+
+    index = DuplicateIndex(os.path.join(tempfile.mkdtemp(), 'fingerprints.jsonl'), window_days=30)
+    # Ölçek başına 1000 gönderilmiş içerik (30 gün için gerçekçi üst sınır); kelime
+    # hazinesi geniş tutulur, gerçek gönderiler gibi birbirine benzemezler
+    now = datetime.now().timestamp()
+    rng = random.Random(0)
+    index.entries = [{'shingles': sorted(shingles(" ".join(f"w{rng.randrange(20000)}" for _ in range(45)))),
+                      'kind': 'post', 'posted_at': now, 'preview': ''} for i in range(1000 * scale)]
+    index._rebuild()
+    queries = fixture_tweets(1)
+    return lambda: [index.find(q) for q in queries]
+
+
+# --- Katalog ---
+
+def _scaled_catalog(scale: int) -> str:
+    """Gerçek katalog, ölçek kadar benzersiz adla çoğaltılmış geçici kopya"""
+    import tempfile
+    with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'catalog.jsonl'), encoding='utf-8') as f:
+        entries = [json.loads(line) for line in f if line.strip() and not line.startswith('#')]
+    path = os.path.join(tempfile.mkdtemp(), 'catalog.jsonl')
+    with open(path, 'w', encoding='utf-8') as f:
+        for copy in range(scale):
+            for entry in entries:
+                if copy:
+                    field = {'project': 'name', 'account': 'handle', 'keyword': 'keyword'}[entry['type']]
+                    entry = dict(entry, **{field: f"{entry[field]}{copy}"})
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+    return path
+
+
+@benchmark("catalog.load")
+def bench_catalog_load(scale):
+    from catalog import Catalog
+
+    catalog = Catalog(_scaled_catalog(scale))
+    return catalog.load
+
+
+@benchmark("catalog.reload_append")
+def bench_catalog_reload_append(scale):
+    from catalog import Catalog
+
+    path = _scaled_catalog(scale)
+    catalog = Catalog(path)
+    counter = iter(range(10 ** 9))
+
+    def append_and_reload():
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps({'type': 'keyword', 'keyword': f"bench{next(counter)}"}) + "\n")
+        catalog.reload_if_changed()
+    return append_and_reload
+
+
+@benchmark("rotation.sample")
+def bench_rotation_sample(scale):
+    import tempfile
+    from rotation_sampler import RotationSampler
+
+    sampler = RotationSampler(os.path.join(tempfile.mkdtemp(), 'rotation.json'), half_life_days=3)
+    projects = [{'name': f"project{i}", 'weight': 1 + i % 3} for i in range(50 * scale)]
+    # Projelerin onda biri son günlerde paylaşılmış
+    now = datetime.now().timestamp()
+    sampler.last_posted = {f"project{i}": now - i * 3600 for i in range(0, len(projects), 10)}
+    sampler.sample(projects, 2, version=1)
+    return lambda: [sampler.sample(projects, 2, version=1) for _ in range(100)]
+
+
+# --- Hata görüntüleri ---
+
+@benchmark("artifacts.store")
+def bench_artifacts_store(scale):
+    import tempfile
+    from debug_artifacts import ArtifactStore
+
+    # Kota dolu klasöre yazım: her kayıt en eski dosyayı siler
+    store = ArtifactStore(tempfile.mkdtemp(), quota_bytes=200 * 1024 * scale,
+                          image_format='jpeg', interval=0, dom_snapshot=True)
+    image = os.urandom(40 * 1024)
+    html = "<div data-testid=\"tweet\">gm</div>" * 2000
+    for i in range(10 * scale):
+        store._write(f"warmup:{i}", image, html)
+    return lambda: [store._write(f"bench:{i}", image, html) for i in range(20)]
+
+
+# --- E-posta ayrıştırma ---
+
+def _scaled_message(name: str, scale: int):
+    message = email.message_from_string(load_fixture(name))
+    if scale == 1:
+        return message
+    # Büyük bülten benzeri e-posta: metin gövdeleri büyütülür
+    for part in message.walk():
+        if part.get_content_maintype() == 'text':
+            body = part.get_payload(decode=True).decode('utf-8', errors='ignore')
+            del part['Content-Transfer-Encoding']
+            part.set_payload(body * scale, 'utf-8')
+    return message
+
+
+@benchmark("email.get_email_body")
+def bench_get_email_body(scale):
+    handler = email_handler()
+    messages = [_scaled_message('verification_email.eml', scale),
+                _scaled_message('verification_email_html.eml', scale)]
+    return lambda: [handler.get_email_body(m) for m in messages]
+
+
+@benchmark("email.extract_verification_code")
+def bench_extract_verification_code(scale):
+    handler = email_handler()
+    bodies = [handler.get_email_body(_scaled_message(name, 1))
+              for name in ('verification_email.eml', 'verification_email_html.eml')]
+    # Kodun metnin sonunda olduğu büyük gövde en kötü durumu ölçer
+    noise = "Security tips: never share your password with anyone. " * 40 * (scale - 1)
+    bodies = [noise + body for body in bodies]
+    return lambda: [handler.extract_verification_code(b) for b in bodies]
+
+
+# --- Çalıştırma ve karşılaştırma ---
+
+def measure(func: Callable[[], object], repeat: int) -> Dict:
+    timer = timeit.Timer(func)
+    loops, _ = timer.autorange()
+    samples = [t / loops for t in timer.repeat(repeat=repeat, number=loops)]
+    return {
+        "median_us": statistics.median(samples) * 1e6,
+        "min_us": min(samples) * 1e6,
+        "stdev_us": (statistics.stdev(samples) if len(samples) > 1 else 0.0) * 1e6,
+        "loops": loops,
+        "repeat": repeat,
+    }
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'],
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except Exception:
+        return None
+
+
+def run_benchmarks(pattern: Optional[str], scales: List[str], repeat: int) -> Dict:
+    results = {}
+    for name, setup in BENCHMARKS.items():
+        if pattern and not re.search(pattern, name):
+            continue
+        for scale_name in scales:
+            key = f"{name}@{scale_name}"
+            try:
+                func = setup(SCALES[scale_name])
+            except SkipBenchmark as e:
+                print(f"⏭️  {key:<48} skipped: {e}")
+                results[key] = {"skipped": str(e)}
+                continue
+            stats = measure(func, repeat)
+            results[key] = stats
+            print(f"⏱️  {key:<48} median={stats['median_us']:12.1f} µs  min={stats['min_us']:12.1f} µs")
+    return {
+        "meta": {
+            "created": datetime.now().isoformat(),
+            "commit": git_commit(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+        },
+        "results": results,
+    }
+
+
+def compare_results(base: Dict, new: Dict, threshold: float) -> List[str]:
+    """Eşikten fazla yavaşlayan vakaların listesini döndür"""
+    regressions = []
+    for key, new_stats in sorted(new["results"].items()):
+        base_stats = base["results"].get(key)
+        if not base_stats or "median_us" not in base_stats or "median_us" not in new_stats:
+            print(f"   {key:<48} {'n/a':>10}")
+            continue
+        ratio = new_stats["median_us"] / base_stats["median_us"]
+        if ratio > 1 + threshold:
+            marker = "❌"
+            regressions.append(key)
+        elif ratio < 1 - threshold:
+            marker = "✅"
+        else:
+            marker = "  "
+        print(f"{marker} {key:<48} {base_stats['median_us']:12.1f} → {new_stats['median_us']:12.1f} µs  ({ratio:5.2f}x)")
+    return regressions
+
+
+def check_segmenter_properties(text: str, limit: int = 280):
+    """Segmenter değişmezlerini doğrula; ihlalde AssertionError"""
+    segments = segment_thread(text, limit=limit)
+    numbered = len(segments) > 1
+    for i, segment in enumerate(segments, start=1):
+        assert weighted_length(segment) <= limit, f"segment {i} exceeds {limit}"
+        if numbered:
+            assert segment.startswith(f"{i}/{len(segments)} "), f"segment {i} numbering"
+        # Kesimler grafem sınırında olmalı: hiçbir parça birleştirici ile başlamaz
+        body = segment.split(" ", 1)[1] if numbered else segment
+        assert graphemes(body)[0] == body[:len(graphemes(body)[0])]
+        assert unicodedata.category(body[0]) not in ("Mn", "Me", "Mc")
+    bodies = [s.split(" ", 1)[1] if numbered else s for s in segments]
+    expected = re.sub(r"\s+", "", unicodedata.normalize("NFC", text))
+    assert re.sub(r"\s+", "", "".join(bodies)) == expected, "content lost or reordered"
+    assert weighted_length(truncate(text, limit)) <= limit, "truncate exceeds limit"
+
+
+def run_properties(cases: int, max_words: int, seed: int) -> int:
+    rng = random.Random(seed)
+    for case in range(cases):
+        text = generate_text(rng.randint(1, max_words), seed=rng.randrange(1 << 30))
+        for limit in (280, 140):
+            check_segmenter_properties(text, limit)
+    return cases
+
+
+# Tek kelimelik düzenleme ve eklenen ifadeler yakın kopya sayılmalı
+DUPLICATE_SUFFIXES = ["Thoughts?", "What do you think?", "🚀"]
+DUPLICATE_REPLACEMENTS = ["Celestia", "Arbitrum", "Avalanche"]
+
+
+def check_duplicate_properties() -> int:
+    """Fixture tweet'leri (ve 3'lü thread'ler) üzerinde yakın kopya tespiti
+
+    Her metnin tüm tek kelimelik değişiklikleri ve sona eklenmiş ifadeler
+    bulunmalı; dizinde olmayan ilgisiz bir metin eşleşmemeli.
+    """
+    import tempfile
+    from duplicate_detector import DuplicateIndex, normalize
+
+    tweets = fixture_tweets(1)
+    threads = ["\n".join(tweets[i:i + 3]) for i in range(0, len(tweets) - 2, 3)]
+    posts = tweets + threads
+    checked = 0
+    for i, post in enumerate(posts):
+        index = DuplicateIndex(os.path.join(tempfile.mkdtemp(), 'fingerprints.jsonl'), window_days=30)
+        index.add(post)
+        words = post.split()
+        # Proje adı değişimi gibi: metinde geçmeyen bir kelime konur
+        replacement = next(w for w in DUPLICATE_REPLACEMENTS if w.lower() not in normalize(post))
+        variants = [" ".join(words[:j] + [replacement] + words[j + 1:]) for j in range(len(words))]
+        variants += [f"{post} {suffix}" for suffix in DUPLICATE_SUFFIXES]
+        for variant in variants:
+            match = index.find(variant)
+            assert match, f"edit not detected: {variant!r}"
+            checked += 1
+        for other in posts:
+            if other is post or set(other.split("\n")) & set(post.split("\n")):
+                continue
+            match = index.find(other)
+            assert match is None, f"unrelated post matched ({match['similarity']}): {other!r}"
+            checked += 1
+    return checked
+
+
+# --- Girdi token raporu (yerel stub ile) ---
+
+TOKEN_BASELINE = os.path.join(FIXTURES_DIR, 'prompt_tokens_baseline.json')
+REPORT_TWEETS = [
+    {'text': "Monad mainnet is live, parallel EVM with 10k TPS. What are you building?", 'username': 'monad_xyz'},
+    {'text': "DeFi yields are compressing again, restaking is the new carry trade.", 'username': 'DefiIgnas'},
+    {'text': "Layer 2 fees dropped 90% after the upgrade.", 'username': 'jessepollak'},
+]
+
+
+def _stub_prompt_tokens(generator) -> int:
+    from model_backend import stub_usage
+    return stub_usage(generator).get('prompt_tokens', 0)
+
+
+async def measure_input_tokens() -> Dict[str, int]:
+    """Her üretim çağrısının stub'a gönderdiği girdi token'ı (system instruction dahil)"""
+    os.environ['GEMINI_BACKEND'] = 'stub'
+    from advanced_content_generator import AdvancedContentGenerator
+
+    random.seed(0)
+    generator = AdvancedContentGenerator()
+    await generator.initialize()
+    calls = {
+        'generate_project_content': lambda: generator.generate_project_content(generator.projects[0]),
+        'generate_projects_content': lambda: generator.generate_projects_content(generator.projects[:2]),
+        'generate_reply': lambda: generator.generate_reply(REPORT_TWEETS[0]),
+        'generate_replies': lambda: generator.generate_replies(REPORT_TWEETS),
+        'generate_market_insight': lambda: generator.generate_market_insight(),
+    }
+    tokens = {}
+    for name, call in calls.items():
+        before = _stub_prompt_tokens(generator)
+        await call()
+        tokens[name] = _stub_prompt_tokens(generator) - before
+    return tokens
+
+
+def token_report(baseline_path: str) -> Dict[str, int]:
+    logging.disable(logging.INFO)
+    tokens = asyncio.run(measure_input_tokens())
+    baseline = {}
+    if os.path.exists(baseline_path):
+        with open(baseline_path, 'r', encoding='utf-8') as f:
+            baseline = json.load(f).get('input_tokens', {})
+    print(f"{'call':<28} {'before':>8} {'after':>8} {'saved':>7}")
+    for name, after in tokens.items():
+        before = baseline.get(name)
+        if before:
+            print(f"{name:<28} {before:>8} {after:>8} {1 - after / before:>7.0%}")
+        else:
+            print(f"{name:<28} {'n/a':>8} {after:>8}")
+    return tokens
+
+
+# --- Tarayıcı belleği (açılış profilleri) ---
+
+MEMORY_SAMPLE_INTERVAL = 0.25
+MEMORY_SETTLE_SECONDS = 10.0
+
+
+def _process_tree(root: int) -> List[int]:
+    """`root` ve tüm alt süreçleri (Playwright sürücüsü ve Chromium süreçleri)"""
+    children: Dict[int, List[int]] = {}
+    for name in os.listdir('/proc'):
+        if not name.isdigit():
+            continue
+        try:
+            with open(f'/proc/{name}/stat', 'r') as f:
+                # Süreç adı parantez içindedir ve boşluk içerebilir
+                ppid = int(f.read().rsplit(')', 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(ppid, []).append(int(name))
+    tree, stack = [], [root]
+    while stack:
+        pid = stack.pop()
+        tree.append(pid)
+        stack.extend(children.get(pid, ()))
+    return tree
+
+
+def _tree_memory(root: int) -> Dict[str, int]:
+    """Süreç ağacının toplam RSS ve PSS değeri (kB); PSS paylaşılan sayfaları bir kez sayar"""
+    totals = {'rss_kb': 0, 'pss_kb': 0}
+    for pid in _process_tree(root):
+        try:
+            with open(f'/proc/{pid}/smaps_rollup', 'r') as f:
+                for line in f:
+                    if line.startswith('Rss:'):
+                        totals['rss_kb'] += int(line.split()[1])
+                    elif line.startswith('Pss:'):
+                        totals['pss_kb'] += int(line.split()[1])
+        except OSError:
+            continue
+    return totals
+
+
+async def measure_browser_memory(launch_profile: str, flows: List[str], account: str,
+                                 settle: float) -> Optional[Dict]:
+    """Bir açılış profiliyle tam döngü: döngü boyunca tepe, ardından boşta kararlı bellek"""
+    from har_session import run_flow
+    from twitter_browser import TwitterBrowser
+
+    twitter = TwitterBrowser(launch_profile=launch_profile)
+    samples: List[Dict[str, int]] = []
+    root = os.getpid()
+
+    async def sample():
+        while True:
+            samples.append(_tree_memory(root))
+            await asyncio.sleep(MEMORY_SAMPLE_INTERVAL)
+
+    sampler = asyncio.ensure_future(sample())
+    try:
+        if not await twitter.initialize():
+            return None
+        for flow in flows:
+            await run_flow(twitter, flow, account)
+        cycle_samples = len(samples)
+        await asyncio.sleep(settle)
+        steady = samples[cycle_samples:] or samples[-1:]
+        return {
+            'peak_rss_mb': max(s['rss_kb'] for s in samples) / 1024,
+            'steady_rss_mb': statistics.median(s['rss_kb'] for s in steady) / 1024,
+            'peak_pss_mb': max(s['pss_kb'] for s in samples) / 1024,
+            'steady_pss_mb': statistics.median(s['pss_kb'] for s in steady) / 1024,
+            'processes': len(_process_tree(root)) - 1,
+            'launch_seconds': twitter.profile.report['launch_seconds'],
+            'flows': twitter.metrics.summary(),
+            'navigation': twitter.navigation_summary(),
+        }
+    finally:
+        sampler.cancel()
+        await twitter.close()
+
+
+def memory_report(profiles: List[str], flows: List[str], account: str, settle: float) -> Dict[str, Dict]:
+    if not os.path.exists('/proc/self/smaps_rollup'):
+        print("⏭️  memory: /proc/<pid>/smaps_rollup is not available on this platform")
+        return {}
+    logging.disable(logging.INFO)
+    report = {}
+    print(f"{'profile':<10} {'peak_rss':>9} {'steady_rss':>11} {'peak_pss':>9} {'steady_pss':>11} {'procs':>6} {'launch_s':>9}")
+    for name in profiles:
+        try:
+            result = asyncio.run(measure_browser_memory(name, flows, account, settle))
+        except ImportError as e:
+            print(f"⏭️  memory skipped: {e}")
+            return report
+        if result is None:
+            print(f"❌ {name}: browser could not be initialized")
+            continue
+        report[name] = result
+        print(f"{name:<10} {result['peak_rss_mb']:>8.0f}M {result['steady_rss_mb']:>10.0f}M "
+              f"{result['peak_pss_mb']:>8.0f}M {result['steady_pss_mb']:>10.0f}M "
+              f"{result['processes']:>6} {result['launch_seconds'] or 0:>9.2f}")
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CPU hot path benchmarks")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = sub.add_parser("run", help="run benchmarks and store results as JSON")
+    run_parser.add_argument("--filter", help="regex on benchmark names")
+    run_parser.add_argument("--scale", choices=list(SCALES), nargs="+", default=list(SCALES))
+    run_parser.add_argument("--repeat", type=int, default=5)
+    run_parser.add_argument("--output", help=f"result file (default: {RESULTS_DIR}/bench-<timestamp>.json)")
+
+    compare_parser = sub.add_parser("compare", help="compare two result files")
+    compare_parser.add_argument("base")
+    compare_parser.add_argument("new")
+    compare_parser.add_argument("--threshold", type=float, default=0.10,
+                                help="allowed slowdown ratio before flagging (default 0.10)")
+
+    check_parser = sub.add_parser("check", help="segmenter property checks on generated inputs")
+    check_parser.add_argument("--cases", type=int, default=100)
+    check_parser.add_argument("--max-words", type=int, default=5000)
+    check_parser.add_argument("--seed", type=int, default=1)
+
+    tokens_parser = sub.add_parser("tokens", help="input tokens per generation call against the local stub")
+    tokens_parser.add_argument("--baseline", default=TOKEN_BASELINE, help="earlier token report to compare with")
+    tokens_parser.add_argument("--output", help="write this report as JSON (usable as a later --baseline)")
+
+    memory_parser = sub.add_parser("memory", help="browser RSS over a full cycle for each launch profile")
+    memory_parser.add_argument("--profiles", default="default,lean", help="comma separated launch profiles")
+    memory_parser.add_argument("--mode", choices=["replay", "live"], default="replay",
+                               help="replay a HAR fixture (offline; record it first with "
+                                    "`python har_session.py record --name <name>`) or use the live site")
+    memory_parser.add_argument("--name", default="session", help="HAR fixture name (fixtures/har/<name>.har)")
+    memory_parser.add_argument("--flows", help="comma separated flows (default: har_session defaults)")
+    memory_parser.add_argument("--account", default="monad_xyz")
+    memory_parser.add_argument("--settle", type=float, default=MEMORY_SETTLE_SECONDS,
+                               help="idle seconds after the cycle for the steady-state sample")
+    memory_parser.add_argument("--output", help="write the report as JSON")
+
+    sub.add_parser("list", help="list benchmark names")
+
+    args = parser.parse_args()
+
+    if args.command == "list":
+        for name in BENCHMARKS:
+            print(name)
+    elif args.command == "run":
+        report = run_benchmarks(args.filter, args.scale, args.repeat)
+        output = args.output or os.path.join(
+            RESULTS_DIR, f"bench-{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+        os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+        with open(output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"💾 Results saved to {output}")
+    elif args.command == "compare":
+        with open(args.base, 'r', encoding='utf-8') as f:
+            base = json.load(f)
+        with open(args.new, 'r', encoding='utf-8') as f:
+            new = json.load(f)
+        regressions = compare_results(base, new, args.threshold)
+        if regressions:
+            print(f"❌ {len(regressions)} regression(s) beyond {args.threshold:.0%}")
+            sys.exit(1)
+        print("✅ No regressions")
+    elif args.command == "tokens":
+        tokens = token_report(args.baseline)
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8') as f:
+                json.dump({"meta": {"created": datetime.now().isoformat(), "commit": git_commit()},
+                           "input_tokens": tokens}, f, indent=2)
+    elif args.command == "memory":
+        from har_session import DEFAULT_FLOWS, HarSession
+        if args.mode == "replay":
+            fixture = HarSession('replay', args.name).path
+            if not os.path.exists(fixture):
+                # Fixture'lar gerçek oturum içeriği taşıdığı için repoda yok; önce kaydedilmeli
+                print(f"❌ memory: HAR fixture not found: {fixture}\n"
+                      f"   Record it first: python har_session.py record --name {args.name}\n"
+                      f"   or measure against the live site: python benchmark.py memory --mode live")
+                sys.exit(1)
+            os.environ['TWITTER_HAR_MODE'] = 'replay'
+        os.environ['TWITTER_HAR_NAME'] = args.name
+        flows = [f.strip() for f in (args.flows or DEFAULT_FLOWS).split(',') if f.strip()]
+        profiles = [p.strip() for p in args.profiles.split(',') if p.strip()]
+        report = memory_report(profiles, flows, args.account, args.settle)
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8') as f:
+                json.dump({"meta": {"created": datetime.now().isoformat(), "commit": git_commit(),
+                                    "flows": flows, "mode": args.mode},
+                           "profiles": report}, f, indent=2)
+    elif args.command == "check":
+        checked = run_properties(args.cases, args.max_words, args.seed)
+        print(f"✅ {checked} generated inputs passed segmenter property checks")
+        checked = check_duplicate_properties()
+        print(f"✅ {checked} edited/unrelated posts passed duplicate detection checks")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+import hashlib
+import json
+import logging
+import os
+import sys
+from typing import Dict, List, Optional
+
+CATALOG_FILE = 'data/catalog.jsonl'
+
+# Satır türleri ve her türün anahtar alanı
+ENTRY_KEYS = {'project': 'name', 'account': 'handle', 'keyword': 'keyword'}
+# Tekrarlanan kısa değerler paylaşılan string olarak tutulur
+_INTERNED_FIELDS = ('category', 'website')
+
+
+def _key(value: str) -> str:
+    return value.strip().lstrip('@').lower()
+
+
+class Catalog:
+    """Proje, takip edilen hesap ve anahtar kelime kataloğu
+
+    Kaynak JSON Lines dosyasıdır (`{"type": "project", "name": ...}` satırları;
+    `"deleted": true` bir kaydı siler, aynı anahtarlı yeni satır günceller).
+    Dosyanın sonuna eklenen satırlar yeniden yüklemede yalnızca yeni kısım
+    ayrıştırılarak uygulanır; daha önce okunan kısım değişmişse tamamı okunur.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.environ.get('CATALOG_FILE', CATALOG_FILE)
+        self.logger = logging.getLogger('Catalog')
+
+        self.projects: List[Dict] = []
+        self.accounts: List[str] = []
+        self.keywords: List[str] = []
+        # İndeksler: küçük harfli anahtar -> kayıt
+        self.by_name: Dict[str, Dict] = {}
+        self.by_handle: Dict[str, Dict] = {}
+        self.by_keyword: Dict[str, str] = {}
+        self._account_entries: Dict[str, str] = {}
+
+        self._offset = 0
+        self._mtime = None
+        self._size = 0
+        self._digest = b''
+        self.version = 0
+        self.load()
+
+    # --- Kayıt uygulama ---
+
+    def _apply(self, entry: Dict):
+        kind = entry.get('type')
+        field = ENTRY_KEYS.get(kind)
+        if not field or not entry.get(field):
+            return
+        key = _key(entry[field])
+        deleted = entry.get('deleted', False)
+
+        if kind == 'project':
+            old = self.by_name.get(key)
+            if deleted:
+                if old:
+                    self.projects.remove(old)
+                    del self.by_name[key]
+                    self.by_handle.pop(_key(old.get('twitter', '')), None)
+                return
+            project = {k: v for k, v in entry.items() if k not in ('type', 'deleted')}
+            for name in _INTERNED_FIELDS:
+                if isinstance(project.get(name), str):
+                    project[name] = sys.intern(project[name])
+            if old:
+                # Yerinde güncelle: listedeki sıra ve dışarıdaki referanslar korunur
+                self.by_handle.pop(_key(old.get('twitter', '')), None)
+                old.clear()
+                old.update(project)
+                project = old
+            else:
+                self.projects.append(project)
+                self.by_name[key] = project
+            if project.get('twitter'):
+                self.by_handle[_key(project['twitter'])] = project
+
+        elif kind == 'account':
+            if deleted:
+                handle = self._account_entries.pop(key, None)
+                if handle:
+                    self.accounts.remove(handle)
+            elif key not in self._account_entries:
+                handle = entry[field].strip().lstrip('@')
+                self._account_entries[key] = handle
+                self.accounts.append(handle)
+
+        elif kind == 'keyword':
+            if deleted:
+                keyword = self.by_keyword.pop(key, None)
+                if keyword:
+                    self.keywords.remove(keyword)
+            elif key not in self.by_keyword:
+                keyword = entry[field].strip()
+                self.by_keyword[key] = keyword
+                self.keywords.append(keyword)
+
+    def _read_from(self, offset: int) -> int:
+        applied = 0
+        with open(self.path, 'rb') as f:
+            f.seek(offset)
+            for raw in f:
+                if not raw.endswith(b'\n'):
+                    break  # yarım yazılmış son satır: bir sonraki yüklemede okunur
+                offset += len(raw)
+                line = raw.strip()
+                if not line or line.startswith(b'#'):
+                    continue
+                try:
+                    self._apply(json.loads(line))
+                    applied += 1
+                except ValueError as e:
+                    self.logger.warning(f"⚠️ Skipping invalid catalog line: {e}")
+        self._offset = offset
+        return applied
+
+    def _reset(self):
+        self.projects, self.accounts, self.keywords = [], [], []
+        self.by_name, self.by_handle, self.by_keyword = {}, {}, {}
+        self._account_entries = {}
+        self._offset = 0
+
+    def _prefix_digest(self, length: int) -> bytes:
+        """Okunmuş kısmın özeti; ayrıştırmaya göre çok ucuzdur"""
+        digest = hashlib.blake2b(digest_size=16)
+        with open(self.path, 'rb') as f:
+            while length > 0:
+                block = f.read(min(length, 1 << 20))
+                if not block:
+                    break
+                digest.update(block)
+                length -= len(block)
+        return digest.digest()
+
+    def _snapshot(self):
+        stat = os.stat(self.path)
+        self._mtime, self._size = stat.st_mtime_ns, stat.st_size
+        self._digest = self._prefix_digest(self._offset)
+
+    # --- Yükleme ---
+
+    def load(self):
+        """Kataloğu baştan oku"""
+        self._reset()
+        if not os.path.exists(self.path):
+            self.logger.warning(f"⚠️ Catalog file not found: {self.path}")
+            return
+        self._read_from(0)
+        self._snapshot()
+        self.version += 1
+        self.logger.info(f"📚 Catalog loaded: {len(self.projects)} projects, "
+                         f"{len(self.accounts)} accounts, {len(self.keywords)} keywords")
+
+    def reload_if_changed(self) -> bool:
+        """Dosya değiştiyse uygula; yalnızca eklenmişse sadece yeni satırları oku"""
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return False
+        if stat.st_mtime_ns == self._mtime and stat.st_size == self._size:
+            return False
+        if stat.st_size >= self._offset and self._prefix_digest(self._offset) == self._digest:
+            applied = self._read_from(self._offset)
+            self._snapshot()
+            self.version += 1
+            self.logger.info(f"📚 Catalog updated incrementally ({applied} new entries)")
+        else:
+            self.load()
+        return True
+
+    # --- Sorgular ---
+
+    def project(self, name: str) -> Optional[Dict]:
+        return self.by_name.get(_key(name))
+
+    def project_by_handle(self, handle: str) -> Optional[Dict]:
+        return self.by_handle.get(_key(handle))
+
+    def keyword(self, keyword: str) -> Optional[str]:
+        """Katalogdaki yazımıyla anahtar kelime (büyük/küçük harf duyarsız arama)"""
+        return self.by_keyword.get(_key(keyword))
+
+
+_catalog: Optional[Catalog] = None
+
+
+def get_catalog() -> Catalog:
+    """Tüm üreticilerin paylaştığı katalog; her çağrıda dosya değişikliği kontrol edilir"""
+    global _catalog
+    if _catalog is None:
+        _catalog = Catalog()
+    else:
+        _catalog.reload_if_changed()
+    return _catalog
@@ -1,18 +1,23 @@
-import google.generativeai as genai
 import random
 import json
 import logging
 import os
 from datetime import datetime
 from typing import List, Dict, Optional
+import model_backend
+from catalog import get_catalog
+from har_session import state_path
+from rotation_sampler import ROTATION_FILE, RotationSampler
+from model_resilience import ResilientModel
+from quota_manager import get_quota_manager, PRIORITY_REPLY, PRIORITY_POST, PRIORITY_BACKGROUND
+from thread_segmenter import truncate
 
 class ContentGenerator:
     def __init__(self):
         self.model = None
         self.api_key = None
-        self.projects = []
-        self.monitored_accounts = []
-        self.keywords = []
+        self.catalog = None
+        self.rotation = RotationSampler(state_path(ROTATION_FILE))
         
     async def initialize(self):
         """Gemini AI'ı başlat"""
@@ -20,14 +25,14 @@ class ContentGenerator:
             # API anahtarını yükle
             self.api_key = os.environ.get('GEMINI_API_KEY')
             
-            if not self.api_key:
+            if not self.api_key and not model_backend.is_stub_backend():
                 raise Exception("Gemini API anahtarı bulunamadı")
             
             # Gemini'yi yapılandır
-            genai.configure(api_key=self.api_key)
+            model_backend.configure(self.api_key)
             
             # Model oluştur
-            self.model = genai.GenerativeModel('gemini-pro')
+            self.model = ResilientModel([('gemini-pro', model_backend.create_model('gemini-pro'))])
             
             # Proje ve hesap listelerini yükle
             self.load_data()
@@ -39,84 +44,43 @@ class ContentGenerator:
             logging.error(f"Gemini AI başlatılırken hata: {e}")
             raise
     
+    async def _generate(self, prompt: str, priority: int = PRIORITY_POST, **kwargs):
+        """Model çağrılarının tek giriş noktası (ortak kota, önceliğe göre sıra)"""
+        return await get_quota_manager().run(
+            self.model, prompt,
+            lambda: self.model.generate_content_async(prompt, **kwargs),
+            priority=priority,
+        )
+    
     def load_data(self):
-        """Proje ve hesap listelerini yükle"""
-        # Projeler
-        self.projects = [
-            {"name": "Allora", "twitter": "@AlloraNetwork", "website": "allora.network"},
-            {"name": "Caldera", "twitter": "@Calderaxyz", "website": "caldera.xyz"},
-            {"name": "Camp Network", "twitter": "@campnetworkxyz", "website": "campnetwork.xyz"},
-            {"name": "Eclipse", "twitter": "@EclipseFND", "website": "eclipse.builders"},
-            {"name": "Fogo", "twitter": "@FogoChain", "website": "fogo.io"},
-            {"name": "Humanity Protocol", "twitter": "@Humanityprot", "website": "humanity.org"},
-            {"name": "Hyperbolic", "twitter": "@hyperbolic_labs", "website": "hyperbolic.xyz"},
-            {"name": "Infinex", "twitter": "@infinex", "website": "infinex.xyz"},
-            {"name": "Irys", "twitter": "@irys_xyz", "website": "irys.xyz"},
-            {"name": "Katana", "twitter": "@KatanaRIPNet", "website": "katana.network"},
-            {"name": "Lombard", "twitter": "@Lombard_Finance", "website": "lombard.finance"},
-            {"name": "MegaETH", "twitter": "@megaeth_labs", "website": "megaeth.com"},
-            {"name": "Mira Network", "twitter": "@mira_network", "website": "mira.network"},
-            {"name": "Mitosis", "twitter": "@MitosisOrg", "website": "mitosis.org"},
-            {"name": "Monad", "twitter": "@monad_xyz", "website": "monad.xyz"},
-            {"name": "Multibank", "twitter": "@multibank_io", "website": "multibank.io"},
-            {"name": "Multipli", "twitter": "@multiplifi", "website": "multipli.fi"},
-            {"name": "Newton", "twitter": "@MagicNewton", "website": "newton.xyz"},
-            {"name": "Novastro", "twitter": "@Novastro_xyz", "website": "novastro.xyz"},
-            {"name": "Noya.ai", "twitter": "@NetworkNoya", "website": "noya.ai"},
-            {"name": "OpenLedger", "twitter": "@OpenledgerHQ", "website": "openledger.xyz"},
-            {"name": "PARADEX", "twitter": "@tradeparadex", "website": "paradex.trade"},
-            {"name": "Portal to BTC", "twitter": "@PortaltoBitcoin", "website": "portaltobitcoin.com"},
-            {"name": "Puffpaw", "twitter": "@puffpaw_xyz", "website": "puffpaw.xyz"},
-            {"name": "SatLayer", "twitter": "@satlayer", "website": "satlayer.xyz"},
-            {"name": "Sidekick", "twitter": "@Sidekick_Labs", "website": "N/A"},
-            {"name": "Somnia", "twitter": "@Somnia_Network", "website": "somnia.network"},
-            {"name": "Soul Protocol", "twitter": "@DigitalSoulPro", "website": "digitalsoulprotocol.com"},
-            {"name": "Succinct", "twitter": "@succinctlabs", "website": "succinct.xyz"},
-            {"name": "Symphony", "twitter": "@SymphonyFinance", "website": "app.symphony.finance"},
-            {"name": "Theoriq", "twitter": "@theoriq_ai", "website": "theoriq.ai"},
-            {"name": "Thrive Protocol", "twitter": "@thriveprotocol", "website": "thriveprotocol.com"},
-            {"name": "Union", "twitter": "@union_build", "website": "union.build"},
-            {"name": "YEET", "twitter": "@yeet", "website": "yeet.com"}
-        ]
-        
-        # Takip edilecek hesaplar
-        self.monitored_accounts = [
-            "0x_ultra", "0xBreadguy", "beast_ico", "mdudas", "lex_node", 
-            "jessepollak", "0xWenMoon", "ThinkingUSD", "udiWertheimer", 
-            "vohvohh", "NTmoney", "0xMert_", "QwQiao", "DefiIgnas", 
-            "notthreadguy", "Chilearmy123", "Punk9277", "DeeZe", "stevenyuntcap",
-            "chefcryptoz", "ViktorBunin", "ayyyeandy", "andy8052", "Phineas_Sol",
-            "MoonOverlord", "NarwhalTan", "theunipcs", "RyanWatkins_", 
-            "aixbt_agent", "ai_9684xtpa", "icebergy_", "Luyaoyuan1", 
-            "stacy_muur", "TheOneandOmsy", "jeffthedunker", "JoshuaDeuk", 
-            "0x_scientist", "inversebrah", "dachshundwizard", "gammichan",
-            "sandeepnailwal", "segall_max", "blknoiz06", "0xmons", "hosseeb",
-            "GwartyGwart", "JasonYanowitz", "Tyler_Did_It", "laurashin",
-            "Dogetoshi", "benbybit", "MacroCRG", "Melt_Dem"
-        ]
-        
-        # Anahtar kelimeler
-        self.keywords = [
-            "0G", "Allora", "ANIME", "Aptos", "Arbitrum", "Berachain", "Boop", 
-            "Caldera", "Camp Network", "Corn", "Defi App", "dYdX", "Eclipse", 
-            "Fogo", "Frax", "FUEL", "Huma", "Humanity Protocol", "Hyperbolic", 
-            "Initia", "Injective", "Infinex", "IQ", "Irys", "Kaia", "Kaito", 
-            "MegaETH", "Mitosis", "Monad", "Movement", "Multibank", "Multipli", 
-            "Near", "Newton", "Novastro", "OpenLedger", "PARADEX", "PENGU", 
-            "Polkadot", "Portal to BTC", "PuffPaw", "Pyth", "QUAI", "SatLayer", 
-            "Sei", "Sidekick", "Skate", "Somnia", "Soon", "Soph Protocol", 
-            "Soul Protocol", "Starknet", "Story", "Succinct", "Symphony", 
-            "Theoriq", "Thrive Protocol", "Union", "Virtuals Protocol", "Wayfinder", 
-            "XION", "YEET", "Zcash"
-        ]
-        
+        """Proje ve hesap listelerini ortak katalogdan yükle (data/catalog.jsonl)"""
+        self.catalog = get_catalog()
         logging.info(f"Veri listeleri yüklendi: {len(self.projects)} proje, {len(self.monitored_accounts)} hesap")
     
+    def refresh_data(self) -> bool:
+        """Katalog dosyasındaki değişiklikleri yeniden başlatmadan uygula"""
+        return self.catalog.reload_if_changed() if self.catalog else False
+    
+    @property
+    def projects(self) -> List[Dict]:
+        return self.catalog.projects if self.catalog else []
+    
+    @property
+    def monitored_accounts(self) -> List[str]:
+        return self.catalog.accounts if self.catalog else []
+    
+    @property
+    def keywords(self) -> List[str]:
+        return self.catalog.keywords if self.catalog else []
+    
     def select_random_projects(self, count: int = 2) -> List[Dict]:
-        """Rastgele proje seç"""
-        if len(self.projects) <= count:
-            return self.projects
-        return random.sample(self.projects, count)
+        """Ağırlığa göre proje seç; yakında paylaşılanlar daha az seçilir"""
+        version = self.catalog.version if self.catalog else None
+        return self.rotation.sample(self.projects, count, version)
+    
+    def record_posted(self, project: Dict):
+        """Projenin paylaşıldığını kaydet (rotasyon durumu data/ altında)"""
+        self.rotation.record(project)
     
     def get_random_accounts(self, count: int = 5) -> List[str]:
         """Rastgele hesap seç"""
@@ -152,7 +116,7 @@ class ContentGenerator:
         Write as if you're sharing a genuine insight with your crypto Twitter followers.
         """
             
-            response = self.model.generate_content(prompt)
+            response = await self._generate(prompt)
             
             if response.text:
                 content = response.text.strip()
@@ -161,8 +125,7 @@ class ContentGenerator:
                     content = content[1:-1]
             
                 # 280 character limit check
-                if len(content) > 280:
-                    content = content[:277] + "..."
+                content = truncate(content)
             
                 logging.info(f"Content generated for: {project['name']}")
                 return content
@@ -217,7 +180,7 @@ class ContentGenerator:
         Respond as if you're genuinely interested in the topic and want to contribute meaningfully to the discussion.
         """
         
-            response = self.model.generate_content(prompt)
+            response = await self._generate(prompt, priority=PRIORITY_REPLY)
         
             if response.text:
                 reply = response.text.strip()
@@ -226,8 +189,7 @@ class ContentGenerator:
                     reply = reply[1:-1]
             
                 # 280 character limit check
-                if len(reply) > 280:
-                    reply = reply[:277] + "..."
+                reply = truncate(reply)
             
                 logging.info(f"Reply generated for: @{username}")
                 return reply
@@ -256,7 +218,7 @@ class ContentGenerator:
             Sadece hashtag'leri virgülle ayırarak döndür.
             """
             
-            response = self.model.generate_content(prompt)
+            response = await self._generate(prompt, priority=PRIORITY_BACKGROUND)
             
             if response.text:
                 hashtags = [tag.strip() for tag in response.text.split(',')]
@@ -0,0 +1,212 @@
+import asyncio
+import gzip
+import hashlib
+import io
+import logging
+import os
+import re
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Deque, Dict, Optional, Tuple
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow isteğe bağlı: yoksa WebP yerine JPEG yazılır
+    Image = None
+
+ARTIFACT_DIR = 'logs/debug'
+DEFAULT_QUOTA_MB = 50
+DEFAULT_FORMAT = 'jpeg'
+DEFAULT_QUALITY = 60
+# Aynı hata imzası bu süre (saniye) içinde tekrar kaydedilmez
+DEFAULT_INTERVAL = 3600
+# Ekran görüntüsü görünümün sol üstünden bu boyuta kırpılır
+MAX_CLIP = (1280, 900)
+SCREENSHOT_TIMEOUT = 5000
+
+EXTENSIONS = {'jpeg': 'jpg', 'webp': 'webp', 'png': 'png'}
+
+
+def _env_flag(name: str, default: bool) -> bool:
+    return os.environ.get(name, str(default)).lower() in ('1', 'true', 'yes')
+
+
+class ArtifactStore:
+    """Hata anı ekran görüntüleri (ve isteğe bağlı DOM) için sınırlı depo
+
+    Görüntü görünümle sınırlı ve kırpılmış olarak sıkıştırılmış biçimde (JPEG,
+    Pillow varsa WebP) hata anında alınır; dönüştürme, yazım ve kota temizliği
+    arka planda yapılır. Aynı imzalı hatalar `interval` süresince bir kez
+    kaydedilir. Klasörün toplam boyutu kotayı aşınca en eski kayıtlar (görüntü
+    ve DOM dosyası birlikte) silinir.
+    """
+
+    def __init__(self, directory: Optional[str] = None, quota_bytes: Optional[int] = None,
+                 image_format: Optional[str] = None, quality: Optional[int] = None,
+                 interval: Optional[float] = None, dom_snapshot: Optional[bool] = None):
+        self.logger = logging.getLogger('ArtifactStore')
+        self.directory = directory or os.environ.get('DEBUG_ARTIFACT_DIR', ARTIFACT_DIR)
+        if quota_bytes is None:
+            quota_bytes = int(float(os.environ.get('DEBUG_ARTIFACT_QUOTA_MB', DEFAULT_QUOTA_MB)) * 1024 * 1024)
+        self.quota_bytes = quota_bytes
+        image_format = (image_format or os.environ.get('DEBUG_ARTIFACT_FORMAT', DEFAULT_FORMAT)).lower()
+        if image_format == 'jpg':
+            image_format = 'jpeg'
+        if image_format not in EXTENSIONS:
+            self.logger.warning(f"⚠️ Unknown artifact format {image_format!r}, using {DEFAULT_FORMAT}")
+            image_format = DEFAULT_FORMAT
+        if image_format == 'webp' and Image is None:
+            self.logger.warning("⚠️ WebP artifacts need Pillow, using JPEG")
+            image_format = 'jpeg'
+        self.image_format = image_format
+        self.quality = quality if quality is not None else int(os.environ.get('DEBUG_ARTIFACT_QUALITY', DEFAULT_QUALITY))
+        self.interval = interval if interval is not None else float(os.environ.get('DEBUG_ARTIFACT_INTERVAL', DEFAULT_INTERVAL))
+        self.dom_snapshot = dom_snapshot if dom_snapshot is not None else _env_flag('DEBUG_ARTIFACT_DOM', False)
+
+        self.last_capture: Dict[str, float] = {}
+        self.stats = {'captured': 0, 'suppressed': 0, 'evicted': 0, 'failed': 0}
+        # Klasördeki kayıtlar (eskiden yeniye): (aynı kayda ait yollar, toplam boyut);
+        # ilk yazımda taranır
+        self._files: Optional[Deque[Tuple[Tuple[str, ...], int]]] = None
+        self._usage = 0
+        self._lock = threading.Lock()
+        self._tasks = set()
+
+    # --- Hız sınırı ---
+
+    def should_capture(self, signature: str) -> bool:
+        now = time.monotonic()
+        last = self.last_capture.get(signature)
+        if last is not None and now - last < self.interval:
+            self.stats['suppressed'] += 1
+            return False
+        self.last_capture[signature] = now
+        return True
+
+    # --- Yakalama ---
+
+    async def capture(self, page, signature: str) -> Optional[asyncio.Task]:
+        """Sayfanın o anki görüntüsünü al, kaydı arka planda yaz
+
+        Görüntü ve DOM beklenerek alınır: çağıran taraf sayfada başka bir şey
+        yapmadan önce hata anı yakalanmış olur. Hız sınırına takılırsa veya
+        görüntü alınamazsa None döner.
+        """
+        if page is None or not self.should_capture(signature):
+            return None
+        try:
+            # WebP Playwright'ta yok: kayıpsız PNG alınıp dosya yazılırken dönüştürülür
+            options = {'type': 'png' if self.image_format == 'webp' else self.image_format,
+                       'clip': self._clip(page), 'animations': 'disabled', 'timeout': SCREENSHOT_TIMEOUT}
+            if options['type'] == 'jpeg':
+                options['quality'] = self.quality
+            image = await page.screenshot(**options)
+            html = await page.content() if self.dom_snapshot else None
+        except Exception as e:
+            self.stats['failed'] += 1
+            self.logger.warning(f"⚠️ Debug artifact capture failed: {e}")
+            return None
+        task = asyncio.ensure_future(self._save(signature, image, html))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    def _clip(self, page) -> Dict[str, int]:
+        viewport = page.viewport_size or {}
+        return {'x': 0, 'y': 0,
+                'width': min(viewport.get('width') or MAX_CLIP[0], MAX_CLIP[0]),
+                'height': min(viewport.get('height') or MAX_CLIP[1], MAX_CLIP[1])}
+
+    async def _save(self, signature: str, image: bytes, html: Optional[str]) -> Optional[str]:
+        try:
+            loop = asyncio.get_running_loop()
+            path = await loop.run_in_executor(None, self._write, signature, image, html)
+        except Exception as e:
+            self.stats['failed'] += 1
+            self.logger.warning(f"⚠️ Debug artifact write failed: {e}")
+            return None
+        self.stats['captured'] += 1
+        self.logger.info(f"📸 Debug artifact saved to {path}")
+        return path
+
+    async def flush(self):
+        """Süren kayıtların bitmesini bekle (tarayıcı kapanmadan önce)"""
+        if self._tasks:
+            await asyncio.gather(*list(self._tasks), return_exceptions=True)
+
+    # --- Dosyalar ---
+
+    def _base_name(self, signature: str) -> str:
+        slug = re.sub(r'[^A-Za-z0-9]+', '_', signature).strip('_')[:40]
+        digest = hashlib.sha1(signature.encode('utf-8')).hexdigest()[:8]
+        return f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{slug}_{digest}"
+
+    def _encode(self, image: bytes) -> bytes:
+        if self.image_format != 'webp':
+            return image
+        output = io.BytesIO()
+        Image.open(io.BytesIO(image)).save(output, format='WEBP', quality=self.quality)
+        return output.getvalue()
+
+    def _write(self, signature: str, image: bytes, html: Optional[str] = None) -> str:
+        image = self._encode(image)
+        with self._lock:
+            return self._store(signature, image, html)
+
+    def _store(self, signature: str, image: bytes, html: Optional[str]) -> str:
+        os.makedirs(self.directory, exist_ok=True)
+        self._scan()
+        base = os.path.join(self.directory, self._base_name(signature))
+        path = f"{base}.{EXTENSIONS[self.image_format]}"
+        with open(path, 'wb') as f:
+            f.write(image)
+        paths = [path]
+        if html is not None:
+            with gzip.open(f"{base}.html.gz", 'wb', compresslevel=6) as f:
+                f.write(html.encode('utf-8'))
+            paths.append(f"{base}.html.gz")
+        self._track(tuple(paths))
+        self._enforce_quota()
+        return path
+
+    @staticmethod
+    def _record_name(path: str) -> str:
+        """Kaydın ortak adı: görüntü ve DOM dosyası aynı adı paylaşır"""
+        if path.endswith('.html.gz'):
+            return path[:-len('.html.gz')]
+        return os.path.splitext(path)[0]
+
+    def _scan(self):
+        if self._files is not None:
+            return
+        records: Dict[str, list] = {}
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.is_file():
+                    stat = entry.stat()
+                    record = records.setdefault(self._record_name(entry.path), [stat.st_mtime, [], 0])
+                    record[0] = min(record[0], stat.st_mtime)
+                    record[1].append(entry.path)
+                    record[2] += stat.st_size
+        entries = sorted(records.values(), key=lambda record: record[0])
+        self._files = deque((tuple(paths), size) for _, paths, size in entries)
+        self._usage = sum(size for _, _, size in entries)
+
+    def _track(self, paths: Tuple[str, ...]):
+        size = sum(os.path.getsize(path) for path in paths)
+        self._files.append((paths, size))
+        self._usage += size
+
+    def _enforce_quota(self):
+        """Kota aşılınca en eski kayıtları (tüm dosyalarıyla) sil"""
+        while self._files and self._usage > self.quota_bytes:
+            paths, size = self._files.popleft()
+            self._usage -= size
+            for path in paths:
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+            self.stats['evicted'] += 1
@@ -0,0 +1,223 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+import unicodedata
+from typing import Dict, List, Optional, Set
+
+# JSON Lines: her gönderi dosyaya tek satır olarak eklenir, dosya yalnızca
+# süresi dolan kayıtlar atılırken yeniden yazılır
+DUPLICATES_FILE = 'data/posted_fingerprints.jsonl'
+DEFAULT_WINDOW_DAYS = 30
+# Süresi dolan kayıtlar `add` içinde en fazla bu aralıkla atılır (saniye)
+PRUNE_INTERVAL = 3600
+
+# Benzerlik: kelime 1- ve 2-gram kümelerinin Jaccard oranı. Tek kelimelik
+# değişiklik 12 kelimelik tweet'te bile ~0.77, 40 kelimede ~0.93 bırakır;
+# ilgisiz gönderiler 0.2'nin altında kalır (`benchmark.py check`).
+DEFAULT_MIN_SIMILARITY = 0.6
+
+# Aday arama MinHash bantlarıyla yapılır (tek permütasyonlu MinHash: her
+# shingle hash'i 32 kovadan birine düşer, kova minimumu alınır; O(shingle)).
+# 16 bant x 2 satır, Jaccard >= 0.6 olan kaydı neredeyse her zaman aday yapar;
+# adaylar kesin Jaccard ile doğrulanır.
+BANDS = 16
+ROWS = 2
+SLOTS = BANDS * ROWS
+
+_URL_RE = re.compile(r"https?://\S+|www\.\S+")
+_NUMBERING_RE = re.compile(r"(?m)^\s*\d+(?:/\d+|\.)\s+")
+_WORD_RE = re.compile(r"[^\W_]+|#\w+|@\w+", re.UNICODE)
+
+
+def normalize(text: str) -> List[str]:
+    """Karşılaştırma için kelimeler: küçük harf, URL ve thread numarası atılır"""
+    text = unicodedata.normalize("NFKC", text).lower()
+    text = _NUMBERING_RE.sub(" ", _URL_RE.sub(" ", text))
+    return _WORD_RE.findall(text)
+
+
+def shingles(text: str) -> Set[int]:
+    """Kelime 1- ve 2-gram'larının 32 bit hash kümesi"""
+    words = normalize(text)
+    grams = words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+    return {int.from_bytes(hashlib.blake2b(gram.encode("utf-8"), digest_size=4).digest(), "big")
+            for gram in grams}
+
+
+def minhash(shingle_set: Set[int]) -> List[int]:
+    slots: List[Optional[int]] = [None] * SLOTS
+    for h in shingle_set:
+        slot, value = h % SLOTS, h // SLOTS
+        if slots[slot] is None or value < slots[slot]:
+            slots[slot] = value
+    # Boş kovalar sağdaki ilk dolu kovadan (uzaklıkla ayrıştırılarak) doldurulur;
+    # kısa metinlerde boş kovalar ilgisiz kayıtları aynı banda toplamasın
+    filled = [i for i, value in enumerate(slots) if value is not None]
+    if not filled:
+        return []
+    signature = []
+    for i, value in enumerate(slots):
+        if value is None:
+            step = next((j - i for j in filled if j > i), filled[0] + SLOTS - i)
+            value = slots[(i + step) % SLOTS] + (step << 32)
+        signature.append(value)
+    return signature
+
+
+def jaccard(a: Set[int], b: Set[int]) -> float:
+    if not a or not b:
+        return 0.0
+    common = len(a & b)
+    return common / (len(a) + len(b) - common)
+
+
+def _bands(signature: List[int]):
+    for band in range(BANDS):
+        yield band, tuple(signature[band * ROWS:(band + 1) * ROWS])
+
+
+class DuplicateIndex:
+    """Son N günde gönderilen içeriklerin yakın kopya dizini (`data/` altında kalıcı)
+
+    Her kayıt kelime 1-/2-gram hash kümesini saklar; MinHash imzaları
+    yüklemede bu kümelerden yeniden hesaplanır. Yeni kayıt dosyaya eklenir;
+    pencere dışına çıkanlar yüklemede ve çalışırken saatte bir hem bellekten
+    hem dosyadan atılır.
+    """
+
+    def __init__(self, path: str = DUPLICATES_FILE, window_days: Optional[float] = None,
+                 min_similarity: float = DEFAULT_MIN_SIMILARITY):
+        self.path = path
+        if window_days is None:
+            window_days = float(os.environ.get('DUPLICATE_WINDOW_DAYS', DEFAULT_WINDOW_DAYS))
+        self.window = window_days * 86400
+        self.min_similarity = min_similarity
+        self.logger = logging.getLogger('DuplicateIndex')
+        self.entries: List[Dict] = []
+        self._sets: List[Set[int]] = []
+        self.bands: Dict[tuple, List[int]] = {}
+        self.pruned_at = 0.0
+        self.load()
+
+    def _index(self, position: int, shingle_set: Set[int]):
+        if not shingle_set:
+            return
+        for key in _bands(minhash(shingle_set)):
+            self.bands.setdefault(key, []).append(position)
+
+    def _rebuild(self):
+        self.bands = {}
+        self._sets = [set(entry['shingles']) for entry in self.entries]
+        for position, shingle_set in enumerate(self._sets):
+            self._index(position, shingle_set)
+
+    def load(self):
+        entries = []
+        rewrite = False
+        try:
+            if os.path.exists(self.path):
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    for line in f:
+                        if not line.strip():
+                            continue
+                        try:
+                            entries.append(json.loads(line))
+                        except ValueError:  # yarım yazılmış son satır
+                            rewrite = True
+            elif os.path.exists(self._legacy_path):
+                # Eski biçim: tek JSON belgesi; JSON Lines olarak yeniden yazılır
+                with open(self._legacy_path, 'r', encoding='utf-8') as f:
+                    entries = json.load(f).get('entries', [])
+                rewrite = True
+        except Exception as e:
+            self.logger.warning(f"⚠️ Could not load duplicate index: {e}")
+            entries = []
+        # Eski SimHash kayıtları karşılaştırılamaz
+        legacy = [entry for entry in entries if 'shingles' not in entry]
+        if legacy:
+            self.logger.warning(f"⚠️ Dropping {len(legacy)} fingerprints in the old SimHash format")
+            entries = [entry for entry in entries if 'shingles' in entry]
+            rewrite = True
+        self.entries = entries
+        if not self.prune() and rewrite:
+            self.save()
+
+    @property
+    def _legacy_path(self) -> str:
+        return f"{os.path.splitext(self.path)[0]}.json"
+
+    def save(self):
+        """Tüm dosyayı yeniden yaz (yalnızca kayıt atıldığında)"""
+        try:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            tmp = f"{self.path}.tmp"
+            with open(tmp, 'w', encoding='utf-8') as f:
+                for entry in self.entries:
+                    f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            os.replace(tmp, self.path)
+            if self._legacy_path != self.path and os.path.exists(self._legacy_path):
+                os.remove(self._legacy_path)
+        except Exception as e:
+            self.logger.warning(f"⚠️ Could not save duplicate index: {e}")
+
+    def _append(self, entry: Dict):
+        try:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        except Exception as e:
+            self.logger.warning(f"⚠️ Could not save duplicate index: {e}")
+
+    def prune(self) -> bool:
+        """Pencere dışına çıkan kayıtları bellekten ve dosyadan at; atıldıysa True"""
+        self.pruned_at = time.time()
+        cutoff = self.pruned_at - self.window
+        kept = [entry for entry in self.entries if entry['posted_at'] >= cutoff]
+        expired = len(self.entries) - len(kept)
+        self.entries = kept
+        self._rebuild()
+        if expired:
+            self.save()
+            self.logger.info(f"🧹 Dropped {expired} expired fingerprints")
+        return bool(expired)
+
+    def find(self, text: str) -> Optional[Dict]:
+        """Yakın kopya varsa o kaydı döndür (Jaccard benzerliği ile birlikte)"""
+        shingle_set = shingles(text)
+        if not shingle_set:
+            return None
+        cutoff = time.time() - self.window
+        seen = set()
+        best = None
+        for key in _bands(minhash(shingle_set)):
+            for position in self.bands.get(key, ()):
+                if position in seen:
+                    continue
+                seen.add(position)
+                entry = self.entries[position]
+                if entry['posted_at'] < cutoff:
+                    continue
+                similarity = jaccard(shingle_set, self._sets[position])
+                if similarity >= self.min_similarity and (best is None or similarity > best['similarity']):
+                    best = dict(entry, similarity=round(similarity, 3))
+        if best:
+            best.pop('shingles', None)
+        return best
+
+    def add(self, text: str, kind: str = 'post'):
+        if time.time() - self.pruned_at >= PRUNE_INTERVAL:
+            self.prune()
+        shingle_set = shingles(text)
+        entry = {
+            'shingles': sorted(shingle_set),
+            'kind': kind,
+            'posted_at': time.time(),
+            'preview': text[:80],
+        }
+        self.entries.append(entry)
+        self._sets.append(shingle_set)
+        self._index(len(self.entries) - 1, shingle_set)
+        self._append(entry)
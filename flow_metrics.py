@@ -0,0 +1,147 @@
+import functools
+import inspect
+import logging
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Dict, List, Optional
+
+
+class FlowRun:
+    """Tek bir akış çalıştırmasının sayaçları"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.started = time.perf_counter()
+        self.wall_time = 0.0
+        self.page_ops = 0
+        self.waits = 0
+        self.wait_time = 0.0
+        self.ok = False
+        self.extra: Dict[str, float] = {}
+
+    def to_dict(self) -> Dict:
+        data = {
+            'flow': self.name,
+            'ok': self.ok,
+            'wall_time': round(self.wall_time, 3),
+            'page_ops': self.page_ops,
+            'waits': self.waits,
+            'wait_time': round(self.wait_time, 3),
+        }
+        data.update(self.extra)
+        return data
+
+
+class FlowMetrics:
+    """Akış başına sayfa işlemi, bekleme ve süre ölçümü"""
+
+    def __init__(self, logger: Optional[logging.Logger] = None, history_size: int = 200):
+        self.logger = logger or logging.getLogger('FlowMetrics')
+        self.active: List[FlowRun] = []
+        self.history = deque(maxlen=history_size)
+
+    @asynccontextmanager
+    async def track(self, name: str):
+        run = FlowRun(name)
+        self.active.append(run)
+        try:
+            yield run
+        finally:
+            run.wall_time = time.perf_counter() - run.started
+            self.active.remove(run)
+            self.history.append(run.to_dict())
+            self.logger.info(
+                f"📊 Flow {name}: {run.wall_time:.2f}s wall, {run.page_ops} page ops, "
+                f"{run.waits} waits ({run.wait_time:.1f}s)"
+            )
+
+    def record_op(self, count: int = 1):
+        for run in self.active:
+            run.page_ops += count
+
+    def record_wait(self, seconds: float):
+        for run in self.active:
+            run.waits += 1
+            run.wait_time += seconds
+
+    def record(self, key: str, value: float):
+        """Aktif akışlara ek bir ölçüm yaz (ör. byte, gönderim yolu)"""
+        for run in self.active:
+            run.extra[key] = value
+
+    def last(self, name: Optional[str] = None) -> Optional[Dict]:
+        for entry in reversed(self.history):
+            if name is None or entry['flow'] == name:
+                return entry
+        return None
+
+    def summary(self) -> Dict[str, Dict]:
+        """Akış adına göre ortalama değerler"""
+        totals: Dict[str, Dict] = {}
+        for entry in self.history:
+            agg = totals.setdefault(entry['flow'], {'runs': 0, 'ok': 0, 'wall_time': 0.0,
+                                                     'page_ops': 0, 'waits': 0, 'wait_time': 0.0})
+            agg['runs'] += 1
+            agg['ok'] += int(entry['ok'])
+            for key in ('wall_time', 'page_ops', 'waits', 'wait_time'):
+                agg[key] += entry[key]
+        for agg in totals.values():
+            for key in ('wall_time', 'page_ops', 'waits', 'wait_time'):
+                agg[f'avg_{key}'] = round(agg.pop(key) / agg['runs'], 3)
+        return totals
+
+
+def tracked_flow(name: str):
+    """`self.metrics` üzerinden akışı ölçen dekoratör; sonuç doğruluk değeri `ok` olur"""
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(self, *args, **kwargs):
+            async with self.metrics.track(name) as run:
+                result = await func(self, *args, **kwargs)
+                run.ok = bool(result)
+                return result
+        return wrapper
+    return decorator
+
+
+# Sayılan (proxy ile sarılan) Playwright nesneleri
+_INSTRUMENTED_TYPES = {'Page', 'Locator', 'FrameLocator', 'ElementHandle', 'Keyboard', 'Mouse'}
+
+
+class InstrumentedPage:
+    """Playwright nesnelerini saran ve her await edilen çağrıyı sayan proxy"""
+
+    def __init__(self, target, metrics: FlowMetrics):
+        object.__setattr__(self, '_target', target)
+        object.__setattr__(self, '_metrics', metrics)
+
+    def _wrap(self, value):
+        if isinstance(value, list):
+            return [self._wrap(item) for item in value]
+        if type(value).__name__ in _INSTRUMENTED_TYPES and type(value).__module__.startswith('playwright'):
+            return InstrumentedPage(value, self._metrics)
+        return value
+
+    def __getattr__(self, name):
+        attr = getattr(self._target, name)
+        if not callable(attr):
+            return self._wrap(attr)
+
+        @functools.wraps(attr)
+        def call(*args, **kwargs):
+            result = attr(*args, **kwargs)
+            if inspect.isawaitable(result):
+                return self._count(result)
+            return self._wrap(result)
+        return call
+
+    async def _count(self, awaitable):
+        self._metrics.record_op()
+        return self._wrap(await awaitable)
+
+    def __setattr__(self, name, value):
+        setattr(self._target, name, value)
+
+    def __repr__(self):
+        return f"InstrumentedPage({self._target!r})"
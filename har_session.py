@@ -0,0 +1,311 @@
+import argparse
+import asyncio
+import atexit
+import base64
+import json
+import logging
+import os
+import re
+import shutil
+import tempfile
+from typing import Dict, Optional
+from urllib.parse import parse_qsl, urlsplit
+
+HAR_FIXTURES_DIR = 'fixtures/har'
+
+# HAR modunda kalıcı durum dosyalarının (checkpoint, yakın kopya dizini,
+# rotasyon) yönlendirildiği geçici dizin; süreç bitince silinir
+_state_dir = None
+
+# Kayıtta maskelenecek başlıklar ve gövdeleri silinecek istekler
+SENSITIVE_HEADERS = {'cookie', 'set-cookie', 'authorization', 'x-csrf-token', 'x-guest-token'}
+SENSITIVE_URL_PARTS = ('/onboarding/task.json', '/i/flow/login', '/sessions')
+# JSON gövdelerinde (ve GraphQL `variables` parametresinde) değeri takma adla
+# değiştirilen anahtarlar; aynı değer HAR'ın her yerinde aynı takma adı alır
+SENSITIVE_BODY_KEYS = {'flow_token', 'guest_token', 'auth_token', 'ct0', 'csrf_token',
+                       'rest_id', 'user_id', 'user_id_str', 'userId'}
+
+
+class HarSession:
+    """TwitterBrowser için HAR kayıt (record) / tekrar oynatma (replay) modu
+
+    record: gerçek x.com oturumu `fixtures/har/<name>.har` dosyasına yazılır.
+    replay: tüm istekler bu dosyadan Playwright routing ile karşılanır,
+    dosyada olmayan istekler iptal edilir (tamamen çevrimdışı).
+    """
+
+    def __init__(self, mode: Optional[str] = None, name: Optional[str] = None,
+                 fixtures_dir: str = HAR_FIXTURES_DIR):
+        self.mode = (mode or os.environ.get('TWITTER_HAR_MODE') or '').lower() or None
+        if self.mode not in (None, 'record', 'replay'):
+            raise ValueError(f"Unknown HAR mode: {self.mode}")
+        self.name = name or os.environ.get('TWITTER_HAR_NAME', 'session')
+        self.fixtures_dir = fixtures_dir
+        self.logger = logging.getLogger('HarSession')
+        self._temp_profile = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode is not None
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == 'replay'
+
+    @property
+    def path(self) -> str:
+        return os.path.join(self.fixtures_dir, f"{self.name}.har")
+
+    def user_data_dir(self, default: str) -> str:
+        """Replay'de her çalıştırma temiz bir profille başlar (deterministik)"""
+        if not self.replaying:
+            return default
+        if not self._temp_profile:
+            self._temp_profile = tempfile.mkdtemp(prefix='har_profile_')
+        return self._temp_profile
+
+    async def attach(self, context):
+        """HAR yönlendirmesini browser context'e bağla"""
+        if self.mode == 'record':
+            os.makedirs(self.fixtures_dir, exist_ok=True)
+            await context.route_from_har(self.path, update=True,
+                                         update_content='embed', update_mode='full')
+            self.logger.info(f"⏺️ Recording HAR to {self.path}")
+        elif self.mode == 'replay':
+            if not os.path.exists(self.path):
+                raise FileNotFoundError(f"HAR fixture not found: {self.path}")
+            await context.route_from_har(self.path, not_found='abort')
+            self.logger.info(f"▶️ Replaying HAR from {self.path}")
+
+    def finalize(self):
+        """Context kapandıktan sonra çağrılır: kaydı temizle, geçici profili sil"""
+        if self.mode == 'record' and os.path.exists(self.path):
+            scrub_har(self.path)
+            self.logger.info(f"🧹 Sensitive headers and tokens scrubbed from {self.path}")
+        if self._temp_profile:
+            shutil.rmtree(self._temp_profile, ignore_errors=True)
+            self._temp_profile = None
+
+
+def state_path(default: str) -> str:
+    """HAR modu (record/replay) açıkken durum dosyasını geçici dizine yönlendir
+
+    Kayıt/replay çalıştırmaları `data/` altındaki gerçek checkpoint, dedup ve
+    rotasyon durumunu okumamalı ve değiştirmemeli.
+    """
+    global _state_dir
+    if not HarSession().enabled:
+        return default
+    if _state_dir is None:
+        _state_dir = tempfile.mkdtemp(prefix='har_state_')
+        atexit.register(shutil.rmtree, _state_dir, True)
+    return os.path.join(_state_dir, os.path.basename(default))
+
+
+def scrub_har(path: str):
+    """Çerez/token başlıklarını, giriş isteklerinin gövdelerini ve gövdelerdeki
+    token/kullanıcı kimliklerini HAR'dan çıkar
+
+    Kimlikler silinmez, tutarlı takma adlarla değiştirilir: replay'de uygulama
+    yanıttan okuduğu takma adı sonraki isteğin URL'sine koyar ve kayıt yine eşleşir.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        har = json.load(f)
+    entries = har.get('log', {}).get('entries', [])
+
+    for entry in entries:
+        request = entry.get('request', {})
+        response = entry.get('response', {})
+        for message in (request, response):
+            for header in message.get('headers', []):
+                if header.get('name', '').lower() in SENSITIVE_HEADERS:
+                    header['value'] = 'REDACTED'
+            message.pop('cookies', None)
+        # Gövdesi olmayan POST kayıtları replay'de URL+method ile eşleşir
+        if any(part in request.get('url', '') for part in SENSITIVE_URL_PARTS):
+            request.pop('postData', None)
+
+    found = set()
+    for entry in entries:
+        for text in _entry_texts(entry):
+            _collect_sensitive(_parse_json(text), found)
+        for name, value in parse_qsl(urlsplit(entry.get('request', {}).get('url', '')).query):
+            if name == 'variables':
+                _collect_sensitive(_parse_json(value), found)
+    if found:
+        aliases = _aliases(found)
+        # Sayısal kimlikler başka bir sayının parçası olarak eşleşmesin (URL'deki
+        # `%22123` gibi kaçış dizilerinden sonra gelebilir)
+        pattern = re.compile('|'.join(
+            rf'(?:(?<!\d)|(?<=%[0-9A-Fa-f]{{2}})){re.escape(value)}(?!\d)' if value.isdigit()
+            else re.escape(value)
+            for value in sorted(aliases, key=len, reverse=True)))
+        replace = lambda text: pattern.sub(lambda match: aliases[match.group(0)], text)
+        for entry in entries:
+            _rewrite_entry(entry, replace)
+
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(har, f, ensure_ascii=False)
+
+
+def _parse_json(text: Optional[str]):
+    if not text or text.lstrip()[:1] not in ('{', '['):
+        return None
+    try:
+        return json.loads(text)
+    except ValueError:
+        return None
+
+
+def _collect_sensitive(value, found: set):
+    if isinstance(value, dict):
+        for key, item in value.items():
+            if key in SENSITIVE_BODY_KEYS and isinstance(item, (str, int)) and not isinstance(item, bool):
+                if str(item):
+                    found.add(str(item))
+            else:
+                _collect_sensitive(item, found)
+    elif isinstance(value, list):
+        for item in value:
+            _collect_sensitive(item, found)
+
+
+def _aliases(values) -> Dict[str, str]:
+    """Sayısal kimliklere aynı uzunlukta sayı, diğerlerine REDACTED_n"""
+    aliases = {}
+    for n, value in enumerate(sorted(values), start=1):
+        if value.isdigit() and len(value) > len(str(n)):
+            aliases[value] = str(10 ** (len(value) - 1) + n)
+        else:
+            aliases[value] = f"REDACTED_{n}"
+    return aliases
+
+
+def _content_text(content: Dict) -> Optional[str]:
+    text = content.get('text')
+    if text is None or content.get('encoding') != 'base64':
+        return text
+    try:
+        return base64.b64decode(text).decode('utf-8')
+    except ValueError:  # ikili içerik (görsel vb.)
+        return None
+
+
+def _entry_texts(entry: Dict):
+    yield entry.get('request', {}).get('postData', {}).get('text')
+    yield _content_text(entry.get('response', {}).get('content', {}))
+
+
+def _rewrite_entry(entry: Dict, replace):
+    request = entry.get('request', {})
+    response = entry.get('response', {})
+    request['url'] = replace(request.get('url', ''))
+    for param in request.get('queryString', []):
+        param['value'] = replace(param.get('value', ''))
+    for message in (request, response):
+        for header in message.get('headers', []):
+            header['value'] = replace(header.get('value', ''))
+    post_data = request.get('postData')
+    if post_data and post_data.get('text'):
+        post_data['text'] = replace(post_data['text'])
+    content = response.get('content', {})
+    text = _content_text(content)
+    if text is not None:
+        text = replace(text)
+        if content.get('encoding') == 'base64':
+            text = base64.b64encode(text.encode('utf-8')).decode('ascii')
+        content['text'] = text
+
+
+# --- Akış çalıştırıcı ---
+
+# Kayıt ve replay aynı metinleri göndermeli; POST gövdeleri HAR ile eşleşir
+FLOW_THREAD = [
+    "HAR fixture thread, part one.",
+    "HAR fixture thread, part two.",
+    "HAR fixture thread, part three.",
+]
+FLOW_REPLY = "HAR fixture reply."
+
+
+DEFAULT_FLOWS = 'login,profile,compose'
+# Gerçek tweet atan akışlar; kayıt modunda canlı hesaba yazdıkları için
+# varsayılanda yoktur, --flows ile açıkça istenmelidir
+POSTING_FLOWS = {'thread', 'thread_legacy', 'reply'}
+
+
+async def run_flow(twitter, flow: str, account: str):
+    if flow == 'login':
+        await twitter.login()
+    elif flow == 'compose':
+        await twitter.open_tweet_compose()
+    elif flow == 'thread':
+        await twitter.post_thread(FLOW_THREAD)
+    elif flow == 'thread_legacy':
+        await twitter.post_thread(FLOW_THREAD, batched=False)
+    elif flow == 'profile':
+        await twitter.get_latest_tweet(account)
+    elif flow == 'reply':
+        await twitter.reply_to_latest_tweet(account, FLOW_REPLY)
+
+
+async def run_flows(flows, account: str, runs: int):
+    from twitter_browser import TwitterBrowser
+
+    twitter = TwitterBrowser()
+    try:
+        if not await twitter.initialize():
+            return None
+        for _ in range(runs):
+            for flow in flows:
+                await run_flow(twitter, flow, account)
+        return twitter.metrics, twitter.navigation_summary()
+    finally:
+        await twitter.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record or replay TwitterBrowser flows against HAR fixtures")
+    parser.add_argument('mode', choices=['record', 'replay', 'live'])
+    parser.add_argument('--name', default='session', help="fixture name (fixtures/har/<name>.har)")
+    parser.add_argument('--flows', default=DEFAULT_FLOWS,
+                        help="comma separated: login, compose, profile; the posting flows thread, "
+                             "thread_legacy and reply publish real tweets when recording and must be listed explicitly")
+    parser.add_argument('--account', default='monad_xyz')
+    parser.add_argument('--runs', type=int, default=1)
+    parser.add_argument('--output', help="write per-run metrics as JSON")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    if args.mode != 'live':
+        os.environ['TWITTER_HAR_MODE'] = args.mode
+    os.environ['TWITTER_HAR_NAME'] = args.name
+
+    flows = [f.strip() for f in args.flows.split(',') if f.strip()]
+    posting = [f for f in flows if f in POSTING_FLOWS]
+    if posting and args.mode != 'replay':
+        logging.warning(f"⚠️ Flows {', '.join(posting)} post real tweets as the logged-in account")
+    result = asyncio.run(run_flows(flows, args.account, args.runs))
+    if result is None:
+        print("❌ Browser could not be initialized")
+        return
+    metrics, navigation = result
+
+    print(f"{'flow':<10} {'ok':>3} {'wall_s':>8} {'page_ops':>9} {'waits':>6} {'wait_s':>7}")
+    for entry in metrics.history:
+        print(f"{entry['flow']:<10} {int(entry['ok']):>3} {entry['wall_time']:>8.2f} "
+              f"{entry['page_ops']:>9} {entry['waits']:>6} {entry['wait_time']:>7.1f}")
+
+    print(f"\n{'nav':<10} {'count':>5} {'avg_s':>8} {'avg_kb':>9}")
+    for method, stats in navigation.items():
+        if stats['count']:
+            print(f"{method:<10} {stats['count']:>5} {stats['avg_seconds']:>8.2f} {stats['avg_bytes'] / 1024:>9.0f}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'runs': list(metrics.history), 'summary': metrics.summary(),
+                       'navigation': navigation}, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -39,6 +39,26 @@ class HealthHandler(BaseHTTPRequestHandler):
             self.end_headers()
             self.wfile.write(b'Twitter Bot is running')
             
+        elif self.path == '/metrics':
+            # Gemini kota kullanımı, kalan limit ve model devre/gecikme durumu
+            from quota_manager import get_quota_manager
+            from model_resilience import resilience_metrics
+            from profile_manager import profile_metrics
+            
+            self.send_response(200)
+            self.send_header('Content-type', 'application/json')
+            self.send_header('Access-Control-Allow-Origin', '*')
+            self.end_headers()
+            
+            metrics_data = {
+                'timestamp': datetime.now().isoformat(),
+                'gemini_quota': get_quota_manager().metrics(),
+                'gemini_models': resilience_metrics(),
+                'browser_profile': profile_metrics()
+            }
+            
+            self.wfile.write(json.dumps(metrics_data, indent=2).encode())
+            
         elif self.path == '/' or self.path == '':
             # Root path - basic info - 404 SORUNU ÇÖZÜMÜ
             self.send_response(200)
@@ -52,7 +72,8 @@ class HealthHandler(BaseHTTPRequestHandler):
                 'message': 'Bot is active and posting tweets',
                 'endpoints': {
                     '/health': 'Health check endpoint',
-                    '/status': 'Status endpoint'
+                    '/status': 'Status endpoint',
+                    '/metrics': 'Gemini quota metrics'
                 },
                 'last_updated': datetime.now().isoformat()
             }
@@ -70,7 +91,7 @@ class HealthHandler(BaseHTTPRequestHandler):
             error_data = {
                 'error': 'Not Found',
                 'path': self.path,
-                'available_endpoints': ['/health', '/status', '/']
+                'available_endpoints': ['/health', '/status', '/metrics', '/']
             }
             
             self.wfile.write(json.dumps(error_data, indent=2).encode())
@@ -93,6 +114,7 @@ def start_health_server():
                 logging.info(f"🔗 Available endpoints:")
                 logging.info(f"   - http://0.0.0.0:{port}/health")
                 logging.info(f"   - http://0.0.0.0:{port}/status")
+                logging.info(f"   - http://0.0.0.0:{port}/metrics")
                 logging.info(f"   - http://0.0.0.0:{port}/")
                 server.serve_forever()
             except Exception as e:
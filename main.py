@@ -7,10 +7,15 @@ import json
 import random
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
-from twitter_browser import TwitterBrowser
+from twitter_browser import COMPOSE_URL, TwitterBrowser, intent_url
 from advanced_content_generator import AdvancedContentGenerator
 from email_handler import EmailHandler
 from health_server import start_health_server
+from model_backend import is_stub_backend
+from model_resilience import StreamInterrupted
+from duplicate_detector import DUPLICATES_FILE, DuplicateIndex
+from har_session import state_path
+from tweet_time import newer_than, parse_tweet_time, tweet_age
 
 # Windows konsol kodlama sorununu çöz
 if sys.platform == "win32":
@@ -70,7 +75,7 @@ async def main():
         print("❌ Gmail bilgileri environment variables'da eksik!")
         return
         
-    if not os.getenv('GEMINI_API_KEY'):
+    if not os.getenv('GEMINI_API_KEY') and not is_stub_backend():
         logging.error("❌ Gemini API anahtarı environment variables'da eksik!")
         print("❌ Gemini API anahtarı environment variables'da eksik!")
         return
@@ -120,9 +125,12 @@ async def main():
                 logging.error("❌ All initialization attempts failed!")
                 return
 
-    # Get data
-    projects = content_generator.projects
-    accounts = content_generator.monitored_accounts
+    # Son günlerde gönderilenlerin yakın kopya dizini
+    duplicates = DuplicateIndex(state_path(DUPLICATES_FILE))
+    logging.info(f"🧬 Duplicate index loaded: {len(duplicates.entries)} recent posts")
+    
+    # İzlenen hesapları içeren X List (ör. https://x.com/i/lists/123); yoksa profiller tek tek gezilir
+    list_url = os.environ.get('TWITTER_LIST_URL')
 
     logging.info("✅ Bot başlatıldı ve login oldu. Ana döngü başlıyor...")
     print("✅ Bot başlatıldı ve login oldu. Ana döngü başlıyor...")
@@ -135,6 +143,9 @@ async def main():
         try:
             logging.info("🔄 Starting new cycle...")
             
+            # Katalog dosyası değiştiyse yeniden başlatmadan uygula
+            content_generator.refresh_data()
+            
             # Login durumunu kontrol et (sadece gerekirse)
             if not twitter.is_logged_in:
                 logging.info("🔍 Checking login status before cycle...")
@@ -147,24 +158,87 @@ async def main():
             
             # 1. Post project content
             try:
-                selected_projects = random.sample(content_generator.projects, 2)
+                # Yarım kalan thread'ler yeniden üretilmez, kaldığı yerden tamamlanır
+                for pending in twitter.checkpoints.pending():
+                    label = pending.get('label') or pending['key']
+                    logging.info(f"⏯️ Resuming partial thread for {label} "
+                                 f"({len(pending['status_ids'])}/{len(pending['parts'])} parts posted)")
+                    if await twitter.post_thread(pending['parts'], label=pending.get('label')):
+                        duplicates.add("\n".join(pending['parts']), 'post')
+                        project = content_generator.catalog.project(label) if content_generator.catalog else None
+                        if project:
+                            content_generator.record_posted(project)
+                        logging.info(f"✅ Thread completed for {label}")
                 
-                for i, project in enumerate(selected_projects):
+                selected_projects = [project for project in content_generator.select_random_projects(2)
+                                     if not twitter.checkpoints.is_pending(project['name'])]
+                
+                # Tüm projeler için tek istekte üret, geçersiz olanlar tek tek yeniden üretilir
+                logging.info(f"📝 Generating content for {len(selected_projects)} projects: "
+                             f"{', '.join(p['name'] for p in selected_projects)}")
+                # Compose sayfası model yanıt üretirken yüklenir; üretim başarısız olursa iptal edilir
+                if selected_projects:
+                    twitter.start_navigation(COMPOSE_URL)
+                try:
+                    contents = await content_generator.generate_projects_content(selected_projects, fallback=False)
+                except BaseException:
+                    await twitter.cancel_navigation()
+                    raise
+                
+                for project, content in zip(selected_projects, contents):
                     try:
-                        logging.info(f"📝 Generating content for project {i+1}: {project['name']}")
-                        content = await content_generator.generate_project_content(project)
+                        # Yakın kopya: tarayıcıya gitmeden bir kez yeniden üret
+                        if content and duplicates.find("\n".join(content)):
+                            logging.warning(f"♻️ Near-duplicate thread for {project['name']}, regenerating")
+                            content = await content_generator.generate_project_content(project)
+                            if content and duplicates.find("\n".join(content)):
+                                logging.warning(f"⚠️ Regenerated thread is still a duplicate, skipping {project['name']}")
+                                continue
                         
                         if content and isinstance(content, list) and len(content) > 0:
                             logging.info(f"✅ Generated {len(content)} tweets for {project['name']}")
-                            if await twitter.post_thread(content):
-                                logging.info(f"✅ Thread posted for {project['name']}")
-                            else:
-                                logging.error(f"❌ Failed to post thread for {project['name']}")
+                            posted = await twitter.post_thread(content, label=project['name'])
+                            posted_text = "\n".join(content)
+                        else:
+                            # Toplu çıktı geçersiz: tek istek akış olarak üretilirken compose doldurulur
+                            logging.info(f"🌊 Streaming content for {project['name']} into compose")
+                            streamed = []
                             
-                            # Wait between posts
-                            await asyncio.sleep(random.uniform(60, 120))
+                            # Akışta metin ancak compose doldurulduktan sonra tamamlanır: yakın
+                            # kopya kontrolü gönderimden hemen önce yapılır ve yeniden üretilmez,
+                            # kopya thread bu döngüde gönderilmeden atlanır
+                            def approve(bodies):
+                                streamed.extend(bodies)
+                                if duplicates.find("\n".join(bodies)):
+                                    logging.warning(f"⚠️ Streamed thread is a near-duplicate, skipping {project['name']}")
+                                    return False
+                                return True
+                            
+                            try:
+                                posted = await twitter.post_thread_stream(
+                                    content_generator.stream_project_content(project), before_send=approve,
+                                    label=project['name'])
+                                posted_text = "\n".join(streamed)
+                            except StreamInterrupted as e:
+                                # Akış kota/geçici hatayla yarıda kesildi, hiçbir şey gönderilmedi:
+                                # thread baştan üretilip normal yoldan gönderilir
+                                logging.warning(f"⚠️ Stream for {project['name']} interrupted ({e.kind}), regenerating")
+                                content = await content_generator.generate_project_content(project)
+                                if not content or duplicates.find("\n".join(content)):
+                                    logging.warning(f"⚠️ No usable thread after interrupted stream, skipping {project['name']}")
+                                    continue
+                                posted = await twitter.post_thread(content, label=project['name'])
+                                posted_text = "\n".join(content)
+                        
+                        if posted:
+                            duplicates.add(posted_text, 'post')
+                            content_generator.record_posted(project)
+                            logging.info(f"✅ Thread posted for {project['name']}")
                         else:
-                            logging.warning(f"⚠️ No valid content generated for {project['name']}")
+                            logging.error(f"❌ Failed to post thread for {project['name']}")
+                        
+                        # Wait between posts
+                        await asyncio.sleep(random.uniform(60, 120))
                             
                     except Exception as e:
                         logging.error(f"❌ Error with project {project['name']}: {e}")
@@ -172,66 +246,112 @@ async def main():
                         
             except Exception as e:
                 logging.error(f"❌ Error in project posting: {e}")
+            finally:
+                # Kullanılmayan (ör. kopya diye atlanan thread) ön yükleme açık kalmasın
+                await twitter.cancel_navigation()
 
             # 2. Reply to monitored accounts
             try:
                 reply_count = 0
                 max_replies_per_cycle = 3
                 
-                # Shuffle accounts for variety
-                shuffled_accounts = random.sample(accounts, min(10, len(accounts)))
+                accounts = content_generator.monitored_accounts
+                recent = newer_than(3600)  # yalnızca son bir saatteki tweet'ler
                 
+                # Liste modu: izlenen hesapların hepsi tek gezinmeyle taranır
+                scanned = {}
+                if list_url:
+                    scanned = await twitter.scan_list_timeline(list_url, accounts, recent=recent)
+                
+                # Önce listede bulunan yeni tweet'ler; listede görülmeyen hesaplar
+                # karıştırılıp profil ziyaretiyle kontrol edilir
+                listed = sorted(scanned.values(), key=lambda t: bool(t.get('stale')))
+                missed = [a for a in accounts if a.lower() not in scanned]
+                shuffled_accounts = ([t['username'] for t in listed] +
+                                     random.sample(missed, min(10, len(missed))))
+                
+                # Tarama: önce yeni tweetleri topla, yanıtlar tek istekte üretilir
+                candidates = []
                 for account in shuffled_accounts:
                     try:
-                        if reply_count >= max_replies_per_cycle:
+                        if len(candidates) >= max_replies_per_cycle:
                             break
                         
-                        logging.info(f"🔍 Checking @{account}...")
-                        
-                        # Get latest tweet data
-                        tweet_data = await twitter.get_latest_tweet(account)
+                        tweet_data = scanned.get(account.lower())
+                        if tweet_data is None:
+                            logging.info(f"🔍 Checking @{account}...")
+                            tweet_data = await twitter.get_latest_tweet(account, recent=recent)
                         if not tweet_data:
                             logging.warning(f"⚠️ No tweet found for @{account}")
                             continue
                         
-                        # Check if tweet is recent (within 1 hour)
-                        if tweet_data.get('time'):
-                            try:
-                                tweet_time = datetime.fromisoformat(tweet_data['time'].replace('Z', '+00:00'))
-                                time_diff = (datetime.now() - tweet_time).total_seconds()
-                                
-                                if time_diff <= 3600:  # 1 hour
-                                    logging.info(f"✅ Recent tweet found ({time_diff/60:.1f} min ago)")
-                                    
-                                    reply = await content_generator.generate_reply({
-                                        'text': tweet_data['text'], 
-                                        'username': account
-                                    })
-                                    
-                                    if reply and isinstance(reply, str):
-                                        if await twitter.reply_to_latest_tweet(account, reply):
-                                            reply_count += 1
-                                            logging.info(f"✅ Reply posted to @{account} ({reply_count}/{max_replies_per_cycle})")
-                                            await asyncio.sleep(random.uniform(90, 180))
-                                        else:
-                                            logging.error(f"❌ Failed to reply to @{account}")
-                                    else:
-                                        logging.warning(f"⚠️ No valid reply generated for @{account}")
-                                else:
-                                    logging.info(f"ℹ️ Tweet too old ({time_diff/3600:.1f} hours)")
-                            except Exception as e:
-                                logging.error(f"❌ Error processing tweet time for @{account}: {e}")
+                        tweet_time = parse_tweet_time(tweet_data.get('time'))
+                        if tweet_time is None:
+                            if account.lower() in scanned:
+                                logging.info(f"ℹ️ No recent tweet from @{account} in list")
+                            else:
+                                logging.warning(f"⚠️ No timestamp found for @{account} tweet")
+                        elif tweet_data.get('stale'):
+                            logging.info(f"ℹ️ Tweet too old ({tweet_age(tweet_time)/3600:.1f} hours)")
                         else:
-                            logging.warning(f"⚠️ No timestamp found for @{account} tweet")
+                            logging.info(f"✅ Recent tweet found ({tweet_age(tweet_time)/60:.1f} min ago)")
+                            candidates.append({
+                                'text': tweet_data['text'], 
+                                'username': account,
+                                'id': tweet_data.get('id'),
+                            })
                             
                     except Exception as e:
                         logging.error(f"❌ Error processing @{account}: {e}")
                         continue
                 
+                # İlk yanıtın sayfası yanıtlar üretilirken yüklenir
+                if candidates and candidates[0].get('id'):
+                    twitter.start_navigation(intent_url(candidates[0]['id']))
+                try:
+                    replies = await content_generator.generate_replies(candidates)
+                except BaseException:
+                    await twitter.cancel_navigation()
+                    raise
+                
+                for candidate, reply in zip(candidates, replies):
+                    account = candidate['username']
+                    if not reply:
+                        await twitter.cancel_navigation()
+                    try:
+                        if reply and duplicates.find(reply):
+                            logging.warning(f"♻️ Near-duplicate reply for @{account}, regenerating")
+                            reply = await content_generator.generate_reply(candidate)
+                            if reply and duplicates.find(reply):
+                                logging.warning(f"⚠️ Regenerated reply is still a duplicate, skipping @{account}")
+                                continue
+                        
+                        if reply and isinstance(reply, str):
+                            if await twitter.reply_to_latest_tweet(account, reply, status_id=candidate.get('id')):
+                                duplicates.add(reply, 'reply')
+                                reply_count += 1
+                                logging.info(f"✅ Reply posted to @{account} ({reply_count}/{max_replies_per_cycle})")
+                                await asyncio.sleep(random.uniform(90, 180))
+                            else:
+                                logging.error(f"❌ Failed to reply to @{account}")
+                        else:
+                            logging.warning(f"⚠️ No valid reply generated for @{account}")
+                    except Exception as e:
+                        logging.error(f"❌ Error replying to @{account}: {e}")
+                        continue
+                
                 logging.info(f"✅ Reply cycle completed. Posted {reply_count} replies.")
                 
             except Exception as e:
                 logging.error(f"❌ Error in reply cycle: {e}")
+            finally:
+                await twitter.cancel_navigation()
+
+            # Tarayıcı profili (önbellek, servis çalışanları) sınırsız büyümesin
+            try:
+                await twitter.maintain_profile()
+            except Exception as e:
+                logging.warning(f"⚠️ Browser profile maintenance failed: {e}")
 
             # Reset error counter on successful cycle
             consecutive_errors = 0
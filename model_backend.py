@@ -0,0 +1,478 @@
+import argparse
+import asyncio
+import json
+import logging
+import math
+import os
+import random
+import re
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+try:
+    from google.api_core import exceptions as google_exceptions
+except ImportError:  # stub tek başına da çalışabilsin
+    google_exceptions = None
+
+# GEMINI_BACKEND=stub ile ağ ve kota gerektirmeyen yerel model kullanılır
+BACKEND_ENV = 'GEMINI_BACKEND'
+# Yük testi kotası: stub'ın gecikmesi ve hata oranı ölçülür, ücretsiz katman limitleri değil
+LOAD_TEST_RPM = 100_000
+LOAD_TEST_TPM = 1_000_000_000
+
+
+def backend_name() -> str:
+    return os.environ.get(BACKEND_ENV, 'gemini').lower()
+
+
+def is_stub_backend() -> bool:
+    return backend_name() == 'stub'
+
+
+def configure(api_key: Optional[str]):
+    """Seçili backend'i yapılandır (stub için işlem yok)"""
+    if is_stub_backend():
+        return
+    import google.generativeai as genai
+    genai.configure(api_key=api_key)
+
+
+def create_model(model_name: str, system_instruction: Optional[str] = None, **kwargs):
+    """`genai.GenerativeModel` ile aynı arayüzde model nesnesi döndür"""
+    if is_stub_backend():
+        return StubModel(model_name, StubConfig.from_env(), system_instruction=system_instruction)
+    import google.generativeai as genai
+    if not system_instruction:
+        return genai.GenerativeModel(model_name, **kwargs)
+    try:
+        return genai.GenerativeModel(model_name, system_instruction=system_instruction, **kwargs)
+    except TypeError:
+        # system_instruction desteklemeyen eski SDK: talimat isteğin başına eklenir
+        return InstructionPrefixedModel(genai.GenerativeModel(model_name, **kwargs), system_instruction)
+
+
+class InstructionPrefixedModel:
+    """System instruction'ı her isteğin başına ekleyen sarmalayıcı (eski SDK'lar için)"""
+
+    def __init__(self, model, system_instruction: str):
+        self._model = model
+        self.system_instruction = system_instruction
+
+    def __getattr__(self, name):
+        return getattr(self._model, name)
+
+    def _join(self, contents):
+        if isinstance(contents, str):
+            return f"{self.system_instruction}\n\n{contents}"
+        return [self.system_instruction] + list(contents)
+
+    def generate_content(self, contents, **kwargs):
+        return self._model.generate_content(self._join(contents), **kwargs)
+
+    async def generate_content_async(self, contents, **kwargs):
+        return await self._model.generate_content_async(self._join(contents), **kwargs)
+
+    def count_tokens(self, contents, **kwargs):
+        return self._model.count_tokens(self._join(contents), **kwargs)
+
+    async def count_tokens_async(self, contents, **kwargs):
+        return await self._model.count_tokens_async(self._join(contents), **kwargs)
+
+
+def json_generation_config(schema: Optional[Dict] = None):
+    """JSON çıktı için generation_config; desteklemeyen eski SDK'larda None"""
+    if is_stub_backend():
+        return {'response_mime_type': 'application/json', 'response_schema': schema}
+    import google.generativeai as genai
+    attempts = [{'response_mime_type': 'application/json'}]
+    if schema:
+        attempts.insert(0, {'response_mime_type': 'application/json', 'response_schema': schema})
+    for kwargs in attempts:
+        try:
+            return genai.types.GenerationConfig(**kwargs)
+        except TypeError:
+            continue
+    return None
+
+
+def _wants_json(generation_config) -> bool:
+    if isinstance(generation_config, dict):
+        return generation_config.get('response_mime_type') == 'application/json'
+    return getattr(generation_config, 'response_mime_type', None) == 'application/json'
+
+
+def estimate_tokens(text: str) -> int:
+    """Yerel token tahmini (~4 karakter/token)"""
+    return max(1, math.ceil(len(text) / 4)) if text else 0
+
+
+class StubAPIError(Exception):
+    """google.api_core yüklü değilken kullanılan HTTP benzeri hata"""
+
+    def __init__(self, code: int, message: str):
+        super().__init__(f"{code} {message}")
+        self.code = code
+        self.message = message
+
+
+def _api_error(code: int, message: str) -> Exception:
+    if google_exceptions is not None:
+        if code == 429:
+            return google_exceptions.ResourceExhausted(message)
+        return google_exceptions.InternalServerError(message)
+    return StubAPIError(code, message)
+
+
+class StubConfig:
+    """Gecikme dağılımı, hata oranları ve yanıt şablonları"""
+
+    def __init__(self, latency: str = 'fixed:0', error_429: float = 0.0, error_500: float = 0.0,
+                 safety_block: float = 0.0, seed: int = 0, responses: Optional[Dict[str, str]] = None):
+        self.latency = latency
+        self.error_429 = error_429
+        self.error_500 = error_500
+        self.safety_block = safety_block
+        self.seed = seed
+        self.responses = responses or {}
+
+    @classmethod
+    def from_env(cls) -> 'StubConfig':
+        responses = None
+        responses_file = os.environ.get('GEMINI_STUB_RESPONSES')
+        if responses_file and os.path.exists(responses_file):
+            with open(responses_file, 'r', encoding='utf-8') as f:
+                responses = json.load(f)
+        return cls(
+            latency=os.environ.get('GEMINI_STUB_LATENCY', 'fixed:0'),
+            error_429=float(os.environ.get('GEMINI_STUB_ERROR_429', 0)),
+            error_500=float(os.environ.get('GEMINI_STUB_ERROR_500', 0)),
+            safety_block=float(os.environ.get('GEMINI_STUB_SAFETY', 0)),
+            seed=int(os.environ.get('GEMINI_STUB_SEED', 0)),
+            responses=responses,
+        )
+
+    def sample_latency(self, rng: random.Random) -> float:
+        """`fixed:s`, `uniform:a,b`, `normal:mu,sigma`, `lognormal:mu,sigma`, `exp:mean`"""
+        kind, _, params = self.latency.partition(':')
+        values = [float(v) for v in params.split(',') if v.strip()] or [0.0]
+        if kind == 'uniform':
+            return rng.uniform(values[0], values[1])
+        if kind == 'normal':
+            return max(0.0, rng.gauss(values[0], values[1]))
+        if kind == 'lognormal':
+            return rng.lognormvariate(values[0], values[1])
+        if kind == 'exp':
+            return rng.expovariate(1.0 / values[0]) if values[0] > 0 else 0.0
+        return values[0]
+
+
+class StubCountTokensResponse:
+    def __init__(self, total_tokens: int):
+        self.total_tokens = total_tokens
+
+
+class StubUsageMetadata:
+    def __init__(self, prompt_tokens: int, output_tokens: int):
+        self.prompt_token_count = prompt_tokens
+        self.candidates_token_count = output_tokens
+        self.total_token_count = prompt_tokens + output_tokens
+
+
+class StubPromptFeedback:
+    def __init__(self, block_reason: Optional[str]):
+        self.block_reason = block_reason
+
+
+class StubResponse:
+    """genai yanıtı gibi davranır; güvenlik engelinde `.text` hata fırlatır"""
+
+    def __init__(self, text: Optional[str], prompt_tokens: int, blocked: bool = False):
+        self._text = text
+        self.blocked = blocked
+        self.prompt_feedback = StubPromptFeedback('SAFETY' if blocked else None)
+        self.candidates = [] if blocked else [text]
+        self.usage_metadata = StubUsageMetadata(prompt_tokens, 0 if blocked else estimate_tokens(text))
+
+    @property
+    def text(self) -> str:
+        if self.blocked:
+            raise ValueError(
+                "The `response.text` quick accessor only works when the response contains a valid "
+                "`Part`, but none was returned. Check the `response.prompt_feedback` to see if the "
+                "prompt was blocked."
+            )
+        return self._text
+
+
+class StubChunk:
+    def __init__(self, text: str):
+        self.text = text
+
+
+class StubStreamResponse:
+    """`stream=True` yanıtı: metin parça parça, gecikmeye yayılarak gelir
+
+    Tüketici iterasyonu bırakıp `aclose()` çağırırsa kalan parçalar üretilmez
+    ve çıktı token'ı olarak sayılmaz.
+    """
+
+    CHUNK_CHARS = 32
+    # Gecikmenin bu kadarı ilk parçaya kadar geçer, kalanı parçalara yayılır
+    FIRST_CHUNK_SHARE = 0.3
+
+    def __init__(self, model: 'StubModel', text: Optional[str], latency: float, prompt_tokens: int = 0):
+        self._model = model
+        self._latency = latency
+        self._prompt_tokens = prompt_tokens
+        self.blocked = text is None
+        text = text or ''
+        self._chunks = [text[i:i + self.CHUNK_CHARS] for i in range(0, len(text), self.CHUNK_CHARS)] or ['']
+        self.prompt_feedback = StubPromptFeedback('SAFETY' if self.blocked else None)
+        self.emitted = 0
+        self.aborted = False
+
+    async def __aiter__(self):
+        per_chunk = self._latency * (1 - self.FIRST_CHUNK_SHARE) / len(self._chunks)
+        await asyncio.sleep(self._latency * self.FIRST_CHUNK_SHARE)
+        if self.blocked:
+            # SDK'daki gibi: engellenen parçanın `.text` erişimi ValueError verir
+            yield StubResponse(None, self._prompt_tokens, blocked=True)
+            return
+        for chunk in self._chunks:
+            if self.aborted:
+                return
+            await asyncio.sleep(per_chunk)
+            self.emitted += 1
+            self._model._count_output(chunk)
+            yield StubChunk(chunk)
+
+    async def aclose(self):
+        if not self.aborted and self.emitted < len(self._chunks):
+            self.aborted = True
+            self._model._count_output(None)
+
+
+# Prompt içeriğine göre seçilen varsayılan şablonlar
+DEFAULT_TEMPLATES: List[Tuple[str, str]] = [
+    ('connected tweets',
+     "1. {name} is worth a closer look as {category} infrastructure matures this cycle.\n"
+     "2. The interesting part is execution: shipping cadence and ecosystem partners matter more than headline TPS.\n"
+     "3. If adoption keeps compounding, {name} could become a default building block. #Web3 #{tag}"),
+    ('Detected topics',
+     "Interesting angle on {topic}. The real question is whether the liquidity sticks once incentives fade - "
+     "what metrics are you watching?"),
+    ('',
+     "Underappreciated trend: developer activity keeps shifting toward {topic}. Builders are following users, "
+     "not narratives. #Crypto"),
+]
+
+
+# Toplu isteklerde her öğe `[id] ...` satırıyla verilir
+BATCH_ITEM_RE = re.compile(r'^\s*\[(\w+)\]\s*(.+)$', re.MULTILINE)
+
+
+class StubModel:
+    """Yerel, deterministik Gemini yerine geçen model"""
+
+    def __init__(self, model_name: str, config: Optional[StubConfig] = None,
+                 system_instruction: Optional[str] = None):
+        self.model_name = model_name
+        self.config = config or StubConfig()
+        self.system_instruction = system_instruction or ''
+        # System instruction her istekte girdi token'ı olarak faturalanır
+        self._instruction_tokens = estimate_tokens(self.system_instruction)
+        self._rng = random.Random(self.config.seed)
+        self._lock = threading.Lock()
+        self.usage = {
+            'requests': 0, 'prompt_tokens': 0, 'output_tokens': 0,
+            'errors_429': 0, 'errors_500': 0, 'safety_blocked': 0, 'aborted_streams': 0,
+        }
+
+    def _render(self, prompt: str) -> str:
+        for pattern, response in self.config.responses.items():
+            if pattern in prompt:
+                return response
+        fields = {
+            'name': self._field(prompt, r'Name:\s*(.+)') or 'This project',
+            'category': self._field(prompt, r'Category:\s*(.+)') or 'Web3',
+            'topic': self._field(prompt, r'Detected topics:\s*(.+)') or 'cross-chain infrastructure',
+        }
+        fields['tag'] = re.sub(r'\W', '', fields['name']) or 'Crypto'
+        for marker, template in DEFAULT_TEMPLATES:
+            if marker in prompt:
+                return template.format(**fields)
+        return DEFAULT_TEMPLATES[-1][1].format(**fields)
+
+    def _render_json(self, prompt: str) -> str:
+        items = []
+        for item_id, line in BATCH_ITEM_RE.findall(prompt):
+            if 'Name:' in line:
+                fields = dict(part.split(':', 1) for part in line.split(' | ') if ':' in part)
+                thread = self._render(f"connected tweets\nName: {fields.get('Name', '').strip()}\n"
+                                      f"Category: {fields.get('Category', '').strip()}")
+                tweets = [re.sub(r'^\d+\.\s*', '', t) for t in thread.split('\n') if t.strip()]
+                items.append({'id': item_id, 'tweets': tweets})
+            else:
+                reply = self._render(f"Detected topics: {line[:60]}")
+                items.append({'id': item_id, 'reply': reply})
+        return json.dumps({'items': items})
+
+    @staticmethod
+    def _field(prompt: str, pattern: str) -> Optional[str]:
+        match = re.search(pattern, prompt)
+        return match.group(1).strip() if match else None
+
+    def _count_output(self, chunk: Optional[str]):
+        """Akışta yalnızca gönderilen parçalar sayılır; None = akış kesildi"""
+        with self._lock:
+            if chunk is None:
+                self.usage['aborted_streams'] += 1
+            else:
+                self.usage['output_tokens'] += estimate_tokens(chunk)
+
+    def _plan(self, prompt, json_mode: bool = False,
+              stream: bool = False) -> Tuple[float, Optional[Exception], Optional[StubResponse]]:
+        """Gecikme ve sonucu tek kilit altında belirle (eşzamanlı çağrılarda deterministik)"""
+        prompt = prompt if isinstance(prompt, str) else json.dumps(prompt, default=str)
+        prompt_tokens = self._instruction_tokens + estimate_tokens(prompt)
+        if self.system_instruction:
+            prompt = f"{self.system_instruction}\n{prompt}"
+        with self._lock:
+            latency = self.config.sample_latency(self._rng)
+            roll = self._rng.random()
+            self.usage['requests'] += 1
+            self.usage['prompt_tokens'] += prompt_tokens
+            if roll < self.config.error_429:
+                self.usage['errors_429'] += 1
+                return latency, _api_error(429, "Resource has been exhausted (e.g. check quota)."), None
+            roll -= self.config.error_429
+            if roll < self.config.error_500:
+                self.usage['errors_500'] += 1
+                return latency, _api_error(500, "An internal error has occurred."), None
+            roll -= self.config.error_500
+            if roll < self.config.safety_block:
+                self.usage['safety_blocked'] += 1
+                if stream:
+                    return latency, None, StubStreamResponse(self, None, latency, prompt_tokens)
+                return latency, None, StubResponse(None, prompt_tokens, blocked=True)
+            text = self._render_json(prompt) if json_mode else self._render(prompt)
+            if stream:
+                return latency, None, StubStreamResponse(self, text, latency)
+            self.usage['output_tokens'] += estimate_tokens(text)
+            return latency, None, StubResponse(text, prompt_tokens)
+
+    def generate_content(self, contents, **kwargs) -> StubResponse:
+        latency, error, response = self._plan(contents, _wants_json(kwargs.get('generation_config')))
+        time.sleep(latency)
+        if error:
+            raise error
+        return response
+
+    async def generate_content_async(self, contents, stream: bool = False, **kwargs):
+        latency, error, response = self._plan(contents, _wants_json(kwargs.get('generation_config')), stream)
+        if isinstance(response, StubStreamResponse):
+            return response  # gecikme iterasyon sırasında harcanır
+        await asyncio.sleep(latency)
+        if error:
+            raise error
+        return response
+
+    def count_tokens(self, contents, **kwargs) -> StubCountTokensResponse:
+        contents = contents if isinstance(contents, str) else json.dumps(contents, default=str)
+        return StubCountTokensResponse(self._instruction_tokens + estimate_tokens(contents))
+
+    async def count_tokens_async(self, contents, **kwargs) -> StubCountTokensResponse:
+        return self.count_tokens(contents)
+
+
+# --- Yük testi ---
+
+def stub_usage(generator) -> Dict[str, int]:
+    """Üreticinin tüm stub modellerinin (görev modelleri ve yedekler dahil) toplam kullanımı"""
+    models = [generator.model, *getattr(generator, 'task_models', {}).values()]
+    total: Dict[str, int] = {}
+    for model in models:
+        for slot in getattr(model, 'slots', ()):
+            for key, value in getattr(slot.model, 'usage', {}).items():
+                total[key] = total.get(key, 0) + value
+    return total
+
+
+async def load_test(concurrency: int, requests: int, rpm: int = LOAD_TEST_RPM,
+                    tpm: int = LOAD_TEST_TPM, cooldown: float = 0.0) -> Dict:
+    from advanced_content_generator import AdvancedContentGenerator
+    from quota_manager import QuotaManager, set_quota_manager
+
+    # Üretim kotası (ücretsiz katman 15 RPM, 429'da 60 sn bekleme) yük testini
+    # kuyruk süresine çevirir: test kendi limitleriyle çalışır
+    quota = QuotaManager(rpm=rpm, tpm=tpm, cooldown=cooldown)
+    set_quota_manager(quota)
+    generator = AdvancedContentGenerator()
+    if not await generator.initialize():
+        raise RuntimeError("Generator initialization failed")
+
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    failures = 0
+
+    async def one(i: int):
+        nonlocal failures
+        project = generator.projects[i % len(generator.projects)]
+        async with semaphore:
+            start = time.perf_counter()
+            result = await generator.generate_project_content(project)
+            latencies.append(time.perf_counter() - start)
+            if not result:
+                failures += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(requests)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    pick = lambda q: latencies[min(len(latencies) - 1, int(q * len(latencies)))]
+    return {
+        'requests': requests,
+        'concurrency': concurrency,
+        'elapsed_s': round(elapsed, 3),
+        'throughput_rps': round(requests / elapsed, 2) if elapsed else None,
+        'p50_s': round(pick(0.5), 4),
+        'p95_s': round(pick(0.95), 4),
+        'p99_s': round(pick(0.99), 4),
+        'failures': failures,
+        'quota': quota.metrics(),
+        'usage': stub_usage(generator),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the content pipeline against the local Gemini stub")
+    parser.add_argument('--concurrency', type=int, default=10)
+    parser.add_argument('--requests', type=int, default=100)
+    parser.add_argument('--latency', default='lognormal:-1.2,0.5',
+                        help="fixed:s | uniform:a,b | normal:mu,sigma | lognormal:mu,sigma | exp:mean")
+    parser.add_argument('--error-429', type=float, default=0.05)
+    parser.add_argument('--error-500', type=float, default=0.02)
+    parser.add_argument('--safety', type=float, default=0.01)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--rpm', type=int, default=LOAD_TEST_RPM, help="quota requests per minute")
+    parser.add_argument('--tpm', type=int, default=LOAD_TEST_TPM, help="quota tokens per minute")
+    parser.add_argument('--cooldown', type=float, default=0.0, help="quota pause after a 429 (seconds)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    os.environ.update({
+        BACKEND_ENV: 'stub',
+        'GEMINI_STUB_LATENCY': args.latency,
+        'GEMINI_STUB_ERROR_429': str(args.error_429),
+        'GEMINI_STUB_ERROR_500': str(args.error_500),
+        'GEMINI_STUB_SAFETY': str(args.safety),
+        'GEMINI_STUB_SEED': str(args.seed),
+    })
+    report = asyncio.run(load_test(args.concurrency, args.requests, args.rpm, args.tpm, args.cooldown))
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,388 @@
+import asyncio
+import logging
+import os
+import random
+import time
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+from quota_manager import acquire_attempt, is_quota_error
+
+# Hata sınıfları
+ERROR_QUOTA = 'quota'          # 429: başka modelin kotası olabilir, sonra kuyruğa dön
+ERROR_TRANSIENT = 'transient'  # 5xx, zaman aşımı, bağlantı: bekleyip tekrar dene
+ERROR_SAFETY = 'safety'        # güvenlik filtresi: aynı istemi tekrarlamak anlamsız
+ERROR_FATAL = 'fatal'          # 4xx, geçersiz istek vb.
+
+_TRANSIENT_NAMES = {
+    'InternalServerError', 'ServiceUnavailable', 'DeadlineExceeded', 'GatewayTimeout',
+    'TimeoutError', 'ConnectionError', 'ServerError', 'Aborted', 'Unknown',
+}
+
+BACKOFF_BASE = 1.0
+BACKOFF_CAP = 30.0
+DEFAULT_ATTEMPTS = 3
+BREAKER_THRESHOLD = 5
+BREAKER_RESET = 30.0
+# p95 için en az bu kadar örnek gerekir; öncesinde sabit hedge gecikmesi kullanılır
+LATENCY_WINDOW = 200
+LATENCY_MIN_SAMPLES = 20
+DEFAULT_HEDGE_DELAY = 8.0
+
+
+def classify_error(error: Exception) -> str:
+    """Model hatasını tekrar deneme stratejisine göre sınıflandır"""
+    if is_quota_error(error):
+        return ERROR_QUOTA
+    name = type(error).__name__
+    code = getattr(error, 'code', None)
+    if isinstance(code, int) and code >= 500:
+        return ERROR_TRANSIENT
+    if name in _TRANSIENT_NAMES or isinstance(error, (asyncio.TimeoutError, ConnectionError)):
+        return ERROR_TRANSIENT
+    if name in ('BlockedPromptException', 'StopCandidateException') or 'safety' in str(error).lower():
+        return ERROR_SAFETY
+    return ERROR_FATAL
+
+
+def is_blocked(response) -> bool:
+    """Yanıt güvenlik filtresine takılmış mı? (`.text` erişimi ValueError verir)"""
+    feedback = getattr(response, 'prompt_feedback', None)
+    if getattr(feedback, 'block_reason', None):
+        return True
+    try:
+        response.text
+    except ValueError:
+        return True
+    except Exception:
+        return False
+    return False
+
+
+def backoff_delay(attempt: int, base: float = BACKOFF_BASE, cap: float = BACKOFF_CAP) -> float:
+    """Tam jitter'lı üstel bekleme"""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+class CircuitBreaker:
+    """Model başına devre kesici: art arda hatalarda modeli bir süre atla"""
+
+    def __init__(self, threshold: int = BREAKER_THRESHOLD, reset_timeout: float = BREAKER_RESET):
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.trial_at: Optional[float] = None
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return 'closed'
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return 'half_open'
+        return 'open'
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == 'closed':
+            return True
+        now = time.monotonic()
+        # Yarı açık: tek deneme isteği; sonucu gelmeyen deneme süre dolunca yenilenir
+        if state == 'half_open' and (self.trial_at is None or now - self.trial_at >= self.reset_timeout):
+            self.trial_at = now
+            return True
+        return False
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+        self.trial_at = None
+
+    def record_failure(self):
+        self.failures += 1
+        if self.trial_at is not None or self.failures >= self.threshold:
+            self.opened_at = time.monotonic()
+        self.trial_at = None
+
+
+class LatencyTracker:
+    """Son başarılı çağrıların süresi; hedge gecikmesi için p95"""
+
+    def __init__(self, window: int = LATENCY_WINDOW):
+        self.samples = deque(maxlen=window)
+
+    def record(self, seconds: float):
+        self.samples.append(seconds)
+
+    def percentile(self, q: float) -> Optional[float]:
+        if len(self.samples) < LATENCY_MIN_SAMPLES:
+            return None
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class ModelSlot:
+    def __init__(self, name: str, model):
+        self.name = name
+        self.model = model
+        self.breaker = CircuitBreaker()
+        self.latency = LatencyTracker()
+        self.calls = 0
+        self.errors: Dict[str, int] = {}
+
+
+class StreamInterrupted(Exception):
+    """Akış parça verdikten sonra kota veya geçici hatayla kesildi
+
+    Verilen parçalar geri alınamaz; çağıran isteği akışsız olarak yeniden yapmalıdır.
+    """
+
+    def __init__(self, error: Exception):
+        super().__init__(f"Stream interrupted: {error}")
+        self.error = error
+        self.kind = classify_error(error)
+
+
+def _record_error(slot: ModelSlot, error: Exception) -> str:
+    kind = classify_error(error)
+    slot.errors[kind] = slot.errors.get(kind, 0) + 1
+    if kind in (ERROR_QUOTA, ERROR_TRANSIENT):
+        slot.breaker.record_failure()
+    return kind
+
+
+class ResilientStream:
+    """`stream=True` yanıtı: modelin akışını sarar
+
+    Akış bitince süre (tam çağrı) ve başarı modele yazılır; iterasyon sırasında
+    gelen hata sınıflandırılıp devre kesiciye işlenir, kota/geçici hatalar
+    `StreamInterrupted` olarak yükseltilir. Diğer nitelikler asıl yanıta yönlendirilir.
+    """
+
+    def __init__(self, slot: ModelSlot, response, started: float):
+        self._slot = slot
+        self._response = response
+        self._iterator = response.__aiter__()
+        self._started = started
+        self._first = None
+        self._done = False
+
+    def __getattr__(self, name):
+        return getattr(self._response, name)
+
+    async def prefetch(self):
+        """İlk parçayı al; hata olursa çağrının kendi hatası gibi yükselir"""
+        try:
+            self._first = [await self._iterator.__anext__()]
+        except StopAsyncIteration:
+            self._first = []
+            self._finish()
+        except Exception as e:
+            self._done = True
+            _record_error(self._slot, e)
+            raise
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self._first:
+            return self._first.pop()
+        if self._done:
+            raise StopAsyncIteration
+        try:
+            return await self._iterator.__anext__()
+        except StopAsyncIteration:
+            self._finish()
+            raise
+        except Exception as e:
+            self._done = True
+            if _record_error(self._slot, e) in (ERROR_QUOTA, ERROR_TRANSIENT):
+                raise StreamInterrupted(e) from e
+            raise
+
+    def _finish(self):
+        if not self._done:
+            self._done = True
+            self._slot.latency.record(time.perf_counter() - self._started)
+            self._slot.breaker.record_success()
+
+    async def aclose(self):
+        """Akışı bırak: modelin kalanını üretmesini durdur (destekleniyorsa)"""
+        self._done = True
+        for target in (self._iterator, self._response):
+            aclose = getattr(target, 'aclose', None)
+            if aclose:
+                await aclose()
+
+
+_instances: List['ResilientModel'] = []
+
+
+class ResilientModel:
+    """Birincil ve yedek Gemini modelleri üzerinde dayanıklı çağrı katmanı
+
+    - hatalar sınıflandırılır; geçici hatalarda jitter'lı üstel bekleme ile
+      tekrar denenir, güvenlik engeli tekrarlanmaz
+    - her modelin kendi devre kesicisi vardır; açık devredeki model atlanır
+    - hedge açıksa birincil model p95 süresinde yanıt vermezse aynı istek
+      yedek modele de gönderilir ve ilk gelen yanıt kullanılır
+    `genai.GenerativeModel` ile aynı şekilde kullanılır.
+    """
+
+    def __init__(self, models: List[Tuple[str, object]], hedge: Optional[bool] = None,
+                 attempts: int = DEFAULT_ATTEMPTS, hedge_delay: Optional[float] = None):
+        if not models:
+            raise ValueError("At least one model is required")
+        self.slots = [ModelSlot(name, model) for name, model in models]
+        if hedge is None:
+            hedge = os.environ.get('GEMINI_HEDGE', '').lower() in ('1', 'true', 'yes')
+        self.hedge = hedge
+        self.attempts = attempts
+        self.hedge_delay = hedge_delay or float(os.environ.get('GEMINI_HEDGE_DELAY', DEFAULT_HEDGE_DELAY))
+        self.logger = logging.getLogger('ResilientModel')
+        self.stats = {'requests': 0, 'retries': 0, 'fallbacks': 0, 'hedges': 0, 'hedge_wins': 0,
+                      'safety_blocked': 0, 'failures': 0}
+        _instances.append(self)
+
+    def derive(self, factory) -> 'ResilientModel':
+        """Aynı modellerin farklı ayarlı örnekleri (ör. system instruction).
+
+        `factory(model_name)` yeni model nesnesini döndürür; devre kesici ve
+        gecikme geçmişi model adına göre paylaşılır.
+        """
+        derived = ResilientModel([(slot.name, factory(slot.name)) for slot in self.slots],
+                                 hedge=self.hedge, attempts=self.attempts, hedge_delay=self.hedge_delay)
+        for mine, theirs in zip(self.slots, derived.slots):
+            theirs.breaker = mine.breaker
+            theirs.latency = mine.latency
+        return derived
+
+    @property
+    def primary(self):
+        return self.slots[0].model
+
+    def __getattr__(self, name):
+        # count_tokens, usage vb. birincil modele yönlendirilir
+        if name == 'slots':
+            raise AttributeError(name)
+        return getattr(self.slots[0].model, name)
+
+    def _available(self) -> List[ModelSlot]:
+        return [slot for slot in self.slots if slot.breaker.allow()]
+
+    async def _call(self, slot: ModelSlot, contents, kwargs):
+        # Her deneme, yedek ve hedge ayrı bir istektir: kotadan düşülür
+        await acquire_attempt()
+        slot.calls += 1
+        started = time.perf_counter()
+        try:
+            response = await slot.model.generate_content_async(contents, **kwargs)
+        except Exception as e:
+            _record_error(slot, e)
+            raise
+        if kwargs.get('stream'):
+            # İlk parça burada beklenir: akış başlamadan gelen hatalar da yeniden
+            # deneme, yedek model ve kota kuyruğundan geçer. Süre ve başarı akış
+            # bitince kaydedilir (bkz. ResilientStream)
+            stream = ResilientStream(slot, response, started)
+            await stream.prefetch()
+            return stream
+        slot.latency.record(time.perf_counter() - started)
+        slot.breaker.record_success()
+        return response
+
+    def _hedge_after(self, slot: ModelSlot) -> float:
+        return slot.latency.percentile(0.95) or self.hedge_delay
+
+    async def _race(self, candidates: List[ModelSlot], contents, kwargs):
+        """Birincili başlat; hedge süresi dolarsa sıradaki modeli de başlat"""
+        primary = candidates[0]
+        tasks = {asyncio.ensure_future(self._call(primary, contents, kwargs)): primary}
+        pending_slots = candidates[1:] if self.hedge else []
+        errors = []
+        try:
+            while tasks:
+                timeout = self._hedge_after(primary) if pending_slots else None
+                done, _ = await asyncio.wait(tasks, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    slot = pending_slots.pop(0)
+                    self.stats['hedges'] += 1
+                    self.logger.info(f"🪝 {primary.name} slower than {timeout:.1f}s, hedging to {slot.name}")
+                    tasks[asyncio.ensure_future(self._call(slot, contents, kwargs))] = slot
+                    continue
+                for task in done:
+                    slot = tasks.pop(task)
+                    if task.exception() is None:
+                        if slot is not primary:
+                            self.stats['hedge_wins'] += 1
+                        return task.result()
+                    errors.append(task.exception())
+                # Biri hata verdiyse yedeği beklemeden başlat
+                if pending_slots and not tasks:
+                    slot = pending_slots.pop(0)
+                    tasks[asyncio.ensure_future(self._call(slot, contents, kwargs))] = slot
+            raise errors[-1]
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def generate_content_async(self, contents, **kwargs):
+        self.stats['requests'] += 1
+        last_error: Optional[Exception] = None
+        for attempt in range(self.attempts):
+            candidates = self._available()
+            if not candidates:
+                # Tüm devreler açık: en erken kapanacak olanı zorla dene
+                candidates = [min(self.slots, key=lambda s: s.breaker.opened_at or 0)]
+            errors = []
+            for index in range(len(candidates)):
+                if index > 0:
+                    self.stats['fallbacks'] += 1
+                    self.logger.warning(f"↪️ Falling back to {candidates[index].name}")
+                try:
+                    response = await self._race(candidates[index:], contents, kwargs)
+                except Exception as e:
+                    errors.append(e)
+                    if classify_error(e) not in (ERROR_QUOTA, ERROR_TRANSIENT):
+                        self.stats['failures'] += 1
+                        raise
+                    if self.hedge:
+                        break  # hedge zaten yedekleri denedi
+                    continue
+                if is_blocked(response):
+                    self.stats['safety_blocked'] += 1
+                return response
+
+            last_error = errors[-1]
+            if all(classify_error(e) == ERROR_QUOTA for e in errors):
+                # Tüm modellerin kotası dolu: kota yöneticisi bekletip tekrar sıraya koyar
+                break
+            if attempt + 1 < self.attempts:
+                self.stats['retries'] += 1
+                delay = backoff_delay(attempt)
+                self.logger.warning(f"🔁 Transient model error ({last_error}), retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+        self.stats['failures'] += 1
+        raise last_error
+
+    def metrics(self) -> Dict:
+        return {
+            **self.stats,
+            'hedging': self.hedge,
+            'models': {
+                slot.name: {
+                    'breaker': slot.breaker.state,
+                    'calls': slot.calls,
+                    'errors': dict(slot.errors),
+                    'p95_s': (round(slot.latency.percentile(0.95), 3)
+                              if slot.latency.percentile(0.95) is not None else None),
+                }
+                for slot in self.slots
+            },
+        }
+
+
+def resilience_metrics() -> List[Dict]:
+    """Oluşturulan tüm dayanıklı modellerin metrikleri (health server /metrics)"""
+    return [model.metrics() for model in _instances]
@@ -0,0 +1,184 @@
+import asyncio
+import logging
+import os
+import shutil
+import time
+from typing import Dict, List, Optional
+
+# Chromium profili: kök klasörde `Local State` ve `Default/` profil klasörü bulunur
+PROFILE_DIR = 'Default'
+# Oturum için gerekenler: çerezler (eski ve `Network/` altındaki yeni yeri), local storage, tercihler
+KEEP_ROOT = {PROFILE_DIR, 'Local State'}
+KEEP_PROFILE = {'Cookies', 'Cookies-journal', 'Network', 'Local Storage', 'Preferences', 'Secure Preferences'}
+# Sayfa yüklemesini hızlandıran önbellekler: silinmez, toplamları kotayla sınırlanır
+CACHE_DIRS = ('Cache', 'Code Cache', 'GPUCache')
+
+DEFAULT_CACHE_QUOTA_MB = 100
+DEFAULT_INTERVAL_HOURS = 6
+# Canlı temizlikte boşaltılan depolar (servis çalışanları ve önbellekleri, IndexedDB)
+CLEAR_ORIGINS = ('https://x.com', 'https://twitter.com')
+CLEAR_STORAGE_TYPES = 'service_workers,cache_storage,indexeddb'
+
+_instances: List['ProfileManager'] = []
+
+
+def dir_size(path: str) -> int:
+    """Klasörün toplam boyutu (bayt); sembolik bağlar izlenmez"""
+    total = 0
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        total += dir_size(entry.path)
+                    else:
+                        total += entry.stat(follow_symlinks=False).st_size
+                except OSError:
+                    continue
+    except OSError:
+        pass
+    return total
+
+
+def path_size(path: str) -> int:
+    if os.path.isdir(path):
+        return dir_size(path)
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+
+def _remove(path: str):
+    if os.path.isdir(path) and not os.path.islink(path):
+        shutil.rmtree(path, ignore_errors=True)
+    else:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+class ProfileManager:
+    """Kalıcı Chromium profil klasörünün (user_data_dir) boyut yönetimi
+
+    Tarayıcı başlamadan önce (`prepare`) oturum için gerekmeyen her şey
+    silinir ve önbellek klasörleri kotaya indirilir (en büyükten başlayarak).
+    Tarayıcı çalışırken (`maintain`) dosyalara dokunulmaz; profil kotayı
+    aşmışsa x.com önbellekleri ve depoları tarayıcının kendisine (CDP)
+    temizletilir. Profil boyutu ve açılış süresi `report` içinde tutulur.
+    """
+
+    def __init__(self, path: str, cache_quota_bytes: Optional[int] = None,
+                 interval_hours: Optional[float] = None):
+        self.path = path
+        if cache_quota_bytes is None:
+            cache_quota_bytes = int(float(os.environ.get('PROFILE_CACHE_QUOTA_MB', DEFAULT_CACHE_QUOTA_MB)) * 1024 * 1024)
+        self.cache_quota = cache_quota_bytes
+        if interval_hours is None:
+            interval_hours = float(os.environ.get('PROFILE_MAINTENANCE_HOURS', DEFAULT_INTERVAL_HOURS))
+        self.interval = interval_hours * 3600
+        self.logger = logging.getLogger('ProfileManager')
+        self.last_maintenance = 0.0
+        self.report: Dict = {'path': path, 'size_bytes': None, 'cache_bytes': None,
+                             'launch_seconds': None, 'pruned': 0, 'live_clears': 0}
+        _instances.append(self)
+
+    @property
+    def profile_path(self) -> str:
+        return os.path.join(self.path, PROFILE_DIR)
+
+    def launch_args(self) -> List[str]:
+        """HTTP önbelleğini çalışma sırasında da kotayla sınırlayan Chromium argümanı"""
+        return [f'--disk-cache-size={self.cache_quota}']
+
+    def cache_sizes(self) -> Dict[str, int]:
+        return {name: dir_size(os.path.join(self.profile_path, name)) for name in CACHE_DIRS
+                if os.path.isdir(os.path.join(self.profile_path, name))}
+
+    def measure(self) -> Dict:
+        self.report['size_bytes'] = dir_size(self.path)
+        self.report['cache_bytes'] = sum(self.cache_sizes().values())
+        return self.report
+
+    def disposable_bytes(self) -> int:
+        """Oturum için gerekmeyen kısmın boyutu (kotayla karşılaştırılan)"""
+        needed = sum(path_size(os.path.join(self.profile_path, name)) for name in KEEP_PROFILE)
+        return self.measure()['size_bytes'] - needed
+
+    # --- Açılış öncesi ---
+
+    def prepare(self) -> Dict:
+        """Tarayıcı kapalıyken profili buda (`initialize` içinde, açılıştan önce)"""
+        os.makedirs(self.path, exist_ok=True)
+        before = dir_size(self.path)
+        pruned = 0
+        for base, keep in ((self.path, KEEP_ROOT), (self.profile_path, KEEP_PROFILE | set(CACHE_DIRS))):
+            if not os.path.isdir(base):
+                continue
+            for name in os.listdir(base):
+                if name not in keep:
+                    _remove(os.path.join(base, name))
+                    pruned += 1
+
+        # Önbellekler kotayı aşıyorsa en büyükleri tamamen silinir; Chromium'un
+        # disk önbelleği dizin dosyasıyla birlikte tutarlıdır, tek tek dosya silinmez
+        sizes = self.cache_sizes()
+        total = sum(sizes.values())
+        for name, size in sorted(sizes.items(), key=lambda item: item[1], reverse=True):
+            if total <= self.cache_quota:
+                break
+            _remove(os.path.join(self.profile_path, name))
+            total -= size
+            pruned += 1
+
+        self.report['pruned'] += pruned
+        self.measure()
+        self.last_maintenance = time.time()
+        self.logger.info(f"🧹 Browser profile: {before / 1048576:.1f} MB -> "
+                         f"{self.report['size_bytes'] / 1048576:.1f} MB ({pruned} entries pruned)")
+        return self.report
+
+    def record_launch(self, seconds: float):
+        self.report['launch_seconds'] = round(seconds, 3)
+        self.logger.info(f"⏱️ Browser launched in {seconds:.2f}s "
+                         f"(profile {(self.report['size_bytes'] or 0) / 1048576:.1f} MB)")
+
+    # --- Çalışma sırasında ---
+
+    def due(self) -> bool:
+        return time.time() - self.last_maintenance >= self.interval
+
+    async def maintain(self, context, page, force: bool = False) -> Dict:
+        """Profil kotayı aştıysa önbellekleri tarayıcıya temizlet (aralıklı çağrılır)"""
+        if not force and not self.due():
+            return self.report
+        self.last_maintenance = time.time()
+        # Klasör taraması olay döngüsünü bekletmesin
+        loop = asyncio.get_running_loop()
+        if await loop.run_in_executor(None, self.disposable_bytes) <= self.cache_quota:
+            self.logger.info(f"📦 Browser profile size {self.report['size_bytes'] / 1048576:.1f} MB, within quota")
+            return self.report
+        try:
+            session = await context.new_cdp_session(page)
+            try:
+                await session.send('Network.clearBrowserCache')
+                for origin in CLEAR_ORIGINS:
+                    await session.send('Storage.clearDataForOrigin',
+                                       {'origin': origin, 'storageTypes': CLEAR_STORAGE_TYPES})
+            finally:
+                await session.detach()
+        except Exception as e:
+            self.logger.warning(f"⚠️ Live profile cleanup failed: {e}")
+            return self.report
+        self.report['live_clears'] += 1
+        before = self.report['size_bytes']
+        await loop.run_in_executor(None, self.measure)
+        self.logger.info(f"🧹 Cleared browser caches: {before / 1048576:.1f} MB -> "
+                         f"{self.report['size_bytes'] / 1048576:.1f} MB")
+        return self.report
+
+
+def profile_metrics() -> List[Dict]:
+    """Profil boyutu ve açılış süreleri (health server /metrics)"""
+    return [dict(manager.report) for manager in _instances]
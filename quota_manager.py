@@ -0,0 +1,400 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import os
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+from typing import Awaitable, Callable, Dict, Optional
+
+import model_backend
+
+# Öncelikler: küçük değer önce çalışır
+PRIORITY_REPLY = 0       # yeni tweet'lere yanıtlar (zamana duyarlı)
+PRIORITY_POST = 1        # proje thread'leri
+PRIORITY_BACKGROUND = 2  # hashtag, piyasa yorumu vb.
+
+PRIORITY_NAMES = {PRIORITY_REPLY: 'reply', PRIORITY_POST: 'post', PRIORITY_BACKGROUND: 'background'}
+
+# Ücretsiz katman varsayılanları (Gemini Flash); ortam değişkenleriyle değiştirilebilir
+DEFAULT_RPM = 15
+DEFAULT_TPM = 1_000_000
+# 429 sonrası istek tekrar kuyruğa girer; en fazla bu kadar deneme
+DEFAULT_QUOTA_RETRIES = 3
+QUOTA_COOLDOWN = 60.0
+
+
+# run() içindeki isteğin kota bilgisi; modelin kendi denemeleri (yeniden deneme,
+# yedek model, hedge) bu kayıt üzerinden ek kota alır
+_current_request: ContextVar[Optional[Dict]] = ContextVar('quota_request', default=None)
+
+
+async def acquire_attempt():
+    """Süren run() isteği adına bir model çağrısı için kota al
+
+    İlk çağrı run()'ın aldığı yeri kullanır; sonrakiler aynı öncelik ve token
+    tahminiyle tekrar sıraya girer. run() dışında hiçbir şey yapmaz.
+    """
+    request = _current_request.get()
+    if request is None:
+        return
+    if request['prepaid']:
+        request['prepaid'] -= 1
+        return
+    manager = request['manager']
+    with manager._lock:
+        manager.stats['extra_calls'] += 1
+    await manager.acquire(request['tokens'], request['priority'])
+
+
+def is_quota_error(error: Exception) -> bool:
+    """429 / ResourceExhausted hatası mı?"""
+    if getattr(error, 'code', None) == 429 or type(error).__name__ == 'ResourceExhausted':
+        return True
+    text = str(error)
+    return '429' in text or 'quota' in text.lower()
+
+
+class TokenBucket:
+    """Dakikalık limit için sürekli dolan kova"""
+
+    def __init__(self, capacity: float, period: float = 60.0):
+        self.capacity = float(capacity)
+        self.rate = self.capacity / period
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def available(self) -> float:
+        """Kovadaki miktar (durumu değiştirmeden okunur)"""
+        elapsed = time.monotonic() - self.updated
+        return min(self.capacity, self.tokens + elapsed * self.rate)
+
+    def wait_time(self, amount: float) -> float:
+        """`amount` kadar yer açılması için gereken süre (saniye)"""
+        self._refill(time.monotonic())
+        # Kapasiteden büyük istekler kova dolunca geçer (aksi halde sonsuza dek bekler)
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.rate
+
+    def take(self, amount: float):
+        self._refill(time.monotonic())
+        self.tokens -= min(amount, self.capacity)
+
+    def adjust(self, delta: float):
+        """Tahmin ile gerçek kullanım farkını düzelt (negatif = iade)"""
+        self._refill(time.monotonic())
+        self.tokens = min(self.capacity, self.tokens - delta)
+
+    def drain(self, seconds: float):
+        """Kovayı boşalt ve `seconds` boyunca dolmasını engelle (429 sonrası)"""
+        self.tokens = -self.rate * seconds
+        self.updated = time.monotonic()
+
+
+class MeteredStream:
+    """Akış yanıtı: tüketilen parçalardan kullanım toplanır, akış bitince veya
+    kapatılınca `on_finish(gerçek_token)` bir kez çağrılır
+
+    Akış parçalarında `usage_metadata` yoksa gerçek kullanım, isteğin tahmini
+    ile gelen metnin yerel tahmininin toplamıdır. Diğer nitelikler asıl yanıta
+    yönlendirilir.
+    """
+
+    def __init__(self, response, on_finish: Callable[[int], None], prompt_tokens: int):
+        self._response = response
+        self._iterator = None
+        self._on_finish = on_finish
+        self._prompt_tokens = prompt_tokens
+        self._output_tokens = 0
+        self._total: Optional[int] = None
+        self._finished = False
+
+    def __getattr__(self, name):
+        return getattr(self._response, name)
+
+    def __aiter__(self):
+        self._iterator = self._response.__aiter__()
+        return self
+
+    async def __anext__(self):
+        try:
+            chunk = await self._iterator.__anext__()
+        except BaseException:
+            self._finish()
+            raise
+        usage = getattr(chunk, 'usage_metadata', None)
+        if getattr(usage, 'total_token_count', None):
+            self._total = usage.total_token_count
+        try:
+            self._output_tokens += model_backend.estimate_tokens(chunk.text)
+        except Exception:  # engellenen parçanın metni yok
+            pass
+        return chunk
+
+    def _finish(self):
+        if not self._finished:
+            self._finished = True
+            self._on_finish(self._total or self._prompt_tokens + self._output_tokens)
+
+    async def aclose(self):
+        aclose = getattr(self._response, 'aclose', None)
+        try:
+            if aclose:
+                await aclose()
+        finally:
+            self._finish()
+
+
+class QuotaManager:
+    """Gemini çağrıları için RPM/TPM kovaları ve öncelikli bekleme kuyruğu
+
+    İstekler limit aşılınca hata vermek yerine sıraya girer; sıra önceliğe,
+    aynı öncelikte geliş sırasına göredir. 429 alınırsa kovalar boşaltılır ve
+    istek aynı öncelikle tekrar sıraya girer.
+    """
+
+    def __init__(self, rpm: Optional[int] = None, tpm: Optional[int] = None,
+                 use_count_tokens: Optional[bool] = None, max_retries: int = DEFAULT_QUOTA_RETRIES,
+                 cooldown: float = QUOTA_COOLDOWN):
+        self.rpm = rpm or int(os.environ.get('GEMINI_RPM', DEFAULT_RPM))
+        self.tpm = tpm or int(os.environ.get('GEMINI_TPM', DEFAULT_TPM))
+        if use_count_tokens is None:
+            use_count_tokens = os.environ.get('GEMINI_QUOTA_COUNT_TOKENS', '').lower() in ('1', 'true', 'yes')
+        self.use_count_tokens = use_count_tokens
+        self.max_retries = max_retries
+        self.cooldown = cooldown
+        self.requests = TokenBucket(self.rpm)
+        self.tokens = TokenBucket(self.tpm)
+        self.logger = logging.getLogger('QuotaManager')
+
+        self._queue = []
+        self._counter = itertools.count()
+        self._wakeup: Optional[asyncio.TimerHandle] = None
+        self._recent = deque()  # (zaman, token) son 60 saniyedeki istekler
+        # Durum olay döngüsünde değişir, /metrics ise health server iş parçacığından
+        # okur: değişiklikler ve okuma anlık görüntüsü bu kilit altında yapılır
+        self._lock = threading.Lock()
+
+        self.stats = {
+            'granted': 0,
+            'queued': 0,
+            'quota_errors': 0,
+            'dropped': 0,
+            'extra_calls': 0,
+            'wait_time': 0.0,
+            'estimated_tokens': 0,
+            'actual_tokens': 0,
+        }
+
+    # --- Token tahmini ---
+
+    async def estimate(self, model, prompt: str, instruction: Optional[str] = None) -> int:
+        """İstek token sayısı: count_tokens (açıksa) veya yerel tahmin
+
+        Modelin system instruction'ı her istekte girdi olarak faturalanır;
+        yerel tahmine `instruction` da eklenir.
+        """
+        if self.use_count_tokens and hasattr(model, 'count_tokens_async'):
+            try:
+                result = await model.count_tokens_async(prompt)
+                return int(result.total_tokens)
+            except Exception as e:
+                self.logger.debug(f"count_tokens failed, using local estimate: {e}")
+        return model_backend.estimate_tokens(prompt) + model_backend.estimate_tokens(instruction or '')
+
+    # --- Kuyruk ---
+
+    async def acquire(self, tokens: int, priority: int = PRIORITY_POST):
+        """Kovalarda yer açılana kadar bekle; öncelik sırasına uyar"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        entry = [priority, next(self._counter), tokens, future, time.monotonic()]
+        with self._lock:
+            heapq.heappush(self._queue, entry)
+        self._pump()
+        if not future.done():
+            with self._lock:
+                self.stats['queued'] += 1
+            self.logger.info(f"⏳ Gemini quota: {PRIORITY_NAMES.get(priority, priority)} request queued "
+                             f"({len(self._queue)} waiting)")
+        try:
+            await future
+        except asyncio.CancelledError:
+            with self._lock:
+                entry[3] = None  # kuyruktan tembel silme
+                if future.done() and not future.cancelled():
+                    # Yer ayrılmıştı ama kullanılmayacak: iade et
+                    self.requests.adjust(-1)
+                    self.tokens.adjust(-tokens)
+            raise
+
+    def _pump(self):
+        """Sıranın başındakilere yer varsa izin ver, yoksa uyanma zamanla"""
+        if self._wakeup:
+            self._wakeup.cancel()
+            self._wakeup = None
+        granted = []
+        with self._lock:
+            delay = self._grant(granted)
+        if delay > 0:
+            self._wakeup = asyncio.get_running_loop().call_later(delay, self._pump)
+        for future in granted:
+            future.set_result(None)
+
+    def _grant(self, granted: list) -> float:
+        """Kilit altında: yer olan istekleri kuyruktan al; kalan bekleme süresini döndür"""
+        now = time.monotonic()
+        while self._recent and self._recent[0][0] < now - 60:
+            self._recent.popleft()
+        while self._queue:
+            priority, _, tokens, future, queued_at = self._queue[0]
+            if future is None or future.done():
+                heapq.heappop(self._queue)
+                continue
+            delay = max(self.requests.wait_time(1), self.tokens.wait_time(tokens))
+            if delay > 0:
+                return delay
+            heapq.heappop(self._queue)
+            self.requests.take(1)
+            self.tokens.take(tokens)
+            self._recent.append((now, tokens))
+            self.stats['granted'] += 1
+            self.stats['estimated_tokens'] += tokens
+            self.stats['wait_time'] += now - queued_at
+            granted.append(future)
+        return 0.0
+
+    def record_usage(self, estimated: int, response=None, actual: Optional[int] = None):
+        """Yanıttaki (veya verilen) gerçek token kullanımıyla TPM kovasını düzelt"""
+        if actual is None:
+            usage = getattr(response, 'usage_metadata', None)
+            actual = getattr(usage, 'total_token_count', None)
+        if not actual:
+            return
+        with self._lock:
+            self.stats['actual_tokens'] += actual
+            self.tokens.adjust(actual - estimated)
+            if self._recent:
+                when, tokens = self._recent[-1]
+                self._recent[-1] = (when, tokens + actual - estimated)
+
+    def penalize(self, cooldown: Optional[float] = None):
+        """429 alındı: bekleyen tüm istekler kota açılana kadar durur"""
+        if cooldown is None:
+            cooldown = self.cooldown
+        with self._lock:
+            self.stats['quota_errors'] += 1
+            self.requests.drain(cooldown)
+        self.logger.warning(f"🚦 Gemini quota exhausted, pausing requests for {cooldown:.0f}s")
+
+    async def run(self, model, prompt: str, call: Callable[[], Awaitable], priority: int = PRIORITY_POST,
+                  instruction: Optional[str] = None, stream: bool = False):
+        """Kota içinde `call()`'u çalıştır; 429'da tekrar sıraya gir
+
+        `call()` içindeki model birden fazla istek yaparsa (ResilientModel'in
+        denemeleri, yedekleri, hedge'leri) her ek istek `acquire_attempt` ile
+        ayrıca kota alır. `stream` ise yanıt `MeteredStream` ile sarılır ve
+        kullanım akış bitince düzeltilir.
+        """
+        estimated = await self.estimate(model, prompt, instruction)
+        request = {'manager': self, 'tokens': estimated, 'priority': priority, 'prepaid': 0}
+        context = _current_request.set(request)
+        try:
+            response = await self._run(request, estimated, priority, call, stream)
+        finally:
+            _current_request.reset(context)
+        if stream:
+            return MeteredStream(response, lambda actual: self.record_usage(estimated, actual=actual), estimated)
+        return response
+
+    async def _run(self, request: Dict, estimated: int, priority: int, call: Callable[[], Awaitable],
+                   stream: bool):
+        for attempt in range(self.max_retries + 1):
+            await self.acquire(estimated, priority)
+            request['prepaid'] = 1
+            try:
+                response = await call()
+            except Exception as e:
+                if not is_quota_error(e):
+                    raise
+                self.penalize()
+                if attempt == self.max_retries:
+                    with self._lock:
+                        self.stats['dropped'] += 1
+                    raise
+                continue
+            if not stream:
+                self.record_usage(estimated, response)
+            return response
+
+    # --- Metrikler ---
+
+    def metrics(self) -> Dict:
+        """Anlık kullanım ve kalan kota (health server /metrics, başka iş parçacığından)
+
+        Durum kilit altında kopyalanır; okuyucu hiçbir şeyi değiştirmez.
+        """
+        with self._lock:
+            recent = list(self._recent)
+            queue = [(priority, future) for priority, _, _, future, _ in self._queue]
+            stats = dict(self.stats)
+            requests_headroom = self.requests.available()
+            tokens_headroom = self.tokens.available()
+        cutoff = time.monotonic() - 60
+        recent = [(when, tokens) for when, tokens in recent if when >= cutoff]
+        waiting: Dict[str, int] = {}
+        for priority, future in queue:
+            if future is not None and not future.done():
+                name = PRIORITY_NAMES.get(priority, str(priority))
+                waiting[name] = waiting.get(name, 0) + 1
+        granted = stats['granted']
+        return {
+            'rpm': {
+                'limit': self.rpm,
+                'used_last_minute': len(recent),
+                'headroom': max(0, int(requests_headroom)),
+            },
+            'tpm': {
+                'limit': self.tpm,
+                'used_last_minute': sum(tokens for _, tokens in recent),
+                'headroom': max(0, int(tokens_headroom)),
+            },
+            'queue': waiting,
+            'granted': granted,
+            'queued': stats['queued'],
+            'quota_errors': stats['quota_errors'],
+            'dropped': stats['dropped'],
+            'extra_calls': stats['extra_calls'],
+            'avg_wait_s': round(stats['wait_time'] / granted, 3) if granted else 0.0,
+            'estimated_tokens': stats['estimated_tokens'],
+            'actual_tokens': stats['actual_tokens'],
+        }
+
+
+_manager: Optional[QuotaManager] = None
+_manager_lock = threading.Lock()
+
+
+def get_quota_manager() -> QuotaManager:
+    """Tüm üreticilerin paylaştığı tek kota yöneticisi"""
+    global _manager
+    if _manager is None:
+        with _manager_lock:
+            if _manager is None:
+                _manager = QuotaManager()
+    return _manager
+
+
+def set_quota_manager(manager: QuotaManager):
+    """Paylaşılan yöneticiyi değiştir (ör. yük testi kendi limitleriyle çalışır)"""
+    global _manager
+    with _manager_lock:
+        _manager = manager
@@ -0,0 +1,162 @@
+import json
+import logging
+import os
+import random
+import time
+from typing import Dict, List, Optional
+
+ROTATION_FILE = 'data/rotation_state.json'
+DEFAULT_HALF_LIFE_DAYS = 3.0
+# Yeni paylaşılan projenin seçilme ağırlığı sıfıra inmez (hepsi yeni ise de seçim yapılabilsin)
+MIN_FACTOR = 0.02
+# Reddetme örneklemesi bu kadar denemede sonuç vermezse tam ağırlıklı seçime düşülür
+MAX_TRIALS = 64
+
+
+def _key(name: str) -> str:
+    return name.strip().lower()
+
+
+class AliasTable:
+    """Vose alias yöntemi: O(n) kurulum, O(1) ağırlıklı örnekleme"""
+
+    def __init__(self, weights: List[float]):
+        n = len(weights)
+        self.size = n
+        self.prob = [1.0] * n
+        self.alias = list(range(n))
+        total = sum(weights)
+        if not n or total <= 0:
+            return
+        scaled = [w * n / total for w in weights]
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            less, more = small.pop(), large.pop()
+            self.prob[less] = scaled[less]
+            self.alias[less] = more
+            scaled[more] -= 1.0 - scaled[less]
+            (small if scaled[more] < 1.0 else large).append(more)
+        # Kalanlar kayan nokta hatası dışında tam 1'dir
+        for i in small + large:
+            self.prob[i] = 1.0
+
+    def sample(self, rng: random.Random) -> int:
+        r = rng.random() * self.size
+        i = int(r)
+        return i if r - i < self.prob[i] else self.alias[i]
+
+
+class RotationSampler:
+    """Proje rotasyonu: proje ağırlığı ve son paylaşım zamanına göre seçim
+
+    Alias tablosu yalnızca katalogdaki temel ağırlıklardan (`weight`, varsayılan 1)
+    kurulur; yakın zamanda paylaşılan projeler reddetme örneklemesiyle bastırılır.
+    Böylece paylaşım kaydı tabloyu yeniden kurmaz, tablo yalnızca katalog
+    değiştiğinde kurulur. Son paylaşım zamanları `data/` altında saklanır.
+    """
+
+    def __init__(self, path: str = ROTATION_FILE, half_life_days: Optional[float] = None,
+                 rng: Optional[random.Random] = None):
+        self.path = path
+        if half_life_days is None:
+            half_life_days = float(os.environ.get('ROTATION_HALF_LIFE_DAYS', DEFAULT_HALF_LIFE_DAYS))
+        self.half_life = half_life_days * 86400
+        self.rng = rng or random.Random()
+        self.logger = logging.getLogger('RotationSampler')
+        self.last_posted: Dict[str, float] = {}
+
+        self._table: Optional[AliasTable] = None
+        self._source: Optional[List[Dict]] = None
+        self._size = 0
+        self._version = None
+        self.stats = {'rebuilds': 0, 'samples': 0, 'rejections': 0, 'fallbacks': 0}
+        self.load()
+
+    def load(self):
+        try:
+            if os.path.exists(self.path):
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self.last_posted = json.load(f).get('last_posted', {})
+        except Exception as e:
+            self.logger.warning(f"⚠️ Could not load rotation state: {e}")
+            self.last_posted = {}
+        self.prune()
+
+    def save(self):
+        try:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            tmp = f"{self.path}.tmp"
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump({'last_posted': self.last_posted}, f, ensure_ascii=False)
+            os.replace(tmp, self.path)
+        except Exception as e:
+            self.logger.warning(f"⚠️ Could not save rotation state: {e}")
+
+    def prune(self):
+        """Etkisi kalmamış (10 yarı ömürden eski) kayıtları at"""
+        cutoff = time.time() - 10 * self.half_life
+        self.last_posted = {name: ts for name, ts in self.last_posted.items() if ts >= cutoff}
+
+    # --- Ağırlıklar ---
+
+    @staticmethod
+    def base_weight(project: Dict) -> float:
+        try:
+            return max(0.0, float(project.get('weight', 1.0)))
+        except (TypeError, ValueError):
+            return 1.0
+
+    def recency_factor(self, project: Dict, now: Optional[float] = None) -> float:
+        """Son paylaşımdan bu yana geçen süreye göre 0..1 çarpan"""
+        posted_at = self.last_posted.get(_key(project['name']))
+        if posted_at is None:
+            return 1.0
+        age = max(0.0, (now or time.time()) - posted_at)
+        return max(MIN_FACTOR, 1.0 - 0.5 ** (age / self.half_life))
+
+    def _ensure_table(self, projects: List[Dict], version=None):
+        if (self._table is not None and projects is self._source
+                and len(projects) == self._size and version == self._version):
+            return
+        self._table = AliasTable([self.base_weight(p) for p in projects])
+        self._source, self._size, self._version = projects, len(projects), version
+        self.stats['rebuilds'] += 1
+
+    # --- Seçim ---
+
+    def _draw(self, projects: List[Dict], chosen: set, now: float) -> Optional[int]:
+        for _ in range(MAX_TRIALS):
+            index = self._table.sample(self.rng)
+            if index in chosen:
+                continue
+            if self.rng.random() < self.recency_factor(projects[index], now):
+                return index
+            self.stats['rejections'] += 1
+        # Çoğu proje yeni paylaşılmış: etkin ağırlıklarla doğrudan seç
+        self.stats['fallbacks'] += 1
+        weights = [0.0 if i in chosen else self.base_weight(p) * self.recency_factor(p, now)
+                   for i, p in enumerate(projects)]
+        if sum(weights) <= 0:
+            return None
+        return self.rng.choices(range(len(projects)), weights=weights)[0]
+
+    def sample(self, projects: List[Dict], count: int, version=None) -> List[Dict]:
+        """`count` farklı proje seç; `version` değişince alias tablosu yeniden kurulur"""
+        if len(projects) <= count:
+            return list(projects)
+        self._ensure_table(projects, version)
+        now = time.time()
+        chosen: List[int] = []
+        for _ in range(count):
+            index = self._draw(projects, set(chosen), now)
+            if index is None:
+                break
+            chosen.append(index)
+        self.stats['samples'] += len(chosen)
+        return [projects[i] for i in chosen]
+
+    def record(self, project: Dict):
+        """Proje paylaşıldı: seçilme olasılığı yarı ömre göre yeniden artar"""
+        self.last_posted[_key(project['name'])] = time.time()
+        self.save()
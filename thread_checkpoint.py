@@ -0,0 +1,99 @@
+import hashlib
+import json
+import logging
+import os
+import time
+from typing import Dict, List, Optional
+
+CHECKPOINTS_FILE = 'data/thread_checkpoints.json'
+# Bu süreden eski yarım thread'ler devam ettirilmez (bağlam kaybolmuştur)
+MAX_AGE_HOURS = 48
+MAX_RESUME_ATTEMPTS = 3
+
+
+def thread_key(parts: List[str]) -> str:
+    return hashlib.sha1("\x1e".join(parts).encode('utf-8')).hexdigest()[:16]
+
+
+class ThreadCheckpoints:
+    """Yarım kalan thread'lerin gönderilmiş parça ID'leri (`data/` altında kalıcı)
+
+    Bir thread'in bazı parçaları gönderilip kalanı başarısız olursa kayıt
+    tutulur; yeniden denemede kalan parçalar son gönderilen parçaya yanıt
+    olarak eklenir, thread baştan üretilmez.
+    """
+
+    def __init__(self, path: str = CHECKPOINTS_FILE):
+        self.path = path
+        self.logger = logging.getLogger('ThreadCheckpoints')
+        self.entries: Dict[str, Dict] = {}
+        self.load()
+
+    def load(self):
+        try:
+            if os.path.exists(self.path):
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self.entries = json.load(f).get('threads', {})
+        except Exception as e:
+            self.logger.warning(f"⚠️ Could not load thread checkpoints: {e}")
+            self.entries = {}
+        cutoff = time.time() - MAX_AGE_HOURS * 3600
+        expired = [key for key, entry in self.entries.items() if entry['updated_at'] < cutoff]
+        for key in expired:
+            entry = self.entries.pop(key)
+            self.logger.warning(f"⚠️ Dropping stale partial thread {entry.get('label') or key} "
+                                f"({len(entry['status_ids'])}/{len(entry['parts'])} parts posted)")
+        if expired:
+            self.save()
+
+    def save(self):
+        try:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            tmp = f"{self.path}.tmp"
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump({'threads': self.entries}, f, ensure_ascii=False)
+            os.replace(tmp, self.path)
+        except Exception as e:
+            self.logger.warning(f"⚠️ Could not save thread checkpoints: {e}")
+
+    def get(self, key: str) -> Optional[Dict]:
+        return self.entries.get(key)
+
+    def pending(self) -> List[Dict]:
+        """Devam ettirilecek yarım thread'ler (en eskisi önce)"""
+        return sorted(self.entries.values(), key=lambda entry: entry['updated_at'])
+
+    def is_pending(self, label: str) -> bool:
+        return any(entry.get('label') == label for entry in self.entries.values())
+
+    def record(self, key: str, parts: List[str], status_ids: List[str], label: Optional[str] = None):
+        """Gönderim sonucu: thread tamamlandıysa kaydı sil, yarımsa ID'leri sakla
+
+        `status_ids` bu ana kadar gönderilmiş tüm parçaların ID'leridir.
+        """
+        entry = self.entries.get(key)
+        if len(status_ids) >= len(parts):
+            if entry:
+                del self.entries[key]
+                self.save()
+            return
+        if entry is None:
+            if not status_ids:
+                return  # hiçbir parça gönderilmedi: yarım thread yok
+            entry = self.entries[key] = {'key': key, 'label': label, 'parts': parts, 'status_ids': [],
+                                         'attempts': 0, 'started_at': time.time()}
+        elif len(status_ids) <= len(entry['status_ids']):
+            # İlerleme yok: deneme sayısı dolunca vazgeç
+            entry['attempts'] += 1
+            if entry['attempts'] >= MAX_RESUME_ATTEMPTS:
+                self.logger.error(f"❌ Giving up on partial thread {entry.get('label') or key} "
+                                  f"after {entry['attempts']} attempts")
+                del self.entries[key]
+            self.save()
+            return
+        entry['status_ids'] = list(status_ids)
+        entry['attempts'] = 0
+        entry['updated_at'] = time.time()
+        self.save()
+        self.logger.info(f"💾 Checkpoint: {len(status_ids)}/{len(parts)} parts of "
+                         f"{entry.get('label') or key} posted")
@@ -0,0 +1,399 @@
+import re
+import unicodedata
+from typing import List, Optional, Tuple
+
+# X (Twitter) karakter sayımı: twitter-text v3 ağırlıkları
+TWEET_MAX_WEIGHT = 280
+URL_WEIGHT = 23
+EMOJI_WEIGHT = 2
+ELLIPSIS = "..."
+
+# Bu aralıklardaki karakterler 1, diğer her şey (CJK vb.) 2 sayılır
+_LIGHT_RANGES = (
+    (0x0000, 0x10FF),
+    (0x2000, 0x200D),
+    (0x2010, 0x201F),
+    (0x2032, 0x2037),
+)
+
+_URL_TLDS = (
+    "com|net|org|io|xyz|ai|fi|finance|network|trade|build|builders|app|co|gg|"
+    "so|dev|me|tv|info|money|exchange|foundation|labs|tech|global|world|fun"
+)
+URL_RE = re.compile(
+    r"(?:https?://|www\.)[^\s<>\"']+"
+    r"|\b[a-z0-9][a-z0-9-]*(?:\.[a-z0-9-]+)*\.(?:" + _URL_TLDS + r")\b(?:/[^\s<>\"']*)?",
+    re.IGNORECASE,
+)
+_URL_TRAILING = ".,;:!?)]}'\""
+
+TOKEN_RE = re.compile(r"\s+|\S+")
+
+# Boşluk token'larının kesme önceliği (büyük olan tercih edilir)
+WORD_BREAK = 1
+CLAUSE_BREAK = 2
+SENTENCE_BREAK = 3
+PARAGRAPH_BREAK = 4
+
+_SENTENCE_END = re.compile(r"[.!?…。！？]+[\"'”’)\]]*$")
+_CLAUSE_END = re.compile(r"[,;:]$|^[—–-]$")
+
+# Kesim noktası en az bu oranda doluluk sağlamalı; bu sayede parça sayısı
+# baştan sınırlanır ve numaralandırma için tek geçişte yer ayrılabilir
+MIN_FILL_RATIO = 0.5
+
+
+def _char_weight(ch: str) -> int:
+    cp = ord(ch)
+    for low, high in _LIGHT_RANGES:
+        if low <= cp <= high:
+            return 1
+    return 2
+
+
+def _is_extender(cp: int, category: str) -> bool:
+    """Bir önceki grafem kümesine yapışan kod noktaları"""
+    return (
+        category in ("Mn", "Me", "Mc")
+        or 0xFE00 <= cp <= 0xFE0F
+        or 0x1F3FB <= cp <= 0x1F3FF
+        or 0xE0020 <= cp <= 0xE007F
+        or 0xE0100 <= cp <= 0xE01EF
+        or cp == 0x200D
+        or cp == 0x20E3
+    )
+
+
+def _is_emoji_cluster(cluster: str) -> bool:
+    for ch in cluster:
+        cp = ord(ch)
+        if cp >= 0x1F000 or cp == 0xFE0F or cp == 0x200D or cp == 0x20E3 or 0x2600 <= cp <= 0x27BF:
+            return True
+    return False
+
+
+def graphemes(text: str) -> List[str]:
+    """Metni (yaklaşık) genişletilmiş grafem kümelerine böl - tek geçiş"""
+    clusters: List[str] = []
+    current = ""
+    prev_cp = -1
+    regional_run = 0
+    for ch in text:
+        cp = ord(ch)
+        category = unicodedata.category(ch)
+        is_regional = 0x1F1E6 <= cp <= 0x1F1FF
+        joins = bool(current) and (
+            _is_extender(cp, category)
+            or prev_cp == 0x200D
+            or (prev_cp == 0x0D and cp == 0x0A)
+            or (is_regional and regional_run % 2 == 1)
+        )
+        if joins:
+            current += ch
+        else:
+            if current:
+                clusters.append(current)
+            current = ch
+        regional_run = regional_run + 1 if is_regional else 0
+        prev_cp = cp
+    if current:
+        clusters.append(current)
+    return clusters
+
+
+def _cluster_weight(cluster: str) -> int:
+    if len(cluster) == 1:
+        return _char_weight(cluster)
+    if _is_emoji_cluster(cluster):
+        return EMOJI_WEIGHT
+    return sum(_char_weight(ch) for ch in cluster)
+
+
+def _plain_weight(text: str) -> int:
+    if text.isascii():
+        return len(text)
+    return sum(_cluster_weight(c) for c in graphemes(text))
+
+
+def _url_spans(text: str) -> List[Tuple[int, int]]:
+    spans = []
+    for match in URL_RE.finditer(text):
+        start, end = match.span()
+        while end > start and text[end - 1] in _URL_TRAILING:
+            end -= 1
+        if end > start:
+            spans.append((start, end))
+    return spans
+
+
+def _token_weight(token: str) -> int:
+    if "." not in token:
+        return _plain_weight(token)
+    weight = 0
+    pos = 0
+    for start, end in _url_spans(token):
+        weight += _plain_weight(token[pos:start]) + URL_WEIGHT
+        pos = end
+    return weight + _plain_weight(token[pos:])
+
+
+def weighted_length(text: str) -> int:
+    """Metnin X tarafından sayılan uzunluğu (URL=23, CJK/emoji=2)"""
+    if not text:
+        return 0
+    text = unicodedata.normalize("NFC", text)
+    return sum(_token_weight(t) for t in TOKEN_RE.findall(text))
+
+
+def _token_pieces(token: str) -> List[Tuple[str, int]]:
+    """Token'ı kesilebilir en küçük parçalara ayır (URL'ler bölünmez)"""
+    pieces: List[Tuple[str, int]] = []
+    pos = 0
+    spans = _url_spans(token) if "." in token else []
+    for start, end in spans + [(len(token), len(token))]:
+        for cluster in graphemes(token[pos:start]):
+            pieces.append((cluster, _cluster_weight(cluster)))
+        if end > start:
+            pieces.append((token[start:end], URL_WEIGHT))
+        pos = end
+    return pieces
+
+
+def _break_strength(prev_word: Optional[str], space: str, next_word: Optional[str]) -> int:
+    if "\n\n" in space or space.count("\n") >= 2:
+        return PARAGRAPH_BREAK
+    if prev_word is None:
+        return WORD_BREAK
+    if _SENTENCE_END.search(prev_word) or "\n" in space:
+        return SENTENCE_BREAK
+    if _CLAUSE_END.search(prev_word) or (next_word is not None and _CLAUSE_END.match(next_word)):
+        return CLAUSE_BREAK
+    return WORD_BREAK
+
+
+def _tokenize(text: str) -> List[Tuple[str, int, int]]:
+    """(metin, ağırlık, kesme önceliği) listesi; kelimelerde öncelik 0"""
+    raw = TOKEN_RE.findall(text)
+    tokens = []
+    for i, tok in enumerate(raw):
+        if tok.isspace():
+            prev_word = raw[i - 1] if i > 0 else None
+            next_word = raw[i + 1] if i + 1 < len(raw) else None
+            strength = _break_strength(prev_word, tok, next_word)
+            # Boşluk dizilerini sadeleştir: en fazla bir boş satır
+            if strength == PARAGRAPH_BREAK:
+                tok = "\n\n"
+            elif "\n" in tok:
+                tok = "\n"
+            else:
+                tok = " "
+            tokens.append((tok, len(tok), strength))
+        else:
+            tokens.append((tok, _token_weight(tok), 0))
+    return tokens
+
+
+def _numbering_reserve(total: int, limit: int) -> int:
+    """`i/n ` öneki için gereken en geniş yeri, parça sayısının üst sınırından hesapla"""
+    digits = 1
+    while True:
+        reserve = 2 * digits + 2
+        available = limit - reserve
+        if available <= 2 * URL_WEIGHT:
+            raise ValueError(f"Tweet limit too small for numbering: {limit}")
+        min_fill = max(1, int(available * MIN_FILL_RATIO))
+        max_parts = total // min_fill + 1
+        if max_parts < 10 ** digits:
+            return reserve
+        digits += 1
+
+
+def _segment(tokens: List[Tuple[str, int, int]], available: int) -> List[str]:
+    """Açgözlü bölme; her token en fazla iki kez ele alındığı için doğrusal"""
+    min_fill = max(1, int(available * MIN_FILL_RATIO))
+    segments: List[str] = []
+    parts: List[Tuple[str, int, int]] = []
+    weight = 0
+    # Her öncelik seviyesi için son kesme noktası: (parça indeksi, o ana kadarki ağırlık)
+    best = {}
+    queue = tokens[::-1]
+
+    def flush(count: int):
+        text = "".join(part[0] for part in parts[:count]).strip()
+        if text:
+            segments.append(text)
+
+    while queue:
+        token = queue.pop()
+        text, tok_weight, strength = token
+        if strength and not parts:
+            continue  # parça başındaki boşlukları at
+        if weight + tok_weight <= available:
+            if strength:
+                best[strength] = (len(parts), weight)
+            parts.append(token)
+            weight += tok_weight
+            continue
+
+        cut = None
+        for level in (PARAGRAPH_BREAK, SENTENCE_BREAK, CLAUSE_BREAK, WORD_BREAK):
+            if level in best and best[level][1] >= min_fill:
+                cut = best[level][0]
+                break
+
+        if cut is not None:
+            # Kesimden sonraki token'lar sıraya geri döner; yeni parçaya sığarlar
+            queue.append(token)
+            queue.extend(reversed(parts[cut + 1:]))
+            flush(cut)
+        elif strength:
+            flush(len(parts))
+        else:
+            # Uygun sınır yok: token'ı grafem/URL sınırından kes
+            pieces = _token_pieces(text)
+            room = available - weight
+            idx = 0
+            while idx < len(pieces) and pieces[idx][1] <= room:
+                room -= pieces[idx][1]
+                idx += 1
+            if idx == 0 and not parts:
+                idx = 1  # tek parça bile sığmıyor; ilerlemeyi garanti et
+            head = "".join(piece for piece, _ in pieces[:idx])
+            parts.append((head, 0, 0))
+            if idx < len(pieces):
+                rest = "".join(piece for piece, _ in pieces[idx:])
+                queue.append((rest, sum(w for _, w in pieces[idx:]), 0))
+            flush(len(parts))
+        parts = []
+        weight = 0
+        best = {}
+
+    flush(len(parts))
+    return segments
+
+
+def segment_thread(text: str, limit: int = TWEET_MAX_WEIGHT, numbering: bool = True) -> List[str]:
+    """Metni X ağırlıklı uzunluğa göre thread parçalarına böl.
+
+    Paragraf > cümle > yan cümle > kelime sınırları tercih edilir, gerekirse
+    grafem sınırından kesilir. Numaralandırma (`i/n `) için yer tek geçişte
+    ayrılır; hiçbir parça `limit` değerini aşmaz.
+    """
+    if not text or not text.strip():
+        return []
+    text = unicodedata.normalize("NFC", text)
+    tokens = _tokenize(text)
+    total = sum(weight for _, weight, _ in tokens)
+
+    if total <= limit:
+        return ["".join(tok for tok, _, _ in tokens).strip()]
+
+    reserve = _numbering_reserve(total, limit) if numbering else 0
+    segments = _segment(tokens, limit - reserve)
+
+    if numbering and len(segments) > 1:
+        count = len(segments)
+        return [f"{i}/{count} {segment}" for i, segment in enumerate(segments, start=1)]
+    return segments
+
+
+def truncate(text: str, limit: int = TWEET_MAX_WEIGHT, ellipsis: str = ELLIPSIS) -> str:
+    """Metni ağırlıklı uzunluğa göre kısalt (grafem ve URL güvenli)"""
+    if not text:
+        return text
+    text = unicodedata.normalize("NFC", text)
+    if weighted_length(text) <= limit:
+        return text
+    head = _segment(_tokenize(text), limit - weighted_length(ellipsis))
+    return head[0].rstrip(" ,;:") + ellipsis if head else ellipsis
+
+
+def number_parts(parts: List[str], limit: int = TWEET_MAX_WEIGHT) -> List[str]:
+    """Hazır parçalara `i/n ` öneki ekle, her parçayı limit içinde tut"""
+    parts = [p for p in parts if p and p.strip()]
+    if len(parts) <= 1:
+        return [truncate(p.strip(), limit) for p in parts]
+    count = len(parts)
+    numbered = []
+    for i, part in enumerate(parts, start=1):
+        prefix = f"{i}/{count} "
+        numbered.append(prefix + truncate(part.strip(), limit - len(prefix)))
+    return numbered
+
+
+def body_limit(max_parts: int, limit: int = TWEET_MAX_WEIGHT) -> int:
+    """`max_parts` parçalı thread'de `i/n ` öneki eklenmeden önce gövde sınırı"""
+    return limit - len(f"{max_parts}/{max_parts} ")
+
+
+class StreamAborted(Exception):
+    """Akan model çıktısı kısıtları açıkça ihlal etti"""
+
+
+_LEADING_NUMBER_RE = re.compile(r"^\d+(?:/\d+|\.)\s+")
+
+
+class IncrementalSegmenter:
+    """Parça parça gelen model çıktısını satır satır tweet gövdelerine çevir.
+
+    `feed()` tamamlanan tweet'leri hemen döndürür; çıktı açıkça bütçeyi
+    aşarsa (çok fazla tweet ya da toplam ağırlık) veya yasaklı bir ifadeyle
+    açılırsa `StreamAborted` fırlatır. Gövdeler `i/n ` öneki için yer
+    bırakacak uzunluktadır; numaralandırma akış bitince `number_parts` ile yapılır.
+    """
+
+    # Açılış kontrolü bu kadar karakter (veya ilk satır) gelince yapılır
+    OPENING_CHARS = 40
+
+    def __init__(self, limit: int = TWEET_MAX_WEIGHT, max_parts: int = 5,
+                 banned_openers=(), overflow_ratio: float = 1.5):
+        self.body_limit = body_limit(max_parts, limit)
+        self.max_parts = max_parts
+        self.max_weight = int(max_parts * limit * overflow_ratio)
+        self.banned_openers = tuple(phrase.lower() for phrase in banned_openers)
+        self.buffer = ""
+        self.parts: List[str] = []
+        self.weight = 0
+        self.opening_checked = not self.banned_openers
+
+    def _check_opening(self, force: bool = False):
+        head = self.buffer.lstrip()
+        if not head or (len(head) < self.OPENING_CHARS and "\n" not in head and not force):
+            return
+        self.opening_checked = True
+        head = _LEADING_NUMBER_RE.sub("", head.strip("[]\"' ")).lower()
+        for phrase in self.banned_openers:
+            if head.startswith(phrase):
+                raise StreamAborted(f"output opens with banned phrase: {phrase!r}")
+
+    def _accept(self, line: str) -> List[str]:
+        line = _LEADING_NUMBER_RE.sub("", line.strip().strip("[]\"'").strip())
+        if not line:
+            return []
+        pieces = segment_thread(line, limit=self.body_limit, numbering=False)
+        if len(self.parts) + len(pieces) > self.max_parts:
+            raise StreamAborted(f"more than {self.max_parts} tweets")
+        self.parts.extend(pieces)
+        return pieces
+
+    def feed(self, chunk: str) -> List[str]:
+        self.buffer += chunk
+        if not self.opening_checked:
+            self._check_opening()
+        completed: List[str] = []
+        if "\n" in self.buffer:
+            *lines, self.buffer = self.buffer.split("\n")
+            for line in lines:
+                self.weight += weighted_length(line)
+                completed.extend(self._accept(line))
+        if self.weight + weighted_length(self.buffer) > self.max_weight:
+            raise StreamAborted(f"output exceeds {self.max_weight} weighted characters")
+        return completed
+
+    def close(self) -> List[str]:
+        """Akış bitti: yarım kalan son satırı da tweet olarak döndür"""
+        if not self.opening_checked:
+            self._check_opening(force=True)
+        line, self.buffer = self.buffer, ""
+        self.weight += weighted_length(line)
+        return self._accept(line)
@@ -0,0 +1,149 @@
+import re
+from typing import Dict, Iterable, List, Optional, Sequence
+
+try:
+    import numpy as np
+except ImportError:  # NumPy isteğe bağlı: yoksa saf Python puanlayıcı kullanılır
+    np = None
+
+# Öncelik sırasıyla kategoriler; bir tweet eşleşen ilk kategoriye atanır
+CATEGORY_TERMS = [
+    ("DeFi Discussion", ('defi', 'yield', 'liquidity', 'tvl', 'apy')),
+    ("NFT Discussion", ('nft', 'opensea', 'mint', 'collection')),
+    ("Scaling Solutions", ('layer2', 'l2', 'scaling', 'rollup')),
+    ("Major Crypto Assets", ('bitcoin', 'btc', 'ethereum', 'eth')),
+    ("AI + Crypto", ('ai', 'artificial intelligence', 'machine learning')),
+    ("Regulatory Discussion", ('regulation', 'sec', 'compliance')),
+    ("Gaming/Metaverse", ('gaming', 'metaverse', 'virtual')),
+]
+DEFAULT_CATEGORY = "General Web3"
+CATEGORIES = [name for name, _ in CATEGORY_TERMS]
+
+# Bu boyuttan küçük gruplarda NumPy'ye dönüşüm maliyeti kazançtan büyüktür
+NUMPY_MIN_BATCH = 64
+
+
+def _trie_pattern(words: Iterable[str]) -> str:
+    """Kelimeleri ortak öneklerine göre birleştiren desen (en uzun eşleşme önce)
+
+    Düz `a|b|c` alternasyonunda her konumda tüm terimler denenir; önek ağacında
+    yalnızca o konumdaki karakterle başlayan dal denenir.
+    """
+    trie: Dict = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = None
+
+    def build(node: Dict) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        if '' in node:
+            # Kelime burada bitebilir; açgözlü `?` önce daha uzun devamı dener
+            return '(?:' + body + ')?' if len(branches) == 1 else body + '?'
+        return body
+
+    return build(trie)
+
+
+class TweetClassifier:
+    """Tweet kategorisi, kategori puanları ve katalog anahtar kelimeleri
+
+    Kategori terimleri ve katalog anahtar kelimeleri tek bir derlenmiş önek
+    ağacı deseninde toplanır. Desen her konumda en uzun terimi bulur (örtüşen
+    eşleşmeler dahil). Aynı konumda eşleşen kısa terimler bulunan terimin önekleridir; bu
+    yüzden her terim önceden kendi öneklerinin kategori ve anahtar kelime
+    katkılarıyla eşlenir. Sonuç, terimleri tek tek `in` ile aramakla aynıdır.
+    """
+
+    def __init__(self, keywords: Iterable[str] = (), use_numpy: Optional[bool] = None):
+        self.keywords = list(keywords)
+        if use_numpy is None:
+            use_numpy = np is not None
+        self.use_numpy = use_numpy and np is not None
+
+        term_categories: Dict[str, int] = {}
+        for index, (_, terms) in enumerate(CATEGORY_TERMS):
+            for term in terms:
+                term_categories.setdefault(term, index)
+        keyword_terms: Dict[str, List[int]] = {}
+        for index, keyword in enumerate(self.keywords):
+            keyword_terms.setdefault(keyword.lower(), []).append(index)
+
+        self.vocabulary = sorted(set(term_categories) | set(keyword_terms))
+        self.pattern = re.compile("(?=(" + _trie_pattern(self.vocabulary) + "))")
+        self._index = {term: i for i, term in enumerate(self.vocabulary)}
+
+        # Terim -> öneklerinin katkısı: [(kategori, adet)] ve anahtar kelime indeksleri
+        self._category_hits: List[List[tuple]] = []
+        self._keyword_hits: List[List[int]] = []
+        for term in self.vocabulary:
+            counts: Dict[int, int] = {}
+            hits: List[int] = []
+            for end in range(1, len(term) + 1):
+                prefix = term[:end]
+                if prefix in term_categories:
+                    category = term_categories[prefix]
+                    counts[category] = counts.get(category, 0) + 1
+                hits.extend(keyword_terms.get(prefix, ()))
+            self._category_hits.append(sorted(counts.items()))
+            self._keyword_hits.append(sorted(hits))
+
+        if self.use_numpy:
+            self._matrix = np.zeros((len(self.vocabulary), len(CATEGORIES)), dtype=np.int32)
+            for row, hits in enumerate(self._category_hits):
+                for category, count in hits:
+                    self._matrix[row, category] = count
+
+    def _matches(self, text: str) -> List[int]:
+        index = self._index
+        return [index[term] for term in self.pattern.findall(text.lower())]
+
+    def _category(self, scores: Sequence[int]) -> str:
+        for index, score in enumerate(scores):
+            if score:
+                return CATEGORIES[index]
+        return DEFAULT_CATEGORY
+
+    def _keywords(self, terms: List[int]) -> List[str]:
+        found = set()
+        for term in terms:
+            found.update(self._keyword_hits[term])
+        return [self.keywords[i] for i in sorted(found)]
+
+    def _score_python(self, matches: List[List[int]]) -> List[List[int]]:
+        rows = []
+        for terms in matches:
+            scores = [0] * len(CATEGORIES)
+            for term in terms:
+                for category, count in self._category_hits[term]:
+                    scores[category] += count
+            rows.append(scores)
+        return rows
+
+    def _score_numpy(self, matches: List[List[int]]) -> List[List[int]]:
+        # Tweet x terim sayım matrisi, terim x kategori matrisiyle çarpılır
+        vocabulary = len(self.vocabulary)
+        rows = np.repeat(np.arange(len(matches)), [len(terms) for terms in matches])
+        columns = np.fromiter((t for terms in matches for t in terms), dtype=np.int64, count=len(rows))
+        counts = np.bincount(rows * vocabulary + columns, minlength=len(matches) * vocabulary)
+        return (counts.reshape(len(matches), vocabulary) @ self._matrix).tolist()
+
+    def classify(self, texts: Sequence[str]) -> List[Dict]:
+        """Her metin için `{'category', 'scores', 'keywords'}` döndür"""
+        matches = [self._matches(text) for text in texts]
+        if self.use_numpy and len(texts) >= NUMPY_MIN_BATCH:
+            score_rows = self._score_numpy(matches)
+        else:
+            score_rows = self._score_python(matches)
+        return [
+            {
+                'category': self._category(scores),
+                'scores': dict(zip(CATEGORIES, scores)),
+                'keywords': self._keywords(terms),
+            }
+            for terms, scores in zip(matches, score_rows)
+        ]
@@ -0,0 +1,38 @@
+from datetime import datetime, timezone
+from typing import Callable, Optional, Union
+
+# API v1.1 / GraphQL `created_at` biçimi: "Wed Oct 10 20:19:24 +0000 2018"
+CREATED_AT_FORMAT = '%a %b %d %H:%M:%S %z %Y'
+
+RecencyPredicate = Callable[[datetime], bool]
+
+
+def parse_tweet_time(value: Union[str, datetime, None]) -> Optional[datetime]:
+    """`<time datetime>` (ISO 8601) veya JSON `created_at` değerini UTC'li datetime'a çevir"""
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        parsed = value
+    else:
+        value = value.strip()
+        try:
+            parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        except ValueError:
+            try:
+                parsed = datetime.strptime(value, CREATED_AT_FORMAT)
+            except ValueError:
+                return None
+    # Saat dilimi yoksa X zamanları UTC'dir
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def tweet_age(tweet_time: datetime) -> float:
+    """Tweet'in yaşı (saniye); iki taraf da saat dilimli karşılaştırılır"""
+    return (datetime.now(timezone.utc) - tweet_time).total_seconds()
+
+
+def newer_than(seconds: float) -> RecencyPredicate:
+    """Son `seconds` saniye içinde atılmış tweet'leri kabul eden yenilik koşulu"""
+    return lambda tweet_time: tweet_age(tweet_time) <= seconds
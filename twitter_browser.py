@@ -7,15 +7,260 @@ import logging
 import random
 import re
 from datetime import datetime, timedelta
-from typing import Optional, Dict, List, Union, Callable
+from urllib.parse import urlencode, urlsplit
+from typing import AsyncIterator, Optional, Dict, List, Union, Callable
 from email_handler import EmailHandler
+from thread_segmenter import segment_thread, weighted_length, number_parts, StreamAborted
+from flow_metrics import FlowMetrics, InstrumentedPage, tracked_flow
+from har_session import HarSession, state_path
+from tweet_time import RecencyPredicate, parse_tweet_time
+from thread_checkpoint import CHECKPOINTS_FILE, ThreadCheckpoints, thread_key
+from debug_artifacts import ArtifactStore
+from profile_manager import ProfileManager
+from model_resilience import StreamInterrupted
+
+# Tek bir tweet makalesinden alanları oku. Yazar, zaman bağlantısındaki
+# /<kullanıcı>/status/<id>'den alınır (alıntılanan tweet'in bağlantısı değil).
+_READ_TWEET_JS = r"""
+article => {
+    const time = article.querySelector('time');
+    const link = (time && time.closest('a[href*="/status/"]')) || article.querySelector('a[href*="/status/"]');
+    const href = link ? link.getAttribute('href') : null;
+    const match = href ? href.match(/^\/([^/]+)\/status\/(\d+)/) : null;
+    const text = article.querySelector('div[data-testid="tweetText"]');
+    return {
+        author: match ? match[1] : null,
+        id: match ? match[2] : null,
+        url: match ? 'https://x.com' + match[0] : null,
+        time: time ? time.getAttribute('datetime') : null,
+        text: text ? text.innerText : '',
+        social: !!article.querySelector('[data-testid="socialContext"]'),
+    };
+}
+"""
+
+# Sayfa içi okuyucu: MutationObserver yeni render edilen tweet'leri status ID'ye
+# göre tekilleştirip kuyruğa koyar; Python tarafı kuyruğu `drain()` ile alır, bu
+# yüzden ElementHandle tutulmaz. Okunmuş ve görünümün `pruneScreens` ekran
+# yukarısında kalan hücreler `content-visibility: hidden` ile çizimden çıkarılır
+# (yükseklik korunur, kaydırma konumu kaymaz). DOM React'a ait olduğu için
+# silinmez; okuyucu durunca hücreler tekrar görünür yapılır. X'in sanallaştırması
+# DOM'dan çıkardığı hücreler her `drain()`'de bırakılır (çöp toplanabilsin) ve
+# tutulan referanslar `maxTracked` ile sınırlıdır: bellek tarama uzunluğuyla büyümez.
+_TIMELINE_READER_JS = r"""
+({pruneScreens, maxTracked}) => {
+    if (window.__timelineReader) window.__timelineReader.stop();
+    const SELECTOR = 'article[data-testid="tweet"]';
+    const readTweet = """ + _READ_TWEET_JS + r""";
+    const seen = new Set();
+    const queue = [];
+    let yielded = [];
+    let hidden = [];
+    const reveal = cell => {
+        cell.style.contentVisibility = '';
+        cell.style.containIntrinsicSize = '';
+    };
+    const collect = article => {
+        const tweet = readTweet(article);
+        if (!tweet.id || seen.has(tweet.id)) return;
+        seen.add(tweet.id);
+        queue.push(tweet);
+        yielded.push(article);
+    };
+    const scan = node => {
+        if (node.nodeType !== 1) return;
+        const article = node.closest(SELECTOR);
+        if (article) return collect(article);
+        node.querySelectorAll(SELECTOR).forEach(collect);
+    };
+    const observer = new MutationObserver(mutations => {
+        for (const mutation of mutations) mutation.addedNodes.forEach(scan);
+    });
+    observer.observe(document.body, {childList: true, subtree: true});
+    document.querySelectorAll(SELECTOR).forEach(collect);
+    window.__timelineReader = {
+        drain() {
+            const limit = -pruneScreens * window.innerHeight;
+            yielded = yielded.filter(article => {
+                if (!article.isConnected) return false;
+                if (article.getBoundingClientRect().bottom >= limit) return true;
+                const cell = article.closest('[data-testid="cellInnerDiv"]') || article;
+                cell.style.containIntrinsicSize = `auto ${cell.offsetHeight}px`;
+                cell.style.contentVisibility = 'hidden';
+                hidden.push(cell);
+                return false;
+            });
+            hidden = hidden.filter(cell => cell.isConnected);
+            // Sınırı aşan en eskiler bırakılır; gizli kalanlar geri açılır ki stop() hepsini kapsasın
+            if (yielded.length > maxTracked) yielded.splice(0, yielded.length - maxTracked);
+            if (hidden.length > maxTracked) hidden.splice(0, hidden.length - maxTracked).forEach(reveal);
+            return queue.splice(0);
+        },
+        pending() { return queue.length; },
+        stop() {
+            observer.disconnect();
+            hidden.forEach(reveal);
+            hidden = [];
+            yielded = [];
+            delete window.__timelineReader;
+        },
+    };
+}
+"""
+
+# Okunmuş hücreler görünümün bu kadar ekran yukarısında kalınca çizimden çıkarılır
+TIMELINE_PRUNE_SCREENS = 3
+# Okuyucunun tuttuğu makale ve gizli hücre referansı üst sınırı (her biri için)
+TIMELINE_MAX_TRACKED = 200
+
+# Gönderim, tahmin yerine tweet oluşturma isteğinin (GraphQL CreateTweet) yanıtıyla doğrulanır
+CREATE_TWEET_PATH = '/CreateTweet'
+SEND_BUTTON = 'button[data-testid="tweetButton"], div[data-testid="tweetButton"]'
+ADD_BUTTON = 'button[data-testid="addButton"], div[data-testid="addButton"]'
+# Metin ve yanıtlanan tweet'i URL'den alan, önceden doldurulmuş compose sayfası
+INTENT_URL = 'https://x.com/intent/post'
+COMPOSE_URL = 'https://x.com/compose/tweet'
+
+
+def intent_url(in_reply_to: Optional[str] = None, text: Optional[str] = None) -> str:
+    params = {}
+    if text:
+        params['text'] = text
+    if in_reply_to:
+        params['in_reply_to'] = in_reply_to
+    return f"{INTENT_URL}?{urlencode(params)}" if params else INTENT_URL
+
+
+def same_tweet_text(shown: str, sent: str) -> bool:
+    """Sayfada görünen tweet metni gönderilen metin mi? Bağlantılar kısaltılarak
+    gösterildiği için ilk bağlantıya kadar olan kısım karşılaştırılır."""
+    shown, sent = ' '.join(shown.split()), ' '.join(sent.split())
+    prefix = re.split(r'https?://', sent, maxsplit=1)[0].strip()
+    return shown.startswith(prefix) if prefix else shown == sent
+
+# Compose ve yanıt penceresi; ana sayfadaki satır içi yazma alanıyla karışmasın diye kapsam
+COMPOSE_DIALOG = 'div[role="dialog"]'
+
+# Uygulama içi (SPA) gezinmeye uygun yollar: ana sayfa, profil, tweet, liste.
+# Compose ve intent sayfaları tam yüklenir (sorgu parametreleri okunur).
+SPA_ROUTE = re.compile(r'^/(home|[A-Za-z0-9_]{1,15}(/status/\d+)?|i/status/\d+|i/lists/\d+)/?$')
+SPA_HOSTS = ('x.com', 'twitter.com')
+SPA_NAV_TIMEOUT = 8000
+# Gezinme başına aktarılan bayt Resource Timing'den okunur; varsayılan tampon (250) x.com açılışına yetmez
+RESOURCE_TIMING_BUFFER = 5000
+
+# Uygulama açıksa yolu router'a verir: pushState + popstate, uygulamanın geri/ileri
+# tuşunda izlediği yoldur. Ana sütunda o an görünen içerik eski rotaya ait olarak
+# işaretlenir. Uygulama yoksa null döner (tam yükleme gerekir).
+_SPA_NAVIGATE_JS = r"""
+(path) => {
+    const column = document.querySelector('[data-testid="primaryColumn"]');
+    if (!column) return null;
+    column.querySelectorAll('article, [data-testid="emptyState"]')
+        .forEach(node => node.setAttribute('data-nav-stale', ''));
+    performance.clearResourceTimings();
+    const started = performance.now();
+    history.pushState({}, '', path);
+    window.dispatchEvent(new PopStateEvent('popstate', {state: {}}));
+    return {started};
+}
+"""
+# Hedef rotanın içeriği render edildi: ana sütunda eski rotadan kalmayan bir tweet
+# (tweet sayfasında o tweet'in kendisi) veya boş liste mesajı var. Sayfa başka bir
+# yola geçtiyse (ör. giriş sayfasına yönlendirme) 'redirected'. Uygulama içi gezinme
+# ve tam yükleme aynı koşulla ölçülür; başlık (okunmamış sayısı) kullanılmaz.
+_ROUTE_READY_JS = r"""
+(path) => {
+    const normalize = p => p.replace(/\/$/, '').toLowerCase();
+    if (normalize(location.pathname) !== normalize(path)) return 'redirected';
+    const column = document.querySelector('[data-testid="primaryColumn"]');
+    if (!column) return false;
+    const status = path.match(/\/status\/(\d+)/);
+    const fresh = ':not([data-nav-stale])';
+    const content = status
+        ? `article[data-testid="tweet"]${fresh} a[href*="/status/${status[1]}"]`
+        : `article[data-testid="tweet"]${fresh}, [data-testid="emptyState"]${fresh}`;
+    return column.querySelector(content) ? 'ready' : false;
+}
+"""
+_TRANSFER_BYTES_JS = r"""
+(since) => performance.getEntriesByType('navigation')
+    .concat(performance.getEntriesByType('resource'))
+    .filter(entry => entry.startTime >= since)
+    .reduce((total, entry) => total + (entry.transferSize || 0), 0)
+"""
+
+# Chromium açılış profilleri (TWITTER_LAUNCH_PROFILE). 'lean' düşük bellekli
+# makineler içindir: küçük görünüm, V8 yığın sınırı, tek renderer süreci,
+# arka plan ağ trafiği ve animasyonlar kapalı. Ölçüm: `benchmark.py memory`.
+LAUNCH_ARGS = [
+    '--no-sandbox',
+    '--disable-dev-shm-usage',
+    '--disable-gpu',
+    '--disable-web-security',
+    '--disable-background-timer-throttling',
+    '--disable-backgrounding-occluded-windows',
+    '--disable-renderer-backgrounding',
+    '--disable-extensions',
+    '--disable-plugins',
+    '--disable-default-apps',
+    '--no-first-run',
+    '--no-default-browser-check',
+    '--disable-blink-features=AutomationControlled',
+    '--disable-automation',
+    '--disable-infobars',
+]
+LAUNCH_PROFILES = {
+    'default': {
+        'viewport': {'width': 1366, 'height': 768},
+        'args': ['--start-maximized'],
+        'disable_features': ['VizDisplayCompositor'],
+        'reduced_motion': False,
+    },
+    'lean': {
+        'viewport': {'width': 1024, 'height': 640},
+        'args': [
+            '--js-flags=--max-old-space-size=256',
+            '--renderer-process-limit=1',
+            '--disable-background-networking',
+            '--disable-component-update',
+            '--disable-sync',
+            '--disable-smooth-scrolling',
+            '--disable-breakpad',
+        ],
+        # Site izolasyonu kapalı olmadan süreç sınırı iframe'lerde aşılır;
+        # geri/ileri önbelleği eski sayfaları bellekte tutar
+        'disable_features': ['VizDisplayCompositor', 'IsolateOrigins', 'site-per-process',
+                             'BackForwardCache', 'Translate', 'MediaRouter', 'OptimizationHints'],
+        'reduced_motion': True,
+    },
+}
+DEFAULT_LAUNCH_PROFILE = 'default'
+
+# Animasyon, geçiş ve yumuşak kaydırma olmadan render (lean profil)
+_NO_MOTION_JS = r"""
+(() => {
+    const css = '*, *::before, *::after { animation: none !important; ' +
+                'transition: none !important; scroll-behavior: auto !important; }';
+    const add = () => {
+        const style = document.createElement('style');
+        style.textContent = css;
+        (document.head || document.documentElement).appendChild(style);
+    };
+    if (document.documentElement) add();
+    else document.addEventListener('DOMContentLoaded', add, {once: true});
+})();
+"""
 
 class TwitterBrowser:
-    def __init__(self):
+    def __init__(self, launch_profile: Optional[str] = None):
         self.playwright = None
         self.browser: Optional[BrowserContext] = None
         self.page: Optional[Page] = None
         self.user_data_dir = '/tmp/playwright_data'
+        # Profil klasörü açılışta budanır, çalışırken aralıklı olarak kotayla sınırlanır
+        self.profile = ProfileManager(self.user_data_dir)
+        self.launch_profile = launch_profile or os.environ.get('TWITTER_LAUNCH_PROFILE', DEFAULT_LAUNCH_PROFILE)
         self.is_logged_in = False
         self.session_file = 'data/twitter_session.json'
         self.login_attempts = 0
@@ -26,6 +271,22 @@ class TwitterBrowser:
         self.login_check_interval = 3600  # 1 saat
         self.email_handler = EmailHandler()
         self.setup_logging()
+        self.metrics = FlowMetrics(self.logger)
+        self.har = HarSession()
+        # Replay modunda sabit beklemeler atlanır; süreler yine de sayılır
+        self.wait_scale = float(os.environ.get('TWITTER_WAIT_SCALE', '0' if self.har.replaying else '1'))
+        # Liste zaman akışında görülen yazarlar (listenin üyeleri)
+        self.list_members = set()
+        # Yarım kalan thread'ler; yeniden denemede kaldığı yerden devam edilir
+        self.checkpoints = ThreadCheckpoints(state_path(CHECKPOINTS_FILE))
+        # Üretim sürerken arka planda başlatılan gezinme: (url, görev)
+        self._navigation: Optional[tuple] = None
+        # Gezinme yöntemi başına sayı, süre ve aktarılan bayt (spa / goto)
+        self.navigation_stats = {method: {'count': 0, 'seconds': 0.0, 'bytes': 0}
+                                 for method in ('spa', 'goto')}
+        self.navigation_stats['spa']['fallbacks'] = 0
+        # Hata anı ekran görüntüleri (boyut kotalı, aynı hata için hız sınırlı)
+        self.artifacts = ArtifactStore()
         
     def setup_logging(self):
         """Loglama ayarlarını yapılandır"""
@@ -37,6 +298,12 @@ class TwitterBrowser:
             handler.setFormatter(formatter)
             self.logger.addHandler(handler)
     
+    async def pause(self, seconds: float):
+        """Sabit bekleme - akış metriklerine yazılır"""
+        self.metrics.record_wait(seconds)
+        if self.wait_scale > 0:
+            await asyncio.sleep(seconds * self.wait_scale)
+    
     async def find_first_locator(self, selectors, timeout=5000):
         """TAMAMEN YENİDEN YAZILMIŞ locator bulma fonksiyonu"""
         for i, selector in enumerate(selectors):
@@ -60,11 +327,12 @@ class TwitterBrowser:
         self.logger.error("❌ No element found with any selector")
         raise Exception("Element bulunamadı")
     
+    @tracked_flow('compose')
     async def open_tweet_compose(self):
         """Tweet penceresini açma - TAMAMEN YENİDEN YAZILMIŞ"""
         try:
             self.logger.info("🔍 Opening tweet compose dialog...")
-            await asyncio.sleep(2)
+            await self.pause(2)
             
             # Doğrudan selectors listesi
             selectors = [
@@ -84,7 +352,7 @@ class TwitterBrowser:
                     self.logger.info(f"🔍 Trying direct click on selector {i+1}/{len(selectors)}")
                     await selector.first.click(timeout=5000)
                     self.logger.info("✅ Tweet compose dialog opened with direct click")
-                    await asyncio.sleep(3)
+                    await self.pause(3)
                     return selector.first
                 except Exception as e:
                     self.logger.warning(f"⚠️ Direct click failed on selector {i+1}: {e}")
@@ -101,7 +369,7 @@ class TwitterBrowser:
                 if await self.direct_login():
                     self.logger.info("✅ Login successful, navigating to home...")
                     await self.page.goto("https://x.com/home", wait_until="domcontentloaded", timeout=30000)
-                    await asyncio.sleep(5)
+                    await self.pause(5)
                     
                     # Tekrar dene
                     return await self.open_tweet_compose()
@@ -112,7 +380,7 @@ class TwitterBrowser:
             # Sayfayı yenile ve tekrar dene
             self.logger.info("🔄 Refreshing page and retrying...")
             await self.page.reload(wait_until="domcontentloaded", timeout=30000)
-            await asyncio.sleep(5)
+            await self.pause(5)
             
             # Son bir deneme daha
             for i, selector in enumerate(selectors):
@@ -120,7 +388,7 @@ class TwitterBrowser:
                     self.logger.info(f"🔍 Trying final click on selector {i+1}/{len(selectors)}")
                     await selector.first.click(timeout=5000)
                     self.logger.info("✅ Tweet compose dialog opened after refresh")
-                    await asyncio.sleep(3)
+                    await self.pause(3)
                     return selector.first
                 except Exception as e:
                     self.logger.warning(f"⚠️ Final click failed on selector {i+1}: {e}")
@@ -137,11 +405,8 @@ class TwitterBrowser:
                 current_url = self.page.url
                 self.logger.info(f"📍 Current URL: {current_url}")
                 
-                # Sayfa ekran görüntüsü al
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                screenshot_path = f"logs/debug_screenshot_{timestamp}.png"
-                await self.page.screenshot(path=screenshot_path)
-                self.logger.info(f"📸 Debug screenshot saved to {screenshot_path}")
+                # Sayfa ekran görüntüsü (hata anında alınır, arka planda yazılır)
+                await self.artifacts.capture(self.page, f"open_compose:{type(e).__name__}")
                 
                 # HTML içeriğini logla
                 html_content = await self.page.content()
@@ -228,7 +493,7 @@ class TwitterBrowser:
                     self.logger.info(f"🔍 Trying to click send button with selector {i+1}/{len(selectors)}")
                     await selector.click(timeout=5000)
                     self.logger.info(f"✅ Tweet sent with selector {i+1}")
-                    await asyncio.sleep(5)
+                    await self.pause(5)
                     return True
                 except Exception as e:
                     self.logger.warning(f"⚠️ Selector {i+1} failed: {e}")
@@ -241,14 +506,213 @@ class TwitterBrowser:
             self.logger.error(f"❌ Could not send tweet: {e}")
             return False
     
+    async def add_thread_item(self, i: int):
+        """Thread'e yeni tweet alanı ekle ve alanı döndür (i: yeni alanın sırası, ilk tweet 0)"""
+        try:
+            # Add button selectors
+            add_selectors = [
+                self.page.locator('div[data-testid="addButton"]'),
+                self.page.locator('button[data-testid="addButton"]'),
+                self.page.locator('div[data-testid="addTweetButton"]'),
+                self.page.locator('button[data-testid="addTweetButton"]'),
+                self.page.locator('div[aria-label="Add another post"]'),
+                self.page.locator('div[aria-label="Add another Tweet"]'),
+                self.page.locator('button[aria-label="Add post"]'),
+                self.page.locator('button:has-text("+")'),
+                self.page.locator('div:has-text("+")').filter(has=self.page.locator('[role="button"]'))
+            ]
+            
+            # Doğrudan tıklamayı dene
+            add_clicked = False
+            for j, selector in enumerate(add_selectors):
+                try:
+                    self.logger.info(f"🔍 Trying to click add button with selector {j+1}/{len(add_selectors)}")
+                    await selector.click(timeout=5000)
+                    self.logger.info(f"✅ Add button clicked with selector {j+1}")
+                    add_clicked = True
+                    await self.pause(3)
+                    break
+                except Exception as e:
+                    self.logger.warning(f"⚠️ Add button selector {j+1} failed: {e}")
+                    continue
+            
+            if not add_clicked:
+                self.logger.warning(f"⚠️ Could not add tweet {i+1}, posting what we have")
+                return None
+            
+            # Yeni tweet alanını bul
+            new_text_area_selectors = [
+                self.page.locator(f'div[data-testid="tweetTextarea_{i}"]'),
+                self.page.locator('div[contenteditable="true"]').nth(i),
+                self.page.locator('div[role="textbox"]').nth(i),
+                self.page.locator('div[contenteditable="true"]').last
+            ]
+            
+            new_text_area = None
+            for j, selector in enumerate(new_text_area_selectors):
+                try:
+                    self.logger.info(f"🔍 Trying to find text area {i+1} with selector {j+1}/{len(new_text_area_selectors)}")
+                    await selector.wait_for(state="visible", timeout=5000)
+                    self.logger.info(f"✅ Found text area {i+1} with selector {j+1}")
+                    new_text_area = selector
+                    break
+                except Exception as e:
+                    self.logger.warning(f"⚠️ Text area selector {j+1} failed: {e}")
+                    continue
+            
+            if not new_text_area:
+                self.logger.warning(f"⚠️ Could not find text area for tweet {i+1}, posting what we have")
+                return None
+            
+            return new_text_area
+            
+        except Exception as e:
+            self.logger.warning(f"⚠️ Could not add tweet {i+1}: {e}")
+            return None
+    
+    async def _created_status_id(self, response) -> Optional[str]:
+        """CreateTweet yanıtından oluşan tweet'in status ID'si (hata varsa None)"""
+        try:
+            if not response.ok:
+                self.logger.error(f"❌ CreateTweet failed with HTTP {response.status}")
+                return None
+            data = await response.json()
+        except Exception as e:
+            self.logger.error(f"❌ Could not read CreateTweet response: {e}")
+            return None
+        if data.get('errors'):
+            self.logger.error(f"❌ CreateTweet error: {data['errors'][0].get('message')}")
+            return None
+        result = ((data.get('data') or {}).get('create_tweet') or {}).get('tweet_results') or {}
+        return (result.get('result') or {}).get('rest_id')
+
+    async def send_and_confirm(self, expected: int = 1, timeout: float = 30.0) -> List[str]:
+        """Gönder düğmesine bas; her parça için CreateTweet yanıtını bekle
+
+        Thread parçaları sırayla ayrı isteklerle oluşturulur. Oluşan status
+        ID'leri sırayla döner; eksikse gönderim o parçada durmuştur.
+        """
+        responses = asyncio.Queue()
+
+        def on_response(response):
+            if CREATE_TWEET_PATH in response.url and response.request.method == 'POST':
+                responses.put_nowait(response)
+
+        self.page.on('response', on_response)
+        status_ids: List[str] = []
+        try:
+            await self.page.locator(SEND_BUTTON).first.click(timeout=5000)
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + timeout
+            while len(status_ids) < expected:
+                response = await asyncio.wait_for(responses.get(), max(0.0, deadline - loop.time()))
+                status_id = await self._created_status_id(response)
+                if not status_id:
+                    break
+                status_ids.append(status_id)
+        except asyncio.TimeoutError:
+            self.logger.error(f"❌ No CreateTweet response after {len(status_ids)}/{expected} parts")
+        except Exception as e:
+            self.logger.error(f"❌ Could not send: {e}")
+        finally:
+            self.page.remove_listener('response', on_response)
+        self.metrics.record('confirmed', len(status_ids))
+        return status_ids
+
+    async def find_posted_continuation(self, parent_id: str, parts: List[str]) -> List[str]:
+        """`parts`'tan `parent_id`'ye yanıt olarak zaten gönderilmiş olanların ID'leri
+
+        CreateTweet yanıtı zaman aşımına uğrar veya okunamazsa parça yine de
+        oluşmuş olabilir. Devam etmeden önce son onaylı parçanın status
+        sayfasında yazarın yanıtları sıradaki parça metinleriyle karşılaştırılır;
+        bulunan her parçanın sayfasında bir sonraki aranır.
+        """
+        found: List[str] = []
+        for part in parts:
+            try:
+                await self.goto(f"https://x.com/i/status/{parent_id}")
+                articles = self.page.locator('article[data-testid="tweet"]')
+                await articles.first.wait_for(timeout=10000)
+                tweets = await articles.evaluate_all(f"articles => articles.map({_READ_TWEET_JS})")
+            except Exception as e:
+                self.logger.warning(f"⚠️ Could not check replies of {parent_id}: {e}")
+                break
+            ids = [tweet['id'] for tweet in tweets]
+            if parent_id not in ids:
+                break
+            # Sayfada odak tweet'ten sonrası yanıtlardır; önce yazarın kendi yanıtları gelir
+            author = tweets[ids.index(parent_id)]['author']
+            match = next((tweet for tweet in tweets[ids.index(parent_id) + 1:]
+                          if tweet['author'] == author and same_tweet_text(tweet['text'], part)), None)
+            if not match:
+                break
+            found.append(match['id'])
+            parent_id = match['id']
+        if found:
+            self.logger.info(f"🔎 {len(found)} unconfirmed part(s) were already posted: {', '.join(found)}")
+        return found
+
+    async def compose_via_intent(self, text: str, in_reply_to: Optional[str] = None) -> Optional[List[str]]:
+        """Önceden doldurulmuş compose URL'si (intent) ile tek tweet veya yanıt gönder
+
+        Seçici denemesi ve yazma alanı doldurma yoktur; gönder düğmesi beklenip
+        gönderim CreateTweet yanıtıyla doğrulanır. Sayfa hazırlanamazsa None
+        döner (hiçbir şey gönderilmemiştir), aksi halde oluşan status ID'leri.
+        """
+        bare_url = intent_url(in_reply_to)
+        try:
+            if self.navigation_pending(bare_url):
+                # Sayfa metin üretilirken açıldı: metin yazma alanına doldurulur
+                await self.goto(bare_url)
+                await self.page.locator(COMPOSE_DIALOG).locator('div[data-testid="tweetTextarea_0"]').fill(
+                    text, timeout=10000)
+            else:
+                await self.goto(intent_url(in_reply_to, text))
+            await self.page.locator(SEND_BUTTON).first.wait_for(state="visible", timeout=10000)
+        except Exception as e:
+            self.logger.warning(f"⚠️ Intent compose not available: {e}")
+            return None
+        return await self.send_and_confirm(1)
+
+    async def compose_thread(self, texts: List[str], in_reply_to: Optional[str] = None) -> Optional[List[str]]:
+        """Thread'i sabit bekleme ve seçici denemesi olmadan hazırla ve gönder
+
+        Parça başına yalnızca doldurma ve (ilk parça dışında) ekleme tıklaması
+        yapılır; Playwright'ın kendi beklemesi yeterlidir. `in_reply_to`
+        verilirse parçalar o tweet'e yanıt olarak eklenir. Hazırlık başarısız
+        olursa None döner (hiçbir şey gönderilmemiştir), aksi halde oluşan
+        status ID'leri döner.
+        """
+        self.metrics.record('parts', len(texts))
+        try:
+            if in_reply_to:
+                await self.goto(f"https://x.com/i/status/{in_reply_to}")
+                # Odaktaki tweet: üstte gösterilen önceki parçalar değil, zaman bağlantısı bu ID olan
+                focal = self.page.locator('article[data-testid="tweet"]').filter(
+                    has=self.page.locator(f'a[href$="/status/{in_reply_to}"] time'))
+                await focal.first.locator('[data-testid="reply"]').click(timeout=10000)
+            else:
+                await self.goto(COMPOSE_URL)
+            dialog = self.page.locator(COMPOSE_DIALOG)
+            for i, text in enumerate(texts):
+                if i:
+                    await dialog.locator(ADD_BUTTON).first.click(timeout=5000)
+                await dialog.locator(f'div[data-testid="tweetTextarea_{i}"]').fill(text, timeout=10000)
+        except Exception as e:
+            self.logger.warning(f"⚠️ Batched compose failed, nothing sent: {e}")
+            await self.artifacts.capture(self.page, f"compose_thread:{type(e).__name__}")
+            return None
+        self.logger.info(f"🧵 {len(texts)} parts prepared, sending")
+        return await self.send_and_confirm(len(texts))
+
     async def thread_tweet(self, texts: List[str]):
         """Thread atma - YENİDEN YAZILMIŞ"""
         try:
             self.logger.info(f"🧵 Creating thread with {len(texts)} tweets")
             
             # Tweet compose penceresini aç
-            await self.page.goto("https://x.com/compose/tweet", wait_until="domcontentloaded", timeout=30000)
-            await asyncio.sleep(5)
+            await self.goto(COMPOSE_URL)
+            await self.pause(5)
             
             # İlk tweet'i yaz
             text_area = await self.find_tweet_text_area()
@@ -262,68 +726,10 @@ class TwitterBrowser:
             # Diğer tweetleri ekle
             for i, text in enumerate(texts[1:], start=1):
                 self.logger.info(f"➕ Adding tweet {i+1}/{len(texts)}")
-                
-                try:
-                    # Add button selectors
-                    add_selectors = [
-                        self.page.locator('div[data-testid="addButton"]'),
-                        self.page.locator('button[data-testid="addButton"]'),
-                        self.page.locator('div[data-testid="addTweetButton"]'),
-                        self.page.locator('button[data-testid="addTweetButton"]'),
-                        self.page.locator('div[aria-label="Add another post"]'),
-                        self.page.locator('div[aria-label="Add another Tweet"]'),
-                        self.page.locator('button[aria-label="Add post"]'),
-                        self.page.locator('button:has-text("+")'),
-                        self.page.locator('div:has-text("+")').filter(has=self.page.locator('[role="button"]'))
-                    ]
-                    
-                    # Doğrudan tıklamayı dene
-                    add_clicked = False
-                    for j, selector in enumerate(add_selectors):
-                        try:
-                            self.logger.info(f"🔍 Trying to click add button with selector {j+1}/{len(add_selectors)}")
-                            await selector.click(timeout=5000)
-                            self.logger.info(f"✅ Add button clicked with selector {j+1}")
-                            add_clicked = True
-                            await asyncio.sleep(3)
-                            break
-                        except Exception as e:
-                            self.logger.warning(f"⚠️ Add button selector {j+1} failed: {e}")
-                            continue
-                    
-                    if not add_clicked:
-                        self.logger.warning(f"⚠️ Could not add tweet {i+1}, posting what we have")
-                        break
-                    
-                    # Yeni tweet alanını bul
-                    new_text_area_selectors = [
-                        self.page.locator(f'div[data-testid="tweetTextarea_{i}"]'),
-                        self.page.locator('div[contenteditable="true"]').nth(i),
-                        self.page.locator('div[role="textbox"]').nth(i),
-                        self.page.locator('div[contenteditable="true"]').last
-                    ]
-                    
-                    new_text_area = None
-                    for j, selector in enumerate(new_text_area_selectors):
-                        try:
-                            self.logger.info(f"🔍 Trying to find text area {i+1} with selector {j+1}/{len(new_text_area_selectors)}")
-                            await selector.wait_for(state="visible", timeout=5000)
-                            self.logger.info(f"✅ Found text area {i+1} with selector {j+1}")
-                            new_text_area = selector
-                            break
-                        except Exception as e:
-                            self.logger.warning(f"⚠️ Text area selector {j+1} failed: {e}")
-                            continue
-                    
-                    if not new_text_area:
-                        self.logger.warning(f"⚠️ Could not find text area for tweet {i+1}, posting what we have")
-                        break
-                    
-                    await self.fill_tweet(new_text_area, text)
-                    
-                except Exception as e:
-                    self.logger.warning(f"⚠️ Could not add tweet {i+1}: {e}")
+                new_text_area = await self.add_thread_item(i)
+                if not new_text_area:
                     break
+                await self.fill_tweet(new_text_area, text)
             
             # Gönder
             return await self.send_tweet()
@@ -332,79 +738,9 @@ class TwitterBrowser:
             self.logger.error(f"❌ Thread creation failed: {e}")
             return False
     
-    def smart_split_content(self, content: str, max_length: int = 270) -> List[str]:
+    def smart_split_content(self, content: str, max_length: int = 280) -> List[str]:
         """İçeriği akıllı şekilde tweet'lere böl"""
-        if not content:
-            return []
-        
-        if len(content) <= max_length:
-            return [content]
-        
-        tweets = []
-        paragraphs = [p.strip() for p in content.split('\n\n') if p.strip()]
-        
-        if not paragraphs:
-            paragraphs = [content]
-        
-        current_tweet = ""
-        tweet_number = 1
-        
-        for paragraph in paragraphs:
-            if len(paragraph) > max_length:
-                sentences = [s.strip() + '.' for s in paragraph.split('.') if s.strip()]
-                
-                for sentence in sentences:
-                    thread_prefix = f"{tweet_number}/X "
-                    available_space = max_length - len(thread_prefix) - 10
-                    
-                    if len(sentence) > available_space:
-                        words = sentence.split()
-                        temp_sentence = ""
-                        
-                        for word in words:
-                            if len(temp_sentence + " " + word) <= available_space:
-                                temp_sentence += (" " + word if temp_sentence else word)
-                            else:
-                                if temp_sentence:
-                                    tweets.append(temp_sentence)
-                                    tweet_number += 1
-                                temp_sentence = word
-                        
-                        if temp_sentence:
-                            tweets.append(temp_sentence)
-                            tweet_number += 1
-                    else:
-                        if len(current_tweet + " " + sentence) <= available_space:
-                            current_tweet += (" " + sentence if current_tweet else sentence)
-                        else:
-                            if current_tweet:
-                                tweets.append(current_tweet)
-                                tweet_number += 1
-                            current_tweet = sentence
-            else:
-                thread_prefix = f"{tweet_number}/X "
-                available_space = max_length - len(thread_prefix) - 10
-                
-                if len(current_tweet + " " + paragraph) <= available_space:
-                    current_tweet += (" " + paragraph if current_tweet else paragraph)
-                else:
-                    if current_tweet:
-                        tweets.append(current_tweet)
-                        tweet_number += 1
-                    current_tweet = paragraph
-        
-        if current_tweet:
-            tweets.append(current_tweet)
-        
-        total_tweets = len(tweets)
-        if total_tweets > 1:
-            for i in range(total_tweets):
-                tweets[i] = f"{i+1}/{total_tweets} {tweets[i]}"
-                
-                if len(tweets[i]) > max_length:
-                    tweets[i] = tweets[i][:max_length-3] + "..."
-        
-        return tweets
+        return segment_thread(content, limit=max_length)
     
     def can_attempt_login(self):
         """Login denemesi yapılabilir mi kontrol et"""
@@ -427,34 +763,32 @@ class TwitterBrowser:
             
             os.makedirs('data', exist_ok=True)
             os.makedirs(self.user_data_dir, exist_ok=True)
+            if not self.har.replaying:
+                self.profile.prepare()
             
             self.playwright = await async_playwright().start()
             
+            if self.launch_profile not in LAUNCH_PROFILES:
+                self.logger.warning(f"⚠️ Unknown launch profile {self.launch_profile!r}, using {DEFAULT_LAUNCH_PROFILE}")
+                self.launch_profile = DEFAULT_LAUNCH_PROFILE
+            profile = LAUNCH_PROFILES[self.launch_profile]
+            self.logger.info(f"🧩 Launch profile: {self.launch_profile}")
+            
+            launch_started = time.perf_counter()
             self.browser = await self.playwright.chromium.launch_persistent_context(
-                user_data_dir=self.user_data_dir,
+                user_data_dir=self.har.user_data_dir(self.user_data_dir),
                 headless=True,
-                viewport={'width': 1366, 'height': 768},
+                viewport=profile['viewport'],
                 user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+                reduced_motion='reduce' if profile['reduced_motion'] else None,
                 args=[
-                    '--no-sandbox',
-                    '--disable-dev-shm-usage',
-                    '--disable-gpu',
-                    '--disable-web-security',
-                    '--disable-features=VizDisplayCompositor',
-                    '--disable-background-timer-throttling',
-                    '--disable-backgrounding-occluded-windows',
-                    '--disable-renderer-backgrounding',
-                    '--disable-extensions',
-                    '--disable-plugins',
-                    '--disable-default-apps',
-                    '--no-first-run',
-                    '--no-default-browser-check',
-                    '--disable-blink-features=AutomationControlled',
-                    '--disable-automation',
-                    '--disable-infobars',
-                    '--start-maximized'
+                    *LAUNCH_ARGS,
+                    f"--disable-features={','.join(profile['disable_features'])}",
+                    *profile['args'],
+                    *self.profile.launch_args()
                 ]
             )
+            self.profile.record_launch(time.perf_counter() - launch_started)
             
             await self.browser.add_init_script("""
                 Object.defineProperty(navigator, 'webdriver', {
@@ -474,7 +808,14 @@ class TwitterBrowser:
                 });
             """)
             
-            self.page = await self.browser.new_page()
+            if profile['reduced_motion']:
+                await self.browser.add_init_script(_NO_MOTION_JS)
+            await self.browser.add_init_script(
+                f"performance.setResourceTimingBufferSize({RESOURCE_TIMING_BUFFER})")
+            
+            await self.har.attach(self.browser)
+            
+            self.page = InstrumentedPage(await self.browser.new_page(), self.metrics)
             
             self.logger.info("✅ Playwright + Chromium initialized!")
             return True
@@ -495,6 +836,10 @@ class TwitterBrowser:
         
             self.logger.info("⚡ Lightweight login check...")
         
+            if self._navigation:
+                # Arka plandaki yükleme bitmeden URL ve sayfa içeriği anlamsızdır
+                await asyncio.wait([self._navigation[1]])
+        
             current_url = self.page.url
             self.logger.info(f"📍 Current URL: {current_url}")
         
@@ -538,7 +883,7 @@ class TwitterBrowser:
                                wait_until="domcontentloaded", 
                                timeout=15000)
             
-            await asyncio.sleep(3)
+            await self.pause(3)
             
             current_url = self.page.url
             self.logger.info(f"📍 Current URL after navigation: {current_url}")
@@ -581,7 +926,7 @@ class TwitterBrowser:
                                 wait_until="domcontentloaded", 
                                 timeout=15000)
             
-            await asyncio.sleep(3)
+            await self.pause(3)
             
             username = os.environ.get('TWITTER_USERNAME') or os.environ.get('EMAIL_USER')
             self.logger.info(f"⚡ Entering username: {username}")
@@ -613,7 +958,7 @@ class TwitterBrowser:
                 await username_field.fill(username)
                 await self.page.keyboard.press('Enter')
                 self.logger.info("⚡ Username entered and submitted")
-                await asyncio.sleep(3)
+                await self.pause(3)
             except Exception as e:
                 self.logger.error(f"❌ Could not find username field: {e}")
                 return False
@@ -649,7 +994,7 @@ class TwitterBrowser:
                 await password_field.fill(password)
                 await self.page.keyboard.press('Enter')
                 self.logger.info("⚡ Password entered and submitted")
-                await asyncio.sleep(5)
+                await self.pause(5)
             except Exception as e:
                 self.logger.error(f"❌ Could not find password field: {e}")
                 return False
@@ -665,7 +1010,7 @@ class TwitterBrowser:
                     return True
                 else:
                     self.logger.warning(f"⚠️ Login check failed, attempt {attempt + 1}/3")
-                    await asyncio.sleep(3)
+                    await self.pause(3)
             
             self.logger.error("❌ DIRECT LOGIN FAILED")
             return False
@@ -688,7 +1033,7 @@ class TwitterBrowser:
                     self.logger.info(f"⚡ Username verification: {username}")
                     
                     await self.page.keyboard.press('Enter')
-                    await asyncio.sleep(3)
+                    await self.pause(3)
                     return True
             except:
                 pass
@@ -725,22 +1070,23 @@ class TwitterBrowser:
                 self.logger.info(f"✅ Got verification code: {verification_code}")
             
                 await verification_input.fill(verification_code)
-                await asyncio.sleep(1)
+                await self.pause(1)
             
                 await self.page.keyboard.press('Enter')
                 self.logger.info("✅ Verification code submitted")
             
-                await asyncio.sleep(5)
+                await self.pause(5)
                 return True
             else:
                 self.logger.error("❌ Could not get verification code from email")
-                await asyncio.sleep(60)
+                await self.pause(60)
                 return True
                 
         except Exception as e:
             self.logger.error(f"❌ Email verification error: {e}")
             return True
     
+    @tracked_flow('login')
     async def login(self):
         """Ana login metodu"""
         if not self.page:
@@ -750,13 +1096,22 @@ class TwitterBrowser:
         if not self.can_attempt_login():
             return False
         
+        await self.cancel_navigation()
         if await self.smart_login_check():
             return True
         
         return await self.direct_login()
     
-    async def post_thread(self, content):
-        """THREAD OLARAK tweet gönder - YENİDEN YAZILMIŞ"""
+    @tracked_flow('thread')
+    async def post_thread(self, content, batched: bool = True, label: Optional[str] = None):
+        """THREAD OLARAK tweet gönder; başarıda oluşan status ID'lerini döndürür
+
+        Parçaların bir kısmı gönderilip kalanı başarısız olursa ilerleme
+        `self.checkpoints`'e yazılır; aynı parçalarla tekrar çağrıldığında kalan
+        parçalar son gönderilen parçaya yanıt olarak eklenir. `label` (ör.
+        proje adı) kayıtta saklanır. `batched=False` eski, seçici denemeli akışı
+        kullanır (karşılaştırma için).
+        """
         try:
             self.logger.info("🔍 Smart login check before posting...")
             if not await self.lightweight_login_check():
@@ -766,13 +1121,13 @@ class TwitterBrowser:
                     return False
     
             if isinstance(content, str):
-                tweets = self.smart_split_content(content, max_length=270)
+                tweets = self.smart_split_content(content)
             elif isinstance(content, list):
                 tweets = []
                 for item in content:
                     if isinstance(item, str):
-                        if len(item) > 270:
-                            split_tweets = self.smart_split_content(item, max_length=270)
+                        if weighted_length(item) > 280:
+                            split_tweets = self.smart_split_content(item)
                             tweets.extend(split_tweets)
                         else:
                             tweets.append(item)
@@ -787,19 +1142,136 @@ class TwitterBrowser:
 
             self.logger.info(f"🧵 Sending thread with {len(tweets)} tweets")
 
-            # Doğrudan compose sayfasına git
-            self.logger.info("🔍 Navigating directly to compose page...")
-            await self.page.goto("https://x.com/compose/tweet", wait_until="domcontentloaded", timeout=30000)
-            await asyncio.sleep(5)
-            
-            return await self.thread_tweet(tweets)
+            key = thread_key(tweets)
+            checkpoint = self.checkpoints.get(key)
+            posted = checkpoint['status_ids'] if checkpoint else []
+            if posted:
+                # Onaylanamayan parçalar gönderilmiş olabilir: tekrar göndermeden önce bak
+                posted = posted + await self.find_posted_continuation(posted[-1], tweets[len(posted):])
+                if len(posted) >= len(tweets):
+                    self.checkpoints.record(key, tweets, posted, label)
+                    self.logger.info(f"✅ Thread was already complete: {', '.join(posted)}")
+                    return posted
+                self.logger.info(f"⏯️ Resuming thread after part {len(posted)}/{len(tweets)}")
+                batched = True  # yanıt olarak devam yalnızca yeni akışla mümkün
+
+            status_ids = None
+            if batched and len(tweets) == 1:
+                # Tek tweet: önceden doldurulmuş intent sayfası yeterli
+                status_ids = await self.compose_via_intent(tweets[0])
+            if batched and status_ids is None:
+                status_ids = await self.compose_thread(tweets[len(posted):], in_reply_to=posted[-1] if posted else None)
+            if status_ids is None and not posted:
+                # Seçiciler değişmiş olabilir: eski, seçici denemeli akış
+                self.metrics.record('compose', 'legacy')
+                return await self.thread_tweet(tweets)
+            self.metrics.record('compose', 'batched')
+            status_ids = posted + (status_ids or [])
+            self.checkpoints.record(key, tweets, status_ids, label)
+            if len(status_ids) < len(tweets):
+                self.logger.error(f"❌ Thread stopped after {len(status_ids)}/{len(tweets)} parts")
+                return False
+            self.logger.info(f"✅ Thread confirmed: {', '.join(status_ids)}")
+            return status_ids
 
         except Exception as e:
             self.logger.error(f"❌ Thread posting error: {e}")
             return False
     
-    async def get_latest_tweet(self, username):
-        """Kullanıcının son tweet'ini al"""
+    @tracked_flow('thread')
+    async def post_thread_stream(self, tweets: AsyncIterator[str],
+                                 before_send: Optional[Callable[[List[str]], bool]] = None,
+                                 label: Optional[str] = None):
+        """Üretim sürerken thread'i yaz: compose sayfası açılırken model çalışır,
+        her tweet tamamlandıkça doldurulur, `i/n` numaraları en sonda yazılır.
+        `before_send` tweet gövdeleriyle, compose doldurulduktan sonra ve
+        gönderimden önce çağrılır; False dönerse gönderilmez (yeniden üretim
+        çağıranın işidir, akış yolunda yapılmaz).
+        Başarıda oluşan status ID'lerini döndürür."""
+        queue = asyncio.Queue()
+        
+        async def produce():
+            try:
+                async for tweet in tweets:
+                    await queue.put(tweet)
+                await queue.put(None)
+            except Exception as e:
+                await queue.put(e)
+        
+        producer = asyncio.create_task(produce())
+        try:
+            if not await self.lightweight_login_check():
+                self.logger.warning("❌ Not logged in, attempting login...")
+                if not await self.login():
+                    self.logger.error("❌ Login failed, cannot post thread")
+                    return False
+            
+            await self.goto(COMPOSE_URL)
+            await self.pause(5)
+            text_area = await self.find_tweet_text_area()
+            if not text_area:
+                self.logger.error("❌ Could not find text area for first tweet")
+                return False
+            
+            areas, bodies = [], []
+            while True:
+                item = await queue.get()
+                if item is None:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                area = text_area if not areas else await self.add_thread_item(len(areas))
+                if not area:
+                    break
+                await self.fill_tweet(area, item)
+                areas.append(area)
+                bodies.append(item)
+                self.logger.info(f"✅ Tweet {len(bodies)} filled while generating")
+            
+            if not bodies:
+                self.logger.error("❌ No valid tweets to send")
+                return False
+            
+            if before_send and not before_send(bodies):
+                self.logger.warning("⚠️ Streamed thread rejected before sending")
+                return False
+            
+            # Toplam sayı artık belli: numaralı metinlerle yeniden doldur
+            parts = number_parts(bodies) if len(bodies) > 1 else bodies
+            if len(bodies) > 1:
+                for area, text in zip(areas, parts):
+                    await self.fill_tweet(area, text)
+            
+            self.logger.info(f"🧵 Sending streamed thread with {len(bodies)} tweets")
+            status_ids = await self.send_and_confirm(len(bodies))
+            # Yarım kalırsa `post_thread(parts)` kaldığı yerden devam eder
+            self.checkpoints.record(thread_key(parts), parts, status_ids, label)
+            if len(status_ids) < len(bodies):
+                self.logger.error(f"❌ Thread stopped after {len(status_ids)}/{len(bodies)} parts")
+                return False
+            return status_ids
+            
+        except StreamAborted as e:
+            self.logger.warning(f"⚠️ Generation aborted, thread not sent: {e}")
+            return False
+        except StreamInterrupted:
+            # Model hatası: hiçbir şey gönderilmedi, çağıran akışsız yeniden üretir
+            raise
+        except Exception as e:
+            self.logger.error(f"❌ Streamed thread posting error: {e}")
+            return False
+        finally:
+            # Erken çıkışta modelin kalan çıktısını durdur
+            producer.cancel()
+    
+    @tracked_flow('profile')
+    async def get_latest_tweet(self, username, recent: Optional[RecencyPredicate] = None):
+        """Kullanıcının son tweet'ini al
+
+        `recent` verilirse önce yalnızca tweet zamanı okunur; koşulu geçmeyen
+        (veya zamanı okunamayan) tweet için metin ve URL çıkarılmaz, sonuç
+        `{'username', 'time', 'stale': True}` olur.
+        """
         if not await self.lightweight_login_check():
             if not await self.login():
                 return None
@@ -808,8 +1280,8 @@ class TwitterBrowser:
             self.logger.info(f"🔍 Getting latest tweet for @{username}")
 
             profile_url = f"https://x.com/{username}"
-            await self.page.goto(profile_url, wait_until="domcontentloaded", timeout=30000)
-            await asyncio.sleep(5)
+            await self.goto(profile_url)
+            await self.pause(5)
 
             current_url = self.page.url
             if "login" in current_url or "flow" in current_url:
@@ -844,6 +1316,19 @@ class TwitterBrowser:
 
             tweet_data = {'username': username}
 
+            # Önce zaman: eski tweet'ler için metin ve URL okumaya gerek yok
+            try:
+                tweet_data['time'] = await first_tweet.locator('time').first.get_attribute("datetime", timeout=5000)
+            except Exception:
+                tweet_data['time'] = None
+
+            if recent is not None:
+                tweet_time = parse_tweet_time(tweet_data['time'])
+                if tweet_time is None or not recent(tweet_time):
+                    tweet_data['stale'] = True
+                    self.logger.info(f"⏭️ Latest tweet of @{username} is not recent, skipping extraction")
+                    return tweet_data
+
             try:
                 text_selectors = [
                     'div[data-testid="tweetText"]',
@@ -874,25 +1359,12 @@ class TwitterBrowser:
                 tweet_data['text'] = "No text found"
 
             try:
-                time_element = await first_tweet.locator('time').first()
-                if time_element:
-                    tweet_time = await time_element.get_attribute("datetime")
-                    tweet_data['time'] = tweet_time
-                else:
-                    tweet_data['time'] = None
-            except:
-                tweet_data['time'] = None
-
-            try:
-                link_element = await first_tweet.locator('a[href*="/status/"]').first()
-                if link_element:
-                    href = await link_element.get_attribute("href")
-                    if href:
-                        if not href.startswith("https://"):
-                            href = f"https://x.com{href}"
-                        tweet_data['url'] = href
-                    else:
-                        tweet_data['url'] = None
+                href = await first_tweet.locator('a[href*="/status/"]').first.get_attribute("href", timeout=5000)
+                if href:
+                    if not href.startswith("https://"):
+                        href = f"https://x.com{href}"
+                    tweet_data['url'] = href
+                    tweet_data['id'] = href.split('/status/')[1].split('/')[0].split('?')[0]
                 else:
                     tweet_data['url'] = None
             except:
@@ -907,6 +1379,118 @@ class TwitterBrowser:
             self.logger.error(f"❌ Error getting tweet for @{username}: {e}")
             return None
     
+    async def iter_timeline(self, url: Optional[str] = None, until: Optional[datetime] = None,
+                            limit: Optional[int] = None, idle_timeout: float = 10.0) -> AsyncIterator[Dict]:
+        """Bir zaman akışındaki tweet'leri render edildikçe akış olarak ver
+
+        `async for tweet in browser.iter_timeline(url, until=...)` biçiminde
+        kullanılır. Her tweet `{'id', 'username', 'time', 'text', 'url',
+        'social'}` sözlüğüdür ve status ID'ye göre bir kez gelir. `until`
+        (saat dilimli) zamandan eski ilk tweet'te (sabitlenmiş/yeniden
+        paylaşılan `social` tweet'ler hariç), `limit` kadar tweet'ten sonra
+        veya `idle_timeout` saniye boyunca yeni tweet gelmezse durur. `url`
+        verilmezse açık sayfa okunur.
+        """
+        until = parse_tweet_time(until)
+        if url:
+            await self.goto(url)
+        await self.page.locator('article[data-testid="tweet"]').first.wait_for(state="visible", timeout=15000)
+        await self.page.evaluate(_TIMELINE_READER_JS, {'pruneScreens': TIMELINE_PRUNE_SCREENS,
+                                                           'maxTracked': TIMELINE_MAX_TRACKED})
+
+        count = 0
+        try:
+            while True:
+                for item in await self.page.evaluate("() => window.__timelineReader.drain()"):
+                    tweet_time = parse_tweet_time(item['time'])
+                    if until and tweet_time and tweet_time < until and not item['social']:
+                        return
+                    yield {
+                        'id': item['id'],
+                        'username': item['author'],
+                        'time': item['time'],
+                        'text': item['text'].strip(),
+                        'url': item['url'],
+                        'social': item['social'],
+                    }
+                    count += 1
+                    if limit and count >= limit:
+                        return
+
+                await self.page.evaluate("window.scrollBy(0, window.innerHeight * 2)")
+                try:
+                    await self.page.wait_for_function("() => window.__timelineReader.pending() > 0",
+                                                      timeout=idle_timeout * 1000)
+                except PlaywrightTimeoutError:
+                    self.logger.info(f"🏁 Timeline ended or idle after {count} tweets")
+                    return
+        finally:
+            try:
+                await self.page.evaluate("() => window.__timelineReader && window.__timelineReader.stop()")
+            except Exception:
+                pass
+
+    @tracked_flow('list_scan')
+    async def scan_list_timeline(self, list_url: str, accounts: List[str],
+                                 recent: Optional[RecencyPredicate] = None,
+                                 max_tweets: int = 200) -> Dict[str, Dict]:
+        """İzlenen hesapları içeren bir X List zaman akışını tek gezinmeyle tara
+
+        Akış `iter_timeline` ile okunur ve tweet'ler yazarlarına atanır. Her
+        hesabın listede görülen en yeni tweet'i `get_latest_tweet` ile aynı
+        biçimde döner (küçük harfli kullanıcı adı anahtarıyla); `recent`
+        koşulunu geçmeyenler `stale` işaretlenir. Akış kronolojik olduğundan
+        kesim zamanı geçilince tarama durur ve daha önce listede görülmüş ama
+        yeni tweet'i olmayan hesaplar da `stale` sayılır. Sonuçta olmayan
+        hesaplar profil ziyaretiyle kontrol edilmelidir.
+        """
+        wanted = {account.lstrip('@').lower(): account for account in accounts}
+        found: Dict[str, Dict] = {}
+        if not await self.lightweight_login_check():
+            if not await self.login():
+                return found
+
+        self.logger.info(f"📋 Scanning list timeline for {len(wanted)} accounts")
+        scanned = 0
+        passed_cutoff = False
+        timeline = self.iter_timeline(list_url, limit=max_tweets)
+        try:
+            async for tweet in timeline:
+                scanned += 1
+                tweet_time = parse_tweet_time(tweet['time'])
+                is_recent = recent is None or (tweet_time is not None and recent(tweet_time))
+                # Yeniden paylaşımlar listenin üyesine ait değildir
+                author = (tweet['username'] or '').lower()
+                if not tweet['social'] and author:
+                    self.list_members.add(author)
+                    if author in wanted and author not in found:
+                        tweet_data = {'username': wanted[author], 'time': tweet['time']}
+                        if is_recent:
+                            tweet_data['text'] = tweet['text'] or "No text found"
+                            tweet_data['url'] = tweet['url']
+                            tweet_data['id'] = tweet['id']
+                        else:
+                            tweet_data['stale'] = True
+                        found[author] = tweet_data
+                if not tweet['social'] and tweet_time is not None and not is_recent:
+                    passed_cutoff = True
+                    break
+                if len(found) == len(wanted):
+                    break
+        except Exception as e:
+            self.logger.error(f"❌ Error scanning list timeline: {e}")
+        finally:
+            await timeline.aclose()
+
+        if passed_cutoff:
+            for author in (wanted.keys() & self.list_members) - found.keys():
+                found[author] = {'username': wanted[author], 'time': None, 'stale': True}
+
+        fresh = sum(1 for tweet_data in found.values() if not tweet_data.get('stale'))
+        self.logger.info(f"✅ List scan: {scanned} tweets, {len(found)}/{len(wanted)} accounts covered, "
+                         f"{fresh} recent")
+        return found
+    
     async def get_latest_tweet_id(self, username):
         """Bir kullanıcının son tweet ID'sini al"""
         if not username:
@@ -919,8 +1503,8 @@ class TwitterBrowser:
             retries = 3
             for attempt in range(retries):
                 try:
-                    await self.page.goto(f"https://x.com/{username}", wait_until="domcontentloaded", timeout=40000)
-                    await asyncio.sleep(3)
+                    await self.goto(f"https://x.com/{username}", timeout=40000)
+                    await self.pause(3)
                     break
                 except Exception as e:
                     self.logger.warning(f"⚠️ Profile page navigation failed (Attempt {attempt + 1}/{retries}): {e}")
@@ -971,25 +1555,55 @@ class TwitterBrowser:
             self.logger.error(f"❌ Error getting tweet ID for @{username}: {e}")
             return None
     
-    async def reply_to_latest_tweet(self, username, reply_content):
-        """Bir kullanıcının son tweetine yanıt ver"""
+    @tracked_flow('reply')
+    async def reply_to_latest_tweet(self, username, reply_content, status_id: Optional[str] = None):
+        """Bir kullanıcının son tweetine yanıt ver
+
+        `status_id` biliniyorsa (ör. tarama sonucundan) profil yüklenmez. Önce
+        önceden doldurulmuş intent URL'si denenir; sayfa hazırlanamazsa eski,
+        çok adımlı arayüz akışı kullanılır. Başarıda yanıtın status ID'si
+        (arayüz akışında True) döner.
+        """
         if not await self.lightweight_login_check():
             if not await self.login():
                 return False
 
         try:
-            self.logger.info(f"💬 Fetching latest tweet for @{username}...")
-
-            tweet_id = await self.get_latest_tweet_id(username)
+            tweet_id = status_id
+            if not tweet_id:
+                self.logger.info(f"💬 Fetching latest tweet for @{username}...")
+                tweet_id = await self.get_latest_tweet_id(username)
             if not tweet_id:
                 self.logger.error(f"❌ Could not fetch latest tweet ID for @{username}")
                 return False
 
+            status_ids = await self.reply_via_intent(tweet_id, reply_content)
+            if status_ids is not None:
+                if status_ids:
+                    self.logger.info(f"✅ Reply posted! ({status_ids[0]})")
+                    return status_ids[0]
+                return False
+            self.logger.info("↪️ Intent compose unavailable, falling back to reply UI")
+            return await self.reply_via_ui(username, tweet_id, reply_content)
+
+        except Exception as e:
+            self.logger.error(f"❌ Error replying to @{username}: {e}")
+            return False
+
+    @tracked_flow('reply_intent')
+    async def reply_via_intent(self, tweet_id: str, reply_content: str) -> Optional[List[str]]:
+        """Hızlı yol: tek sayfa yükü, yalnızca gönderim doğrulanır"""
+        return await self.compose_via_intent(reply_content, in_reply_to=tweet_id)
+
+    @tracked_flow('reply_ui')
+    async def reply_via_ui(self, username, tweet_id: str, reply_content: str):
+        """Yedek yol: status sayfası, yanıt düğmesi, yazma alanı ve gönder düğmesi"""
+        try:
             tweet_url = f"https://x.com/{username}/status/{tweet_id}"
             self.logger.info(f"💬 Replying to tweet: {tweet_url}")
 
-            await self.page.goto(tweet_url, wait_until="domcontentloaded", timeout=30000)
-            await asyncio.sleep(3)
+            await self.goto(tweet_url)
+            await self.pause(3)
 
             # Reply button
             try:
@@ -1006,7 +1620,7 @@ class TwitterBrowser:
                         await selector.click(timeout=5000)
                         self.logger.info(f"✅ Reply button clicked with selector {i+1}")
                         reply_clicked = True
-                        await asyncio.sleep(2)
+                        await self.pause(2)
                         break
                     except Exception as e:
                         self.logger.warning(f"⚠️ Reply button selector {i+1} failed: {e}")
@@ -1045,7 +1659,7 @@ class TwitterBrowser:
                     return False
                 
                 await reply_box.fill(reply_content)
-                await asyncio.sleep(2)
+                await self.pause(2)
             except Exception as e:
                 self.logger.error(f"❌ Reply area not found: {e}")
                 return False
@@ -1066,7 +1680,7 @@ class TwitterBrowser:
                         await selector.click(timeout=5000)
                         self.logger.info(f"✅ Send button clicked with selector {i+1}")
                         send_clicked = True
-                        await asyncio.sleep(5)
+                        await self.pause(5)
                         break
                     except Exception as e:
                         self.logger.warning(f"⚠️ Send button selector {i+1} failed: {e}")
@@ -1086,13 +1700,143 @@ class TwitterBrowser:
             self.logger.error(f"❌ Error replying to @{username}: {e}")
             return False
     
+    # --- Üretimle paralel gezinme ---
+
+    def start_navigation(self, url: str):
+        """Sayfa yüklemesini arka planda başlat (ör. model yanıt üretirken)
+
+        Aynı URL'ye sonraki `goto` bu yüklemeye katılır; başka bir URL'ye
+        gidilirse veya `cancel_navigation` çağrılırsa yükleme iptal edilir.
+        """
+        if self._navigation and self._navigation[0] == url:
+            return
+        if self._navigation:
+            self._navigation[1].cancel()
+        self.logger.info(f"🚀 Navigating ahead to {url}")
+        self._navigation = (url, asyncio.ensure_future(
+            self.page.goto(url, wait_until="domcontentloaded", timeout=30000)))
+
+    def navigation_pending(self, url: str) -> bool:
+        return bool(self._navigation and self._navigation[0] == url)
+
+    async def cancel_navigation(self):
+        """Arka plandaki gezinmeyi iptal et (üretim başarısız olduğunda)"""
+        if not self._navigation:
+            return
+        url, task = self._navigation
+        self._navigation = None
+        task.cancel()
+        try:
+            await task
+        except BaseException:
+            pass
+        self.logger.info(f"🛑 Cancelled navigation to {url}")
+
+    async def goto(self, url: str, timeout: int = 30000):
+        """Sayfaya git; aynı URL'ye önceden başlatılmış yükleme varsa ona katıl"""
+        if self.navigation_pending(url):
+            _, task = self._navigation
+            self._navigation = None
+            try:
+                await task
+                return
+            except Exception as e:
+                self.logger.warning(f"⚠️ Background navigation failed, retrying: {e}")
+        else:
+            await self.cancel_navigation()
+        await self.navigate(url, timeout=timeout)
+
+    def spa_path(self, url: str) -> Optional[str]:
+        """Uygulama içinde açılabilecek URL'nin yolu; açılamıyorsa None"""
+        target, current = urlsplit(url), urlsplit(self.page.url or '')
+        if target.query or target.fragment or target.hostname not in SPA_HOSTS:
+            return None
+        if current.hostname != target.hostname or current.path.rstrip('/') == target.path.rstrip('/'):
+            return None
+        return target.path if SPA_ROUTE.match(target.path) else None
+
+    async def navigate(self, url: str, timeout: int = 30000):
+        """Uygulama açıksa uygulama içi yönlendirme, değilse tam `page.goto`
+
+        Uygulama içi gezinmede JS paketi yeniden indirilip başlatılmaz; yalnızca
+        yeni rotanın verisi çekilir. Yeni rota `SPA_NAV_TIMEOUT` içinde render
+        edilmezse tam yüklemeye düşülür. İki yöntemde de süre, rotanın içeriği
+        (`_ROUTE_READY_JS`) görünene kadar ölçülür ve aktarılan baytla birlikte
+        `navigation_stats`'a yazılır; compose gibi rota dışı sayfalar ölçülmez.
+        """
+        path = self.spa_path(url)
+        if path:
+            started = time.perf_counter()
+            try:
+                state = await self.page.evaluate(_SPA_NAVIGATE_JS, path)
+                if state:
+                    if await self._route_ready(path, SPA_NAV_TIMEOUT) == 'ready':
+                        await self._record_navigation('spa', url, started, state['started'])
+                    return
+            except Exception as e:
+                self.navigation_stats['spa']['fallbacks'] += 1
+                self.logger.warning(f"⚠️ In-app navigation to {path} failed, reloading: {e}")
+        started = time.perf_counter()
+        await self.page.goto(url, wait_until="domcontentloaded", timeout=timeout)
+        target = urlsplit(url).path
+        if SPA_ROUTE.match(target):
+            # Tam yükleme de rota içeriği görünene kadar ölçülür (uygulama içiyle aynı koşul);
+            # içerik gelmezse sayfa yine kullanılır, yalnızca ölçüm yazılmaz
+            try:
+                ready = await self._route_ready(target, SPA_NAV_TIMEOUT)
+            except Exception as e:
+                self.logger.debug(f"Route content for {target} not seen: {e}")
+                return
+            if ready == 'ready':
+                await self._record_navigation('goto', url, started, 0)
+
+    async def _route_ready(self, path: str, timeout: int) -> str:
+        """Rota içeriği render edilene ya da sayfa başka yola geçene kadar bekle"""
+        handle = await self.page.wait_for_function(_ROUTE_READY_JS, arg=path, timeout=timeout)
+        return await handle.json_value()
+
+    async def _record_navigation(self, method: str, url: str, started: float, since: float):
+        seconds = time.perf_counter() - started
+        try:
+            transferred = int(await self.page.evaluate(_TRANSFER_BYTES_JS, since))
+        except Exception:
+            transferred = 0
+        stats = self.navigation_stats[method]
+        stats['count'] += 1
+        stats['seconds'] += seconds
+        stats['bytes'] += transferred
+        self.logger.info(f"🧭 {method} navigation to {url}: {seconds:.2f}s, {transferred / 1024:.0f} KB")
+
+    def navigation_summary(self) -> Dict[str, Dict]:
+        """Yöntem başına ortalama gezinme süresi ve baytı"""
+        summary = {}
+        for method, stats in self.navigation_stats.items():
+            count = stats['count']
+            summary[method] = {
+                **stats,
+                'seconds': round(stats['seconds'], 3),
+                'avg_seconds': round(stats['seconds'] / count, 3) if count else None,
+                'avg_bytes': round(stats['bytes'] / count) if count else None,
+            }
+        return summary
+
+    async def maintain_profile(self, force: bool = False):
+        """Profil klasörü kotayı aştıysa önbellekleri temizle (aralık dolmadıysa bir şey yapmaz)"""
+        if not self.browser or not self.page or self.har.replaying:
+            return None
+        # CDP oturumu sayaç sarmalayıcısına değil, asıl Playwright sayfasına açılır
+        page = getattr(self.page, '_target', self.page)
+        return await self.profile.maintain(self.browser, page, force=force)
+
     async def close(self):
         """Browser'ı kapat"""
         try:
+            await self.artifacts.flush()
             if self.browser:
                 await self.browser.close()
             if self.playwright:
                 await self.playwright.stop()
+            self.har.finalize()
             self.logger.info("🔒 Browser closed")
         except Exception as e:
             self.logger.error(f"❌ Error closing browser: {e}")
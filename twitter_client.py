@@ -5,6 +5,7 @@ import logging
 from typing import Optional, Dict, List
 import aiofiles
 import asyncio
+from thread_segmenter import truncate
 
 class TwitterClient:
     def __init__(self):
@@ -107,8 +108,7 @@ class TwitterClient:
     async def post_tweet(self, content: str) -> bool:
         """Tweet gönder"""
         try:
-            if len(content) > 280:
-                content = content[:277] + "..."
+            content = truncate(content)
             
             response = self.client.create_tweet(text=content)
             
@@ -126,8 +126,7 @@ class TwitterClient:
     async def reply_to_tweet(self, tweet_id: str, reply_content: str) -> bool:
         """Tweet'e yanıt ver"""
         try:
-            if len(reply_content) > 280:
-                reply_content = reply_content[:277] + "..."
+            reply_content = truncate(reply_content)
             
             response = self.client.create_tweet(
                 text=reply_content,